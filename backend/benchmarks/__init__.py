@@ -0,0 +1,13 @@
+"""Load and latency benchmarks for the API hot paths.
+
+Runs the app in-process against the configured Postgres (DATABASE_URL) with
+Google OAuth and SMTP stubbed out, and writes machine-readable results:
+
+    python -m benchmarks run --org-sizes 10,1000,100000 --concurrency 1,16,64 --output bench.json
+    python -m benchmarks micro --output micro.json
+    python -m benchmarks compare baseline.json bench.json --threshold 0.1
+
+Each run seeds its own organizations (bulk inserts) and deletes them again
+unless --keep is given, so it can share a development database. ``micro``
+times token encode/verify and the RBAC checks on one core instead.
+"""
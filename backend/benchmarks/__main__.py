@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import httpx
+
+from src.auth import oauth
+from src.config import settings
+from src.db import engine, warm_pool
+from src.main import app
+from src.models import Base
+from src.services.email_outbox import EmailOutboxWorker
+
+from .micro import cases as micro_cases, run_micro
+from .scenarios import SCENARIOS, Scenario
+from .seed import SeededOrg, drop_organization, seed_organization
+from .stats import ScenarioResult, compare, compare_micro, summarize
+from .stubs import StubEmailProvider, google_stub_client
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    org: SeededOrg,
+    run_id: str,
+    sequence: itertools.count,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+) -> ScenarioResult:
+    """Sends ``warmup`` untimed requests, then ``requests`` timed ones from
+    ``concurrency`` concurrent clients."""
+    for _ in range(warmup):
+        n = next(sequence)
+        response = await client.send(scenario.build(client, org, run_id, n))
+        if scenario.record is not None:
+            scenario.record(org, n, response)
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            n = next(sequence)
+            request = scenario.build(client, org, run_id, n)
+            started = time.perf_counter()
+            response = await client.send(request)
+            latencies.append(time.perf_counter() - started)
+            if scenario.record is not None:
+                scenario.record(org, n, response)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(scenario.name, org.size, concurrency, latencies, errors, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    started_at = datetime.now(timezone.utc)
+    scenarios = [SCENARIOS[name] for name in args.scenarios]
+    sequence = itertools.count()
+    results: list[ScenarioResult] = []
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await warm_pool(settings.db_pool_size)
+    oauth._http_client = google_stub_client()
+    email = StubEmailProvider(args.smtp_latency_ms / 1000)
+    outbox = asyncio.create_task(EmailOutboxWorker(email).run(poll_interval=0.2))
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for size in args.org_sizes:
+                seed_started = time.perf_counter()
+                org = await seed_organization(engine, size, run_id, invitations=args.invitations)
+                _progress(f"seeded {size} users in {time.perf_counter() - seed_started:.1f}s")
+                try:
+                    for scenario in scenarios:
+                        for concurrency in args.concurrency:
+                            result = await run_scenario(
+                                client, scenario, org, run_id, sequence, concurrency, args.requests, args.warmup
+                            )
+                            results.append(result)
+                            _progress(
+                                f"{result.scenario:<20} users={size:<7} c={concurrency:<4} "
+                                f"{result.throughput_rps:>8.1f} req/s  p50={result.p50_ms:.2f}ms "
+                                f"p95={result.p95_ms:.2f}ms p99={result.p99_ms:.2f}ms errors={result.errors}"
+                            )
+                finally:
+                    if not args.keep:
+                        await drop_organization(engine, org, run_id)
+    finally:
+        outbox.cancel()
+        await asyncio.gather(outbox, return_exceptions=True)
+        await oauth.close_http_client()
+        await engine.dispose()
+
+    return {
+        "meta": {
+            **_meta(started_at),
+            "run_id": run_id,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "db_pool_size": settings.db_pool_size,
+            "db_max_overflow": settings.db_max_overflow,
+            "emails_sent": email.sent,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _micro(args: argparse.Namespace) -> dict:
+    started_at = datetime.now(timezone.utc)
+    results = []
+    for result in run_micro(args.cases):
+        results.append(result)
+        _progress(f"{result.name:<22} {result.ops_per_sec:>12.0f} ops/s  {result.ns_per_op:>10.0f} ns/op")
+    return {"meta": _meta(started_at), "micro": [asdict(result) for result in results]}
+
+
+def _compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    comparisons = compare(baseline, current, args.threshold)
+    for c in comparisons:
+        flag = "REGRESSED" if c.regressed else "ok"
+        print(
+            f"{c.scenario:<20} users={c.org_size:<7} c={c.concurrency:<4} "
+            f"p95 {c.baseline_p95_ms:.2f} -> {c.current_p95_ms:.2f}ms ({c.p95_change:+.1%})  "
+            f"rps {c.baseline_rps:.1f} -> {c.current_rps:.1f} ({c.throughput_change:+.1%})  {flag}"
+        )
+    micro = compare_micro(baseline, current, args.threshold)
+    for m in micro:
+        flag = "REGRESSED" if m.regressed else "ok"
+        print(
+            f"{m.name:<22} {m.baseline_ops_per_sec:.0f} -> {m.current_ops_per_sec:.0f} ops/s ({m.change:+.1%})  {flag}"
+        )
+    return 1 if any(c.regressed for c in [*comparisons, *micro]) else 0
+
+
+def _meta(started_at: datetime) -> dict:
+    return {
+        "started_at": started_at.isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _progress(line: str) -> None:
+    print(line, file=sys.stderr, flush=True)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed organizations and benchmark the hot paths")
+    run_parser.add_argument("--org-sizes", type=_int_list, default=[10, 1000, 10000], help="comma-separated org sizes")
+    run_parser.add_argument("--concurrency", type=_int_list, default=[1, 16, 64], help="comma-separated client counts")
+    run_parser.add_argument("--requests", type=int, default=1000, help="timed requests per scenario and concurrency")
+    run_parser.add_argument("--warmup", type=int, default=50, help="untimed requests before each measurement")
+    run_parser.add_argument("--invitations", type=int, default=500, help="pending invitations seeded per organization")
+    run_parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    run_parser.add_argument("--smtp-latency-ms", type=float, default=50.0, help="delay of the stubbed SMTP send")
+    run_parser.add_argument("--output", help="write JSON results here instead of stdout")
+    run_parser.add_argument("--keep", action="store_true", help="keep the seeded organizations")
+
+    micro_parser = commands.add_parser("micro", help="single-core micro-benchmarks of per-request code")
+    micro_parser.add_argument("--cases", nargs="+", choices=list(micro_cases()), help="default: all")
+    micro_parser.add_argument("--output", help="write JSON results here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed change (0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return _compare(args)
+
+    # Per-request INFO logs (httpx, query stats) would dominate the timings.
+    logging.getLogger().setLevel(logging.WARNING)
+    report = _micro(args) if args.command == "micro" else asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
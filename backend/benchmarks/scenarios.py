@@ -0,0 +1,63 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+from .seed import EMAIL_DOMAIN, SeededOrg
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    # Builds the n-th request; ``n`` is unique across the whole run.
+    build: Callable[[httpx.AsyncClient, SeededOrg, str, int], httpx.Request]
+    # Sees the n-th response, for scenarios that carry state between requests.
+    record: Callable[[SeededOrg, int, httpx.Response], None] | None = None
+
+
+def _bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _list_users(client: httpx.AsyncClient, org: SeededOrg, run_id: str, n: int) -> httpx.Request:
+    token = org.access_tokens[n % len(org.access_tokens)]
+    return client.build_request("GET", "/users", params={"limit": 50}, headers=_bearer(token))
+
+
+def _me(client: httpx.AsyncClient, org: SeededOrg, run_id: str, n: int) -> httpx.Request:
+    token = org.access_tokens[n % len(org.access_tokens)]
+    return client.build_request("GET", "/users/me", headers=_bearer(token))
+
+
+def _refresh(client: httpx.AsyncClient, org: SeededOrg, run_id: str, n: int) -> httpx.Request:
+    token = org.refresh_tokens[n % len(org.refresh_tokens)]
+    return client.build_request("POST", "/auth/refresh", headers={"Cookie": f"refresh_token={token}"})
+
+
+def _keep_rotated_refresh_token(org: SeededOrg, n: int, response: httpx.Response) -> None:
+    # Refresh tokens rotate; replaying a stale one would revoke its session.
+    token = response.cookies.get("refresh_token")
+    if token:
+        org.refresh_tokens[n % len(org.refresh_tokens)] = token
+
+
+def _create_invitation(client: httpx.AsyncClient, org: SeededOrg, run_id: str, n: int) -> httpx.Request:
+    body = {"email": f"new{n}-{run_id}-{org.size}@{EMAIL_DOMAIN}", "name": f"New {n}", "role": "viewer"}
+    return client.build_request("POST", "/invitations", json=body, headers=_bearer(org.admin_token))
+
+
+def _preview_invitation(client: httpx.AsyncClient, org: SeededOrg, run_id: str, n: int) -> httpx.Request:
+    token = org.invitation_tokens[n % len(org.invitation_tokens)]
+    return client.build_request("GET", f"/invitations/preview/{token}")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("users_list", _list_users),
+        Scenario("users_me", _me),
+        Scenario("auth_refresh", _refresh, _keep_rotated_refresh_token),
+        Scenario("invitations_create", _create_invitation),
+        Scenario("invitations_preview", _preview_invitation),
+    )
+}
@@ -0,0 +1,121 @@
+import random
+import secrets
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.jwt import create_access_token, create_refresh_token
+from src.models import (
+    Invitation,
+    InvitationStatus,
+    Organization,
+    RefreshSession,
+    User,
+    UserRole,
+    UserStatus,
+    hash_invitation_token,
+)
+
+EMAIL_DOMAIN = "bench.example.com"
+INSERT_CHUNK = 5000
+
+_FIRST_NAMES = ("Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Radia", "Linus")
+_LAST_NAMES = ("Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Perlman")
+
+
+@dataclass
+class SeededOrg:
+    organization_id: uuid.UUID
+    size: int
+    admin_token: str
+    # Tokens for a sample of members, so requests spread over many principals.
+    access_tokens: list[str] = field(default_factory=list)
+    refresh_tokens: list[str] = field(default_factory=list)
+    invitation_tokens: list[str] = field(default_factory=list)
+
+
+async def seed_organization(
+    engine: AsyncEngine, size: int, run_id: str, invitations: int = 500, callers: int = 200
+) -> SeededOrg:
+    """Creates one organization with ``size`` active members (the first is
+    its admin, every 20th a manager) and ``invitations`` pending invitations.
+    Names are pseudo-random but deterministic per size, so sorted pages look
+    the same from run to run."""
+    rng = random.Random(size)
+    organization_id = uuid.uuid4()
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "organization_id": organization_id,
+            "email": f"user{i}-{run_id}-{size}@{EMAIL_DOMAIN}",
+            "name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} {i}",
+            "role": UserRole.ADMIN if i == 0 else UserRole.MANAGER if i % 20 == 1 else UserRole.VIEWER,
+            "status": UserStatus.ACTIVE,
+        }
+        for i in range(size)
+    ]
+    admin_id = users[0]["id"]
+    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+    invitation_tokens = [secrets.token_urlsafe(32) for _ in range(invitations)]
+    invitation_rows = [
+        {
+            "organization_id": organization_id,
+            "email": f"invitee{i}-{run_id}-{size}@{EMAIL_DOMAIN}",
+            "name": f"Invitee {i}",
+            "role": UserRole.VIEWER,
+            "token_hash": hash_invitation_token(token),
+            "invited_by": admin_id,
+            "status": InvitationStatus.PENDING,
+            "expires_at": expires_at,
+        }
+        for i, token in enumerate(invitation_tokens)
+    ]
+    sample = rng.sample(users, min(callers, size))
+    sessions = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": u["id"],
+            "organization_id": organization_id,
+            "current_jti": uuid.uuid4(),
+            "expires_at": expires_at,
+        }
+        for u in sample
+    ]
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(Organization), [{"id": organization_id, "name": f"Bench {run_id} ({size} users)"}])
+        for start in range(0, len(users), INSERT_CHUNK):
+            await conn.execute(insert(User), users[start : start + INSERT_CHUNK])
+        if invitation_rows:
+            await conn.execute(insert(Invitation), invitation_rows)
+        if sessions:
+            await conn.execute(insert(RefreshSession), sessions)
+        # Planner statistics for the new rows, as production would have.
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE invitations"))
+        await conn.execute(text("ANALYZE refresh_sessions"))
+
+    return SeededOrg(
+        organization_id=organization_id,
+        size=size,
+        admin_token=create_access_token(admin_id, organization_id, UserRole.ADMIN, 0),
+        access_tokens=[create_access_token(u["id"], organization_id, u["role"], 0) for u in sample],
+        refresh_tokens=[
+            create_refresh_token(s["user_id"], organization_id, s["id"], s["current_jti"]) for s in sessions
+        ],
+        invitation_tokens=invitation_tokens,
+    )
+
+
+async def drop_organization(engine: AsyncEngine, org: SeededOrg, run_id: str) -> None:
+    """Deletes the organization (members and invitations cascade) and any
+    outbox rows its invitations queued."""
+    async with engine.begin() as conn:
+        await conn.execute(delete(Organization).where(Organization.id == org.organization_id))
+        await conn.execute(
+            text("DELETE FROM email_outbox WHERE payload->>'to_email' LIKE :pattern"),
+            {"pattern": f"%-{run_id}-{org.size}@{EMAIL_DOMAIN}"},
+        )
@@ -0,0 +1,140 @@
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    org_size: int
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class Comparison:
+    scenario: str
+    org_size: int
+    concurrency: int
+    baseline_p95_ms: float
+    current_p95_ms: float
+    baseline_rps: float
+    current_rps: float
+    regressed: bool
+
+    @property
+    def p95_change(self) -> float:
+        return _change(self.baseline_p95_ms, self.current_p95_ms)
+
+    @property
+    def throughput_change(self) -> float:
+        return _change(self.baseline_rps, self.current_rps)
+
+
+@dataclass
+class MicroComparison:
+    name: str
+    baseline_ops_per_sec: float
+    current_ops_per_sec: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        return _change(self.baseline_ops_per_sec, self.current_ops_per_sec)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (``q`` in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    scenario: str, org_size: int, concurrency: int, latencies: list[float], errors: int, duration: float
+) -> ScenarioResult:
+    """Builds a result from per-request latencies in seconds."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return ScenarioResult(
+        scenario=scenario,
+        org_size=org_size,
+        concurrency=concurrency,
+        requests=count,
+        errors=errors,
+        duration_s=round(duration, 3),
+        throughput_rps=round(count / duration, 1) if duration > 0 else 0.0,
+        mean_ms=_ms(sum(ordered) / count if count else 0.0),
+        p50_ms=_ms(percentile(ordered, 50)),
+        p95_ms=_ms(percentile(ordered, 95)),
+        p99_ms=_ms(percentile(ordered, 99)),
+        max_ms=_ms(ordered[-1] if ordered else 0.0),
+    )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[Comparison]:
+    """Pairs up results by (scenario, org_size, concurrency). A pair regressed
+    when p95 grew or throughput shrank by more than ``threshold`` (0.1 = 10%).
+    Results present in only one run are skipped."""
+    previous = {_key(r): r for r in baseline.get("results", [])}
+    comparisons = []
+    for result in current.get("results", []):
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        comparisons.append(
+            Comparison(
+                scenario=result["scenario"],
+                org_size=result["org_size"],
+                concurrency=result["concurrency"],
+                baseline_p95_ms=before["p95_ms"],
+                current_p95_ms=result["p95_ms"],
+                baseline_rps=before["throughput_rps"],
+                current_rps=result["throughput_rps"],
+                regressed=(
+                    _change(before["p95_ms"], result["p95_ms"]) > threshold
+                    or _change(before["throughput_rps"], result["throughput_rps"]) < -threshold
+                ),
+            )
+        )
+    return comparisons
+
+
+def compare_micro(baseline: dict, current: dict, threshold: float) -> list[MicroComparison]:
+    """Pairs micro-benchmarks by name; a drop in ops/sec beyond ``threshold``
+    is a regression."""
+    previous = {r["name"]: r for r in baseline.get("micro", [])}
+    comparisons = []
+    for result in current.get("micro", []):
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        comparisons.append(
+            MicroComparison(
+                name=result["name"],
+                baseline_ops_per_sec=before["ops_per_sec"],
+                current_ops_per_sec=result["ops_per_sec"],
+                regressed=_change(before["ops_per_sec"], result["ops_per_sec"]) < -threshold,
+            )
+        )
+    return comparisons
+
+
+def _key(result: dict) -> tuple[str, int, int]:
+    return result["scenario"], result["org_size"], result["concurrency"]
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+
+from src.auth.oauth import GOOGLE_JWKS_URL, GOOGLE_TOKEN_URL, GOOGLE_USERINFO_URL
+from src.services.email import EmailProvider
+
+
+class StubEmailProvider(EmailProvider):
+    """Accepts every message after a fixed delay standing in for SMTP."""
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.sent = 0
+
+    async def send_invitation(
+        self, to_email: str, inviter_name: str, organization_name: str, invitation_link: str
+    ) -> None:
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+
+
+def _google(request: httpx.Request) -> httpx.Response:
+    url = str(request.url)
+    if url == GOOGLE_TOKEN_URL:
+        return httpx.Response(200, json={"access_token": "stub-access-token", "token_type": "Bearer"})
+    if url == GOOGLE_USERINFO_URL:
+        return httpx.Response(200, json={"email": "stub@bench.example.com", "name": "Stub User"})
+    if url == GOOGLE_JWKS_URL:
+        return httpx.Response(200, json={"keys": []}, headers={"cache-control": "max-age=3600"})
+    return httpx.Response(404)
+
+
+def google_stub_client() -> httpx.AsyncClient:
+    """A client for src.auth.oauth that answers Google's endpoints locally."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(_google))
@@ -1,12 +1,19 @@
-from .oauth import build_google_auth_url, exchange_code_for_tokens, get_google_user_info
+from .oauth import build_google_auth_url, exchange_code_for_tokens, get_google_identity, get_google_user_info
 from .jwt import create_access_token, create_refresh_token, verify_access_token, verify_refresh_token
 from .rbac import has_permission, has_minimum_role
-from .dependencies import get_current_user, get_org_user, require_role
+from .dependencies import (
+    get_current_user,
+    get_current_principal,
+    get_current_user_with_organization,
+    get_org_user,
+    require_role,
+)
 
 __all__ = [
     "build_google_auth_url",
     "exchange_code_for_tokens",
     "get_google_user_info",
+    "get_google_identity",
     "create_access_token",
     "create_refresh_token",
     "verify_access_token",
@@ -14,6 +21,8 @@ __all__ = [
     "has_permission",
     "has_minimum_role",
     "get_current_user",
+    "get_current_principal",
+    "get_current_user_with_organization",
     "get_org_user",
     "require_role",
 ]
@@ -1,5 +1,5 @@
 import uuid
-from typing import Annotated
+from typing import Annotated, NamedTuple
 
 import jwt as pyjwt
 from fastapi import Depends, HTTPException, Path, status, Cookie
@@ -10,24 +10,40 @@ from src.db import get_db
 from src.models import User, UserRole
 from src.repositories import UserRepository
 from src.auth.jwt import verify_access_token
+from src.auth.principal_cache import (
+    cache_principal,
+    get_cached_principal,
+    get_claims_principal,
+    organization_names,
+)
 from src.auth.rbac import has_minimum_role
 
 bearer_scheme = HTTPBearer()
 
 
-async def get_current_user(
+async def get_token_payload(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> dict:
     try:
-        payload = verify_access_token(credentials.credentials)
+        return verify_access_token(credentials.credentials)
     except pyjwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
+
+async def get_current_user(
+    payload: Annotated[dict, Depends(get_token_payload)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
     user_id = uuid.UUID(payload["sub"])
+
+    cached = get_cached_principal(user_id)
+    if cached is not None:
+        # load=False attaches the snapshot to this session without a SELECT.
+        return await db.merge(cached, load=False)
+
     user_repo = UserRepository(db)
     user = await user_repo.get_by_id(user_id)
 
@@ -36,17 +52,69 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    cache_principal(user)
     return user
 
 
+class UserWithOrganization(NamedTuple):
+    user: User
+    organization_name: str
+
+
+async def get_current_user_with_organization(
+    payload: Annotated[dict, Depends(get_token_payload)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserWithOrganization:
+    """get_current_user plus the organization's name, for endpoints such as
+    /users/me. Served from cache when warm, otherwise with a single joined
+    query instead of two sequential lookups."""
+    user_id = uuid.UUID(payload["sub"])
+
+    cached = get_cached_principal(user_id)
+    if cached is not None:
+        organization_name = organization_names.get(cached.organization_id)
+        if organization_name is not None:
+            return UserWithOrganization(await db.merge(cached, load=False), organization_name)
+
+    user_repo = UserRepository(db)
+    loaded = await user_repo.get_with_organization_name(user_id)
+
+    if loaded is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    user, organization_name = loaded
+    cache_principal(user)
+    organization_names.set(user.organization_id, organization_name)
+    return UserWithOrganization(user, organization_name)
+
+
+async def get_current_principal(
+    payload: Annotated[dict, Depends(get_token_payload)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """The caller as needed for authorization checks. In claims-only mode this
+    is built from the token without touching the database; otherwise (or when
+    the claims may be stale) it falls back to get_current_user."""
+    principal = get_claims_principal(payload)
+    if principal is not None:
+        return principal
+    return await get_current_user(payload, db)
+
+
 async def get_org_user(
     user_id: Annotated[uuid.UUID, Path()],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[User, Depends(get_current_principal)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
     """Resolves a {user_id} path parameter and asserts it belongs to the
     caller's organization. Prevents horizontal privilege escalation across
-    tenant boundaries before the service layer is ever reached."""
+    tenant boundaries before the service layer is ever reached.
+
+    The caller comes from the same get_current_principal dependency that
+    require_role uses, which FastAPI resolves once per request. Pass the
+    returned User (not its id) to UserService so it isn't loaded again."""
     user_repo = UserRepository(db)
     target = await user_repo.get_by_id(user_id)
 
@@ -60,7 +128,7 @@ async def get_org_user(
 
 def require_role(minimum_role: UserRole):
     async def role_checker(
-        current_user: Annotated[User, Depends(get_current_user)],
+        current_user: Annotated[User, Depends(get_current_principal)],
     ) -> User:
         if not has_minimum_role(current_user.role, minimum_role):
             raise HTTPException(
@@ -0,0 +1,98 @@
+import asyncio
+import re
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import jwt
+
+from src.config import settings
+
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+# A fetcher returns the JWKS document and how long it may be cached (seconds).
+JWKSFetcher = Callable[[], Awaitable[tuple[dict[str, Any], float]]]
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: str | None, default: float = 0.0) -> float:
+    if not cache_control:
+        return default
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE_RE.search(cache_control)
+    return float(match.group(1)) if match else default
+
+
+class JWKSCache:
+    """Caches a key set until its max-age runs out. A token signed with an
+    unknown ``kid`` (Google rotated keys) forces an early refetch, rate-limited
+    by ``min_refresh_interval`` so garbage kids can't hammer the endpoint."""
+
+    def __init__(
+        self,
+        fetcher: JWKSFetcher,
+        min_refresh_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetcher = fetcher
+        self.min_refresh_interval = min_refresh_interval
+        self._clock = clock
+        self._keys: dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str | None) -> Any:
+        if self._clock() >= self._expires_at:
+            await self._refresh()
+
+        key = self._keys.get(kid) if kid else None
+        if key is None and self._may_refetch():
+            await self._refresh()
+            key = self._keys.get(kid) if kid else None
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"No Google signing key with kid {kid!r}")
+        return key
+
+    def _may_refetch(self) -> bool:
+        return self._fetched_at is None or self._clock() - self._fetched_at >= self.min_refresh_interval
+
+    async def _refresh(self) -> None:
+        fetched_at = self._fetched_at
+        async with self._lock:
+            if self._fetched_at != fetched_at:
+                return  # another coroutine refreshed while we waited
+            jwks, max_age = await self.fetcher()
+            self._keys = {
+                jwk["kid"]: jwt.PyJWK(jwk).key
+                for jwk in jwks.get("keys", [])
+                if "kid" in jwk
+            }
+            now = self._clock()
+            self._fetched_at = now
+            self._expires_at = now + max_age
+
+
+class GoogleIdTokenVerifier:
+    """Validates the ``id_token`` from Google's token response locally:
+    RS256 signature against the cached JWKS, audience, issuer and expiry."""
+
+    def __init__(self, fetcher: JWKSFetcher, leeway: float = 30.0) -> None:
+        self.jwks = JWKSCache(fetcher)
+        self.leeway = leeway
+
+    async def verify(self, id_token: str) -> dict[str, Any]:
+        header = jwt.get_unverified_header(id_token)
+        key = await self.jwks.get_key(header.get("kid"))
+        return jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.google_client_id,
+            issuer=GOOGLE_ISSUERS,
+            leeway=self.leeway,
+        )
+
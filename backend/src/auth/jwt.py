@@ -1,54 +1,227 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
 
 import jwt
 
+from src.cache import TTLCache
 from src.config import settings
+from src.metrics import counter, gauge
+from src.models.user import UserRole
 
 ALGORITHM = "HS256"
 
+JWT_VERIFY_FAILURES = counter(
+    "jwt_verify_failures_total", "Access and refresh tokens rejected, by reason.", labelnames=("type", "reason")
+)
 
-def create_access_token(user_id: uuid.UUID, organization_id: uuid.UUID) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(
-        minutes=settings.jwt_access_token_expire_minutes
-    )
+# Tokens are PyJWT-compatible HS256 JWTs, but signed and checked here rather
+# than through jwt.encode/jwt.decode: the keyed HMAC state is built once per
+# secret and copied per token, the header segment is a constant, and the few
+# distinct header segments seen are parsed once.
+_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=").decode()
+_MAX_CACHED_HEADERS = 16
+_headers: dict[str, dict] = {}
+
+# Verified access-token payloads keyed by the token's SHA-256, so a client
+# re-sending one bearer token skips the HMAC, JSON parse and claim checks.
+# Each entry expires with its token; hashing keeps raw tokens out of memory.
+verified_tokens: TTLCache[bytes, dict] = TTLCache(
+    max_size=settings.jwt_verify_cache_max_size,
+    ttl_seconds=settings.jwt_access_token_expire_minutes * 60,
+)
+_VERIFY_CACHE_LOOKUPS = counter(
+    "jwt_verify_cache_lookups_total", "Access-token verifications by cache result.", labelnames=("result",)
+)
+_VERIFY_CACHE_HITS = _VERIFY_CACHE_LOOKUPS.labels("hit")
+_VERIFY_CACHE_MISSES = _VERIFY_CACHE_LOOKUPS.labels("miss")
+gauge(
+    "jwt_verify_cache_hit_ratio",
+    "Share of access-token verifications served from the cache since start.",
+    function=lambda: verified_tokens.hits / max(verified_tokens.hits + verified_tokens.misses, 1),
+)
+gauge("jwt_verify_cache_size", "Verified access tokens currently cached.", function=lambda: len(verified_tokens))
+
+
+class _HS256Key:
+    __slots__ = ("secret", "_mac")
+
+    def __init__(self, secret: str) -> None:
+        self.secret = secret
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+
+_key: _HS256Key | None = None
+
+
+def _signing_key() -> _HS256Key:
+    # Rebuilt only when the configured secret changes (tests patch it).
+    global _key
+    secret = settings.jwt_secret_key
+    if _key is None or _key.secret is not secret:
+        _key = _HS256Key(secret)
+    return _key
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _encode(payload: dict) -> str:
+    signing_input = _HEADER_SEGMENT + "." + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return signing_input + "." + _b64encode(_signing_key().sign(signing_input.encode()))
+
+
+def _header(segment: str) -> dict:
+    header = _headers.get(segment)
+    if header is None:
+        header = json.loads(_b64decode(segment))
+        if not isinstance(header, dict):
+            raise ValueError("header is not an object")
+        if len(_headers) < _MAX_CACHED_HEADERS:
+            _headers[segment] = header
+    return header
+
+
+def create_access_token(
+    user_id: uuid.UUID,
+    organization_id: uuid.UUID,
+    role: UserRole | None = None,
+    authz_version: int | None = None,
+) -> str:
+    """``role`` and ``authz_version`` are only signed into the token when
+    ``settings.jwt_embed_authz_claims`` is enabled."""
+    now = int(time.time())
     payload = {
         "sub": str(user_id),
         "org": str(organization_id),
         "type": "access",
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
+        "exp": now + settings.jwt_access_token_expire_minutes * 60,
+        "iat": now,
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=ALGORITHM)
+    if settings.jwt_embed_authz_claims and role is not None and authz_version is not None:
+        payload["role"] = role.value
+        payload["ver"] = authz_version
+    return _encode(payload)
 
 
-def create_refresh_token(user_id: uuid.UUID, organization_id: uuid.UUID) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(
-        days=settings.jwt_refresh_token_expire_days
-    )
+def create_refresh_token(
+    user_id: uuid.UUID, organization_id: uuid.UUID, session_id: uuid.UUID, jti: uuid.UUID
+) -> str:
+    """``session_id`` and ``jti`` name the refresh session and the token's
+    place in it (see src/services/session_service.py)."""
+    now = int(time.time())
     payload = {
         "sub": str(user_id),
         "org": str(organization_id),
+        "sid": str(session_id),
+        "jti": str(jti),
         "type": "refresh",
-        "exp": expire,
-        "iat": datetime.now(timezone.utc),
+        "exp": now + settings.jwt_refresh_token_expire_days * 86400,
+        "iat": now,
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=ALGORITHM)
+    return _encode(payload)
 
 
 def decode_token(token: str) -> dict:
-    return jwt.decode(token, settings.jwt_secret_key, algorithms=[ALGORITHM])
+    """Verifies the signature and the exp/iat/nbf claims exactly as
+    ``jwt.decode(token, key, algorithms=["HS256"])`` would, raising the same
+    PyJWT exceptions."""
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = _header(header_segment)
+        signature = _b64decode(signature_segment)
+    except (ValueError, binascii.Error) as exc:
+        raise jwt.DecodeError("Invalid token") from exc
+
+    if header.get("alg") != ALGORITHM:
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+    expected = _signing_key().sign(f"{header_segment}.{payload_segment}".encode())
+    if not hmac.compare_digest(expected, signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    try:
+        payload = json.loads(_b64decode(payload_segment))
+    except (ValueError, binascii.Error) as exc:
+        raise jwt.DecodeError("Invalid payload") from exc
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload")
+    _validate_claims(payload, time.time())
+    return payload
+
+
+def _validate_claims(payload: dict, now: float) -> None:
+    if "exp" in payload:
+        try:
+            exp = int(payload["exp"])
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.") from None
+        if exp <= now:
+            raise jwt.ExpiredSignatureError("Signature has expired")
+    if "iat" in payload:
+        try:
+            iat = int(payload["iat"])
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.InvalidIssuedAtError("Issued At claim (iat) must be an integer.") from None
+        if iat > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+    if "nbf" in payload:
+        try:
+            nbf = int(payload["nbf"])
+        except (ValueError, TypeError, OverflowError):
+            raise jwt.DecodeError("Not Before claim (nbf) must be an integer.") from None
+        if nbf > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+
+
+def _verify(token: str, token_type: str, wrong_type_message: str) -> dict:
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        JWT_VERIFY_FAILURES.labels(token_type, "expired").inc()
+        raise
+    except jwt.InvalidTokenError:
+        JWT_VERIFY_FAILURES.labels(token_type, "invalid").inc()
+        raise
+    if payload.get("type") != token_type:
+        JWT_VERIFY_FAILURES.labels(token_type, "wrong_type").inc()
+        raise jwt.InvalidTokenError(wrong_type_message)
+    return payload
 
 
 def verify_access_token(token: str) -> dict:
-    payload = decode_token(token)
-    if payload.get("type") != "access":
-        raise jwt.InvalidTokenError("Not an access token")
+    """The payload may be shared with other requests presenting the same
+    token, so callers must not mutate it."""
+    if not verified_tokens.enabled:
+        return _verify(token, "access", "Not an access token")
+
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(digest)
+    if payload is not None:
+        _VERIFY_CACHE_HITS.inc()
+        return payload
+
+    _VERIFY_CACHE_MISSES.inc()
+    payload = _verify(token, "access", "Not an access token")
+    if "exp" in payload:
+        verified_tokens.set(digest, payload, ttl_seconds=int(payload["exp"]) - time.time())
+    else:
+        verified_tokens.set(digest, payload)
     return payload
 
 
 def verify_refresh_token(token: str) -> dict:
-    payload = decode_token(token)
-    if payload.get("type") != "refresh":
-        raise jwt.InvalidTokenError("Not a refresh token")
-    return payload
+    return _verify(token, "refresh", "Not a refresh token")
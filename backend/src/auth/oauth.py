@@ -1,7 +1,14 @@
+import importlib.util
+import time
+from typing import Any
 from urllib.parse import urlencode
 import httpx
+import jwt
 import logging
+from fastapi import HTTPException, status
 from src.config import settings
+from src.auth.google_id_token import GoogleIdTokenVerifier, parse_max_age
+from src.metrics import histogram
 
 # Setup basic logging to see details in Docker logs
 logger = logging.getLogger(__name__)
@@ -9,6 +16,53 @@ logger = logging.getLogger(__name__)
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+
+OAUTH_UPSTREAM_DURATION = histogram(
+    "oauth_upstream_duration_seconds",
+    "Latency of calls to Google's OAuth endpoints, including failures.",
+    labelnames=("call",),
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+_TOKEN_EXCHANGE_DURATION = OAUTH_UPSTREAM_DURATION.labels("token_exchange")
+_USERINFO_DURATION = OAUTH_UPSTREAM_DURATION.labels("userinfo")
+_JWKS_DURATION = OAUTH_UPSTREAM_DURATION.labels("jwks")
+
+# One keep-alive client for every outbound Google call, so a login reuses the
+# TCP+TLS session instead of handshaking twice. Owned by the app lifespan.
+_http_client: httpx.AsyncClient | None = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        # HTTP/2 needs the optional `h2` package (httpx[http2]).
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(
+            settings.oauth_http_timeout_seconds,
+            connect=settings.oauth_http_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.oauth_http_max_connections,
+            max_keepalive_connections=settings.oauth_http_max_keepalive_connections,
+            keepalive_expiry=settings.oauth_http_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it on first use when the app
+    lifespan hasn't (e.g. in tests or scripts)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 def build_google_auth_url(state: str) -> str:
@@ -34,30 +88,75 @@ async def exchange_code_for_tokens(code: str) -> dict:
         "grant_type": "authorization_code",
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(GOOGLE_TOKEN_URL, data=data)
-        
-        # THE FIX: Log the error body before raising exception
-        if response.status_code != 200:
-            print(f"\n--- GOOGLE OAUTH ERROR DETAILS ---")
-            print(f"Status: {response.status_code}")
-            print(f"Body: {response.text}")
-            print(f"Redirect URI being sent: {settings.google_redirect_uri}")
-            print(f"----------------------------------\n")
-            
-        response.raise_for_status()
-        return response.json()
+    started = time.perf_counter()
+    try:
+        response = await get_http_client().post(GOOGLE_TOKEN_URL, data=data)
+    finally:
+        _TOKEN_EXCHANGE_DURATION.observe(time.perf_counter() - started)
+
+    # THE FIX: Log the error body before raising exception
+    if response.status_code != 200:
+        print(f"\n--- GOOGLE OAUTH ERROR DETAILS ---")
+        print(f"Status: {response.status_code}")
+        print(f"Body: {response.text}")
+        print(f"Redirect URI being sent: {settings.google_redirect_uri}")
+        print(f"----------------------------------\n")
+
+    response.raise_for_status()
+    return response.json()
 
 
 async def get_google_user_info(access_token: str) -> dict:
     """Fetches user profile data using the access token."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
+    started = time.perf_counter()
+    try:
+        response = await get_http_client().get(
             GOOGLE_USERINFO_URL,
             headers={"Authorization": f"Bearer {access_token}"},
         )
-        if response.status_code != 200:
-            print(f"GOOGLE USER INFO ERROR: {response.text}")
-            
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+    finally:
+        _USERINFO_DURATION.observe(time.perf_counter() - started)
+    if response.status_code != 200:
+        print(f"GOOGLE USER INFO ERROR: {response.text}")
+
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_google_jwks() -> tuple[dict[str, Any], float]:
+    """Downloads Google's signing keys, honouring the Cache-Control max-age
+    Google sends with them (typically several hours)."""
+    started = time.perf_counter()
+    try:
+        response = await get_http_client().get(GOOGLE_JWKS_URL)
+    finally:
+        _JWKS_DURATION.observe(time.perf_counter() - started)
+    response.raise_for_status()
+    return response.json(), parse_max_age(response.headers.get("cache-control"), default=300.0)
+
+
+google_id_token_verifier = GoogleIdTokenVerifier(fetch_google_jwks)
+
+
+async def get_google_identity(tokens: dict) -> dict:
+    """Returns the user's email/name/picture for a token response.
+
+    Validates the ``id_token`` locally against Google's cached JWKS, which
+    saves the userinfo round-trip; falls back to the userinfo endpoint when
+    there is no ID token or it can't be verified. A valid ID token whose
+    email Google hasn't verified is rejected outright, before any account
+    is matched or created by that address."""
+    id_token = tokens.get("id_token")
+    if settings.google_verify_id_token_locally and id_token:
+        try:
+            claims = await google_id_token_verifier.verify(id_token)
+        except (jwt.InvalidTokenError, httpx.HTTPError) as exc:
+            logger.warning("Google ID token verification failed, falling back to userinfo: %r", exc)
+        else:
+            if claims.get("email_verified") is not True:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN, detail="Google account email is not verified"
+                )
+            return claims
+
+    return await get_google_user_info(tokens["access_token"])
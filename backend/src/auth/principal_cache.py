@@ -0,0 +1,122 @@
+import uuid
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.cache import TTLCache
+from src.config import settings
+from src.models import User, UserRole
+
+# Column snapshots rather than ORM instances: a cached User must never be
+# shared between sessions, so each hit rebuilds a fresh detached instance.
+principal_cache: TTLCache[uuid.UUID, dict[str, Any]] = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+# Latest known (organization_id, authz_version) per user, consulted by the
+# claims-only authorization mode. Entries only need to outlive access tokens.
+authz_versions: TTLCache[uuid.UUID, tuple[uuid.UUID, int]] = TTLCache(
+    max_size=settings.principal_cache_max_size * 10,
+    ttl_seconds=settings.jwt_access_token_expire_minutes * 60,
+)
+
+# Organization names for /users/me. Only dropped when the organization is
+# deleted; there is no rename, so entries never go stale otherwise.
+organization_names: TTLCache[uuid.UUID, str] = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+_USER_COLUMNS = tuple(attr.key for attr in User.__mapper__.column_attrs)
+
+
+def get_cached_principal(user_id: uuid.UUID) -> User | None:
+    snapshot = principal_cache.get(user_id)
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def cache_principal(user: User) -> None:
+    # Reading an expired attribute (e.g. updated_at after a flush) would emit
+    # a lazy SELECT, so only fully loaded instances are snapshotted.
+    if inspect(user).unloaded.isdisjoint(_USER_COLUMNS):
+        principal_cache.set(user.id, {key: getattr(user, key) for key in _USER_COLUMNS})
+    record_authz_version(user)
+
+
+def record_authz_version(user: User) -> None:
+    authz_versions.set(user.id, (user.organization_id, user.authz_version))
+
+
+def get_claims_principal(payload: dict) -> User | None:
+    """Builds the caller from signed role/version claims when the version still
+    matches the latest one seen by this process. Returns None when the claims
+    are absent or possibly stale, in which case the caller must be loaded.
+
+    The returned User is detached and only carries id, organization_id, role
+    and authz_version; touching any other attribute raises."""
+    if not settings.jwt_embed_authz_claims:
+        return None
+    role = payload.get("role")
+    version = payload.get("ver")
+    if role is None or version is None:
+        return None
+
+    user_id = uuid.UUID(payload["sub"])
+    organization_id = uuid.UUID(payload["org"])
+    if authz_versions.get(user_id) != (organization_id, version):
+        return None
+
+    user = User(id=user_id, organization_id=organization_id, role=UserRole(role), authz_version=version)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    principal_cache.pop(user_id)
+    authz_versions.pop(user_id)
+
+
+def invalidate_principal_on_commit(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Drops the user's entries now and again once ``db`` commits. A request
+    that loads the user in between still reads the old row (and
+    authz_version), and would otherwise cache it until the TTL runs out."""
+    invalidate_principal(user_id)
+    db.sync_session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(user_id)
+
+
+def invalidate_organization_principals_on_commit(db: AsyncSession, organization_id: uuid.UUID) -> None:
+    """Like invalidate_principal_on_commit, for every member of the
+    organization, so a request racing its deletion can't re-cache them."""
+    invalidate_organization_principals(organization_id)
+    db.sync_session.info.setdefault(_PENDING_ORGANIZATION_INVALIDATIONS, set()).add(organization_id)
+
+
+_PENDING_INVALIDATIONS = "invalidate_principals"
+_PENDING_ORGANIZATION_INVALIDATIONS = "invalidate_organization_principals"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_principal(user_id)
+    for organization_id in session.info.pop(_PENDING_ORGANIZATION_INVALIDATIONS, ()):
+        invalidate_organization_principals(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+    session.info.pop(_PENDING_ORGANIZATION_INVALIDATIONS, None)
+
+
+def invalidate_organization_principals(organization_id: uuid.UUID) -> None:
+    organization_names.pop(organization_id)
+    principal_cache.discard_where(lambda snapshot: snapshot["organization_id"] == organization_id)
+    authz_versions.discard_where(lambda entry: entry[0] == organization_id)
@@ -13,8 +13,11 @@ ROLE_PERMISSIONS: dict[UserRole, set[str]] = {
 }
 
 
+_NO_PERMISSIONS: frozenset[str] = frozenset()
+
+
 def has_permission(role: UserRole, permission: str) -> bool:
-    return permission in ROLE_PERMISSIONS.get(role, set())
+    return permission in ROLE_PERMISSIONS.get(role, _NO_PERMISSIONS)
 
 
 def has_minimum_role(user_role: UserRole, required_role: UserRole) -> bool:
@@ -1,3 +1,3 @@
-from .session import engine, async_session_factory, get_db
+from .session import engine, async_session_factory, get_db, get_session_factory, warm_pool
 
-__all__ = ["engine", "async_session_factory", "get_db"]
+__all__ = ["engine", "async_session_factory", "get_db", "get_session_factory", "warm_pool"]
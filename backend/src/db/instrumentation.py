@@ -0,0 +1,78 @@
+"""Per-request SQL statistics.
+
+Engine-wide cursor events add each statement's duration to the stats of the
+request being served (tracked in a ContextVar), so any engine, including the
+test one, is covered. Outside a request the listeners only do a ContextVar
+lookup.
+"""
+
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "total_time", "slowest_time", "slowest_statement", "statement_counts")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+        self.statement_counts: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times: the N+1 signature,
+        since bound parameters keep the SQL text identical per lookup."""
+        return [(sql, n) for sql, n in self.statement_counts.items() if n >= threshold]
+
+
+_current: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def start_request_stats() -> RequestQueryStats:
+    stats = RequestQueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_request_stats() -> RequestQueryStats | None:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute; its start time
+    # is popped here so it can't pair up with a later statement's timing.
+    stats = _current.get()
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        elapsed = time.perf_counter() - started.pop()
+        if stats is not None and context.statement is not None:
+            stats.record(context.statement, elapsed)
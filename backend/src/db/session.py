@@ -1,9 +1,38 @@
+import asyncio
+import logging
 import ssl
-from collections.abc import AsyncGenerator
+import time
+import uuid
+from collections.abc import AsyncGenerator, Callable
+from typing import cast
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from src.config import settings
+from src.metrics import gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_WAIT = histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including opening a new one.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited.
+    Pool exhaustion under burst shows up here long before it times out."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
 
 # Neon (and any TLS-only Postgres host) requires SSL.
 # asyncpg resolves `sslmode` in the URL itself, but passing an explicit
@@ -13,14 +42,99 @@ if settings.app_env == "production":
     _ssl_ctx = ssl.create_default_context()
     _connect_args = {"ssl": _ssl_ctx}
 
+if settings.db_pgbouncer_mode:
+    # Transaction-mode poolers (PgBouncer, Neon's -pooler endpoint) hand each
+    # transaction to an arbitrary server connection, so named prepared
+    # statements cached on one backend are missing or clash on the next.
+    # Disable both statement caches and give every statement a unique name.
+    _connect_args |= {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+else:
+    _connect_args |= {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+
+_pool_args: dict = {"poolclass": NullPool}
+if settings.db_pool_size > 0:
+    _pool_args = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
     connect_args=_connect_args,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    **_pool_args,
 )
 
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+if isinstance(engine.pool, AsyncAdaptedQueuePool):
+    gauge("db_pool_checked_out", "Connections currently checked out of the pool.", function=engine.pool.checkedout)
+    gauge(
+        "db_pool_overflow",
+        "Connections open beyond pool_size.",
+        # engine.pool is re-read on each scrape: dispose() swaps in a new pool.
+        function=lambda: max(cast(AsyncAdaptedQueuePool, engine.pool).overflow(), 0),
+    )
+
+
+# Selecting a NULL of each enum makes asyncpg introspect and cache their codecs
+# on the connection, so the first real query doesn't pay for it.
+_WARMUP_QUERY = text("SELECT NULL::user_role, NULL::user_status, NULL::invitation_status")
+
+
+async def warm_pool(connections: int) -> int:
+    """Opens up to ``connections`` pooled connections concurrently and primes
+    each one, then returns them to the pool. Returns how many were warmed;
+    failures are logged rather than raised so a cold database doesn't block
+    startup."""
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return 0
+    connections = min(connections, settings.db_pool_size)
+    if connections <= 0:
+        return 0
+
+    arrived = 0
+    all_arrived = asyncio.Event()
+
+    def _arrive() -> None:
+        nonlocal arrived
+        arrived += 1
+        if arrived == connections:
+            all_arrived.set()
+
+    async def _warm_one() -> None:
+        # Every task holds its connection until all have one (or failed), so
+        # the pool is forced to open `connections` distinct connections.
+        opened = False
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(_WARMUP_QUERY)
+                opened = True
+                _arrive()
+                await all_arrived.wait()
+        finally:
+            if not opened:
+                _arrive()
+
+    tasks = [_warm_one() for _ in range(connections)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        logger.warning("Pool warmup: %d of %d connections failed: %r", len(failures), connections, failures[0])
+    return connections - len(failures)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
@@ -30,3 +144,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """For work that outlives the request's get_db session, such as the body
+    of a streamed response, which is sent after dependencies are torn down."""
+    return async_session_factory
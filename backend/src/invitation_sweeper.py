@@ -0,0 +1,16 @@
+"""Standalone invitation expiry sweeper, for running it outside the API process:
+
+    python -m src.invitation_sweeper
+
+Set INVITATION_SWEEP_INTERVAL_SECONDS=0 on the API when the sweeper runs here
+instead; this process falls back to a 300s interval in that case.
+"""
+
+from src.config import settings
+from src.services.background import run_standalone
+from src.services.invitation_sweeper import InvitationSweeper
+
+if __name__ == "__main__":
+    run_standalone(
+        "Invitation sweeper", lambda: InvitationSweeper().run(settings.invitation_sweep_interval_seconds or 300.0)
+    )
@@ -1,17 +1,189 @@
+import json
+import logging
+import time
+import uuid
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import settings
-from src.routes import health, auth, users, invitations, organizations
+from src.db import engine, warm_pool
+from src.db.instrumentation import start_request_stats
+from src.metrics import counter, histogram
+from src.auth.jwt import create_access_token, verify_access_token
+from src.auth.oauth import close_http_client, get_http_client
+from src.services.email import close_smtp_executor
+from src.services.background import stop_background_jobs
+from src.services.email_outbox import start_outbox_workers
+from src.services.invitation_sweeper import start_invitation_sweeper
+from src.services.session_sweeper import start_session_sweeper
+from src.routes import health, auth, users, invitations, organizations, metrics
+
+logging.basicConfig(level=settings.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+_process_started = time.perf_counter()
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body is fully sent, by route template.",
+    labelnames=("method", "route"),
+)
+HTTP_REQUESTS = counter(
+    "http_requests_total",
+    "Responses sent, by route template and status code.",
+    labelnames=("method", "route", "status"),
+)
+# Status label strings are interned once instead of formatted per request.
+_STATUS_LABELS = {code: str(code) for code in range(100, 600)}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    # This is a good place to initialize DB pools if needed later
+    # Pay for TLS + auth to the database and asyncpg type introspection here
+    # rather than on the first requests after a cold start.
+    warmup_started = time.perf_counter()
+    warmed = await warm_pool(settings.db_pool_warm_connections)
+    # One token round-trip imports and initialises the HMAC/JSON machinery.
+    verify_access_token(create_access_token(uuid.uuid4(), uuid.uuid4()))
+    get_http_client()
+    if settings.email_outbox_workers > 0:
+        start_outbox_workers(settings.email_outbox_workers)
+    if settings.invitation_sweep_interval_seconds > 0:
+        start_invitation_sweeper(settings.invitation_sweep_interval_seconds)
+    if settings.refresh_session_sweep_interval_seconds > 0:
+        start_session_sweeper(settings.refresh_session_sweep_interval_seconds)
+    now = time.perf_counter()
+    logger.info(
+        "Startup complete in %.3fs (warmup %.3fs, %d pooled connections ready)",
+        now - _process_started,
+        now - warmup_started,
+        warmed,
+    )
     yield
+    await stop_background_jobs()
+    await close_smtp_executor()
+    await close_http_client()
+    await engine.dispose()
+
+
+class FirstResponseLogger:
+    """Logs the time from process start to the first successful response,
+    then gets out of the way."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.done or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400 and not self.done:
+                self.done = True
+                logger.info(
+                    "First successful request (%s) served %.3fs after process start",
+                    scope["path"],
+                    time.perf_counter() - _process_started,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestMetricsMiddleware:
+    """Records latency and status per route template (``/users/{user_id}``,
+    never the raw path, so label cardinality stays bounded). Requests that
+    match no route are grouped under ``unmatched``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, path, _STATUS_LABELS.get(status_code) or str(status_code)).inc()
+
+
+class QueryStatsMiddleware:
+    """Collects SQL statement count, total DB time and the slowest statement
+    per request. Development responses carry them in a Server-Timing header;
+    elsewhere they are logged as one JSON line. Statements repeated at least
+    ``db_n_plus_one_threshold`` times are logged as suspected N+1 queries."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.db_query_stats_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats()
+        server_timing = settings.app_env == "development"
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if server_timing:
+                    # Streaming bodies may still query after this point; the
+                    # header covers everything up to the response start.
+                    timing = f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"'
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = scope["path"]
+            for statement, count in stats.repeated_statements(settings.db_n_plus_one_threshold):
+                logger.warning(
+                    "Possible N+1: %s %s ran the same statement %d times: %s",
+                    scope["method"],
+                    path,
+                    count,
+                    statement,
+                )
+            if not server_timing and stats.count:
+                logger.info(
+                    json.dumps(
+                        {
+                            "event": "request_db_stats",
+                            "method": scope["method"],
+                            "path": path,
+                            "status": status_code,
+                            "queries": stats.count,
+                            "db_ms": round(stats.total_time * 1000, 2),
+                            "slowest_ms": round(stats.slowest_time * 1000, 2),
+                            "slowest_statement": stats.slowest_statement,
+                        }
+                    )
+                )
 
 
 app = FastAPI(
@@ -35,10 +207,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(FirstResponseLogger)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(invitations.router)
-app.include_router(organizations.router)
\ No newline at end of file
+app.include_router(organizations.router)
+app.include_router(metrics.router)
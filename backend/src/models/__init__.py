@@ -1,7 +1,9 @@
 from .base import Base
 from .organization import Organization
 from .user import User, UserRole, UserStatus
-from .invitation import Invitation, InvitationStatus
+from .invitation import Invitation, InvitationStatus, hash_invitation_token
+from .email_outbox import EmailOutbox, OutboxStatus
+from .refresh_session import RefreshSession
 
 __all__ = [
     "Base",
@@ -11,4 +13,8 @@ __all__ = [
     "UserStatus",
     "Invitation",
     "InvitationStatus",
+    "hash_invitation_token",
+    "EmailOutbox",
+    "OutboxStatus",
+    "RefreshSession",
 ]
@@ -1,8 +1,20 @@
 import enum
+import hashlib
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, ForeignKey, Enum, func
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -16,8 +28,29 @@ class InvitationStatus(str, enum.Enum):
     EXPIRED = "expired"
 
 
+def hash_invitation_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 class Invitation(Base):
     __tablename__ = "invitations"
+    __table_args__ = (
+        # The only index on the token: a fixed 32-byte digest.
+        UniqueConstraint("token_hash", name="uq_invitations_token_hash"),
+        CheckConstraint("octet_length(token_hash) = 32", name="ck_invitations_token_hash_length"),
+        # Pending-invitation lookups by organization, alone or with an email.
+        # Accepted and expired rows never enter (or bloat) this index.
+        Index(
+            "idx_invitations_pending_org_email",
+            "organization_id",
+            "email",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # The expiry sweeper's scan; only pending rows are indexed.
+        Index("idx_invitations_pending_expires", "expires_at", postgresql_where=text("status = 'pending'")),
+        # The export stream's order; also serves cascading organization deletes.
+        Index("idx_invitations_org_created_id", "organization_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -30,7 +63,7 @@ class Invitation(Base):
     role: Mapped[UserRole] = mapped_column(
         Enum(UserRole, name="user_role", create_constraint=False, values_callable=lambda obj: [e.value for e in obj]), nullable=False
     )
-    token: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     invited_by: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -46,3 +79,14 @@ class Invitation(Base):
 
     organization: Mapped["Organization"] = relationship(back_populates="invitations")  # noqa: F821
     inviter: Mapped["User"] = relationship(foreign_keys=[invited_by])  # noqa: F821
+
+    @property
+    def token(self) -> str | None:
+        """The raw token, only known on the instance that set it (i.e. when
+        the invitation is created). Only its SHA-256 is stored."""
+        return getattr(self, "_token", None)
+
+    @token.setter
+    def token(self, value: str) -> None:
+        self._token = value
+        self.token_hash = hash_invitation_token(value)
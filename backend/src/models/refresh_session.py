@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RefreshSession(Base):
+    """One signed-in device. Its refresh tokens form a family in which only
+    the latest (``current_jti``) is valid: every refresh rotates it, and
+    presenting an older one revokes the whole family. The token just rotated
+    out (``previous_jti``) is still honoured for a short grace period so
+    concurrent refreshes from several tabs don't look like reuse."""
+
+    __tablename__ = "refresh_sessions"
+    __table_args__ = (
+        # A user's live sessions (listing and revocation); also serves the
+        # cascade when the user is deleted.
+        Index("idx_refresh_sessions_user_expires", "user_id", "expires_at"),
+        # Organization-wide revocation and the organization delete cascade.
+        Index("idx_refresh_sessions_org", "organization_id"),
+        # Batch cleanup of expired sessions.
+        Index("idx_refresh_sessions_expires", "expires_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    current_jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
+    previous_jti: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    rotated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, Text, DateTime, ForeignKey, Enum, UniqueConstraint, func
+from sqlalchemy import DDL, Integer, String, Text, DateTime, ForeignKey, Enum, Index, UniqueConstraint, event, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,6 +24,19 @@ class User(Base):
     __tablename__ = "users"
     __table_args__ = (
         UniqueConstraint("email", name="uq_user_email"),
+        # Keyset pagination of GET /users, one per sort order.
+        Index("idx_users_org_created_id", "organization_id", "created_at", "id"),
+        Index("idx_users_org_name_id", "organization_id", "name", "id"),
+        # Member search: trigram matching on name/email within one org
+        # (btree_gin lets organization_id share the GIN index).
+        Index(
+            "idx_users_search_trgm",
+            "organization_id",
+            "name",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops", "email": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -45,6 +58,11 @@ class User(Base):
         nullable=False,
         default=UserStatus.PENDING,
     )
+    # Bumped whenever the user's authorization changes so access tokens that
+    # embed a role claim can be recognised as stale.
+    authz_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, server_default=func.now()
     )
@@ -53,3 +71,7 @@ class User(Base):
     )
 
     organization: Mapped["Organization"] = relationship(back_populates="users")  # noqa: F821
+
+
+for _extension in ("pg_trgm", "btree_gin"):
+    event.listen(User.__table__, "before_create", DDL(f"CREATE EXTENSION IF NOT EXISTS {_extension}"))
@@ -0,0 +1,26 @@
+"""Standalone email outbox drain, for running delivery outside the API process:
+
+    python -m src.outbox_worker
+
+Set EMAIL_OUTBOX_WORKERS=0 on the API when delivery runs here instead.
+"""
+
+import asyncio
+
+from src.config import settings
+from src.services.background import run_standalone, stop_background_jobs
+from src.services.email import close_smtp_executor
+from src.services.email_outbox import start_outbox_workers
+
+
+async def main() -> None:
+    start_outbox_workers(max(settings.email_outbox_workers, 1))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_background_jobs()
+        await close_smtp_executor()
+
+
+if __name__ == "__main__":
+    run_standalone("Outbox worker", main)
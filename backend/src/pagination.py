@@ -0,0 +1,27 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and
+base64url'd so clients treat it as a token rather than something to build.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Raises ValueError if the cursor was not produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if isinstance(values, list):
+        return values
+    raise ValueError("Malformed cursor")
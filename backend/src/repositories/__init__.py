@@ -1,9 +1,13 @@
 from .organizations import OrganizationRepository
 from .users import UserRepository
 from .invitations import InvitationRepository
+from .email_outbox import EmailOutboxRepository
+from .refresh_sessions import RefreshSessionRepository
 
 __all__ = [
     "OrganizationRepository",
     "UserRepository",
     "InvitationRepository",
+    "EmailOutboxRepository",
+    "RefreshSessionRepository",
 ]
@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy import ColumnElement, CursorResult, Text, delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import EmailOutbox, OutboxStatus
+
+# Payload keys that carry credentials (the invitation link embeds the raw
+# invitation token). They are only needed for delivery, so they are dropped
+# once a message is sent or dead-lettered.
+SECRET_PAYLOAD_KEYS = ("invitation_link",)
+
+
+def _redacted_payload() -> ColumnElement[Any]:
+    payload: ColumnElement[Any] = EmailOutbox.payload.expression
+    for key in SECRET_PAYLOAD_KEYS:
+        payload = payload.op("-", return_type=JSONB)(literal(key, Text))
+    return payload
+
+
+class EmailOutboxRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def enqueue(self, kind: str, payload: dict[str, Any]) -> EmailOutbox:
+        message = EmailOutbox(kind=kind, payload=payload)
+        self.db.add(message)
+        await self.db.flush()
+        return message
+
+    async def enqueue_many(self, kind: str, payloads: list[dict[str, Any]]) -> None:
+        if not payloads:
+            return
+        await self.db.execute(insert(EmailOutbox), [{"kind": kind, "payload": payload} for payload in payloads])
+
+    async def claim_due(self, limit: int, lease: timedelta) -> list[EmailOutbox]:
+        """Leases up to ``limit`` due messages: each claimed row has its attempt
+        counted and is hidden from other workers until the lease runs out, so a
+        worker that dies mid-send only delays the retry. SKIP LOCKED lets
+        concurrent workers claim disjoint batches."""
+        due = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == OutboxStatus.PENDING, EmailOutbox.next_attempt_at <= func.now())
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due))
+            .values(attempts=EmailOutbox.attempts + 1, next_attempt_at=func.now() + lease)
+            .returning(EmailOutbox),
+            execution_options={"synchronize_session": False},
+        )
+        return list(result.scalars().all())
+
+    async def mark_sent(self, ids: list[uuid.UUID]) -> None:
+        if not ids:
+            return
+        await self.db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids))
+            .values(status=OutboxStatus.SENT, sent_at=func.now(), last_error=None, payload=_redacted_payload()),
+            execution_options={"synchronize_session": False},
+        )
+
+    async def mark_failed(self, id: uuid.UUID, error: str, retry_at: datetime | None) -> None:
+        """Schedules a retry at ``retry_at``, or dead-letters the message when
+        ``retry_at`` is None."""
+        values: dict[str, Any] = {"last_error": error}
+        if retry_at is None:
+            values["status"] = OutboxStatus.DEAD
+            values["payload"] = _redacted_payload()
+        else:
+            values["next_attempt_at"] = retry_at
+        await self.db.execute(
+            update(EmailOutbox).where(EmailOutbox.id == id).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+
+    async def count_pending(self) -> int:
+        result = await self.db.execute(
+            select(func.count()).select_from(EmailOutbox).where(EmailOutbox.status == OutboxStatus.PENDING)
+        )
+        return result.scalar_one()
+
+    async def purge_settled(self, created_before: datetime, limit: int) -> int:
+        """Deletes up to ``limit`` sent or dead-lettered messages created
+        before ``created_before`` and returns how many."""
+        settled = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status != OutboxStatus.PENDING, EmailOutbox.created_at < created_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(EmailOutbox).where(EmailOutbox.id.in_(settled)),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount
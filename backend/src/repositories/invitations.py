@@ -1,10 +1,25 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime
+from typing import Any, cast
 
-from sqlalchemy import select, and_
+from sqlalchemy import CursorResult, Row, and_, delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Invitation, InvitationStatus, UserRole
+from src.models import Invitation, InvitationStatus, Organization, UserRole, hash_invitation_token
+
+
+# Token digests are deliberately not exported.
+INVITATION_EXPORT_COLUMNS = (
+    Invitation.id,
+    Invitation.email,
+    Invitation.name,
+    Invitation.role,
+    Invitation.status,
+    Invitation.invited_by,
+    Invitation.created_at,
+    Invitation.expires_at,
+)
 
 
 class InvitationRepository:
@@ -34,12 +49,41 @@ class InvitationRepository:
         await self.db.flush()
         return invitation
 
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[Invitation]:
+        """Inserts all ``rows`` in a single multi-row INSERT ... RETURNING and
+        returns the invitations in the same order. Each row carries its raw
+        ``token``, which is stored hashed and kept on the returned instance."""
+        if not rows:
+            return []
+        tokens = [row["token"] for row in rows]
+        values = [
+            {key: value for key, value in row.items() if key != "token"} | {"token_hash": hash_invitation_token(token)}
+            for row, token in zip(rows, tokens)
+        ]
+        result = await self.db.scalars(
+            insert(Invitation).returning(Invitation, sort_by_parameter_order=True), values
+        )
+        invitations = list(result.all())
+        for invitation, token in zip(invitations, tokens):
+            invitation.token = token
+        return invitations
+
     async def get_by_token(self, token: str) -> Invitation | None:
         result = await self.db.execute(
-            select(Invitation).where(Invitation.token == token)
+            select(Invitation).where(Invitation.token_hash == hash_invitation_token(token))
         )
         return result.scalar_one_or_none()
 
+    async def get_with_organization_name(self, token: str) -> tuple[Invitation, str] | None:
+        """The invitation and its organization's name in one joined query."""
+        result = await self.db.execute(
+            select(Invitation, Organization.name)
+            .join(Organization, Invitation.organization_id == Organization.id)
+            .where(Invitation.token_hash == hash_invitation_token(token))
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
     async def get_pending_by_org(self, organization_id: uuid.UUID) -> list[Invitation]:
         result = await self.db.execute(
             select(Invitation).where(
@@ -65,9 +109,74 @@ class InvitationRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_pending_emails_for_org(
+        self, emails: list[str], organization_id: uuid.UUID
+    ) -> set[str]:
+        if not emails:
+            return set()
+        result = await self.db.execute(
+            select(Invitation.email).where(
+                and_(
+                    Invitation.email.in_(emails),
+                    Invitation.organization_id == organization_id,
+                    Invitation.status == InvitationStatus.PENDING,
+                )
+            )
+        )
+        return set(result.scalars().all())
+
+    async def stream_export(
+        self, organization_id: uuid.UUID, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        result = await self.db.stream(
+            select(*INVITATION_EXPORT_COLUMNS)
+            .where(Invitation.organization_id == organization_id)
+            .order_by(Invitation.created_at, Invitation.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
+
     async def update_status(
         self, invitation: Invitation, status: InvitationStatus
     ) -> Invitation:
         invitation.status = status
         await self.db.flush()
         return invitation
+
+    async def expire_due(self, limit: int) -> list[bytes]:
+        """Marks up to ``limit`` pending invitations past their expiry as
+        expired and returns their token digests. Rows locked by a concurrent accept or
+        sweeper are skipped and picked up by a later batch."""
+        due = (
+            select(Invitation.id)
+            .where(Invitation.status == InvitationStatus.PENDING, Invitation.expires_at < func.now())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.scalars(
+            update(Invitation)
+            .where(Invitation.id.in_(due))
+            .values(status=InvitationStatus.EXPIRED)
+            .returning(Invitation.token_hash),
+            execution_options={"synchronize_session": False},
+        )
+        return list(result.all())
+
+    async def purge_finished(self, created_before: datetime, limit: int) -> int:
+        """Deletes up to ``limit`` accepted or expired invitations created
+        before ``created_before`` and returns how many."""
+        stale = (
+            select(Invitation.id)
+            .where(
+                Invitation.status.in_((InvitationStatus.ACCEPTED, InvitationStatus.EXPIRED)),
+                Invitation.created_at < created_before,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(Invitation).where(Invitation.id.in_(stale)),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -0,0 +1,117 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, and_, case, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import RefreshSession, User
+
+
+class RefreshSessionRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def create(self, user_id: uuid.UUID, organization_id: uuid.UUID, expires_at: datetime) -> RefreshSession:
+        session = RefreshSession(user_id=user_id, organization_id=organization_id, expires_at=expires_at)
+        self.db.add(session)
+        await self.db.flush()
+        return session
+
+    async def rotate(
+        self, session_id: uuid.UUID, jti: uuid.UUID, new_jti: uuid.UUID, expires_at: datetime, grace: timedelta
+    ) -> tuple[User, uuid.UUID] | None:
+        """Accepts ``jti`` for the session and returns its user and the jti
+        the next refresh token must carry, in one primary-key UPDATE joined
+        to users. The current jti is rotated to ``new_jti`` (sliding the
+        expiry); the one rotated out within ``grace`` is accepted without
+        rotating again. Returns None when the session is unknown, revoked,
+        expired or ``jti`` is stale."""
+        is_current = RefreshSession.current_jti == jti
+        result = await self.db.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.id == session_id,
+                RefreshSession.user_id == User.id,
+                RefreshSession.revoked_at.is_(None),
+                RefreshSession.expires_at > func.now(),
+                or_(
+                    is_current,
+                    and_(RefreshSession.previous_jti == jti, RefreshSession.rotated_at > func.now() - grace),
+                ),
+            )
+            .values(
+                current_jti=case((is_current, new_jti), else_=RefreshSession.current_jti),
+                previous_jti=case((is_current, jti), else_=RefreshSession.previous_jti),
+                rotated_at=case((is_current, func.now()), else_=RefreshSession.rotated_at),
+                expires_at=case((is_current, expires_at), else_=RefreshSession.expires_at),
+                last_used_at=func.now(),
+            )
+            .returning(User, RefreshSession.current_jti),
+            execution_options={"synchronize_session": False},
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
+    async def revoke(self, session_id: uuid.UUID) -> bool:
+        """Returns whether a live session was revoked."""
+        result = await self.db.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.id == session_id,
+                RefreshSession.revoked_at.is_(None),
+                RefreshSession.expires_at > func.now(),
+            )
+            .values(revoked_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount > 0
+
+    async def revoke_for_user(self, user_id: uuid.UUID) -> int:
+        result = await self.db.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.user_id == user_id,
+                RefreshSession.expires_at > func.now(),
+                RefreshSession.revoked_at.is_(None),
+            )
+            .values(revoked_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    async def revoke_for_organization(self, organization_id: uuid.UUID) -> int:
+        result = await self.db.execute(
+            update(RefreshSession)
+            .where(RefreshSession.organization_id == organization_id, RefreshSession.revoked_at.is_(None))
+            .values(revoked_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    async def get_active_for_user(self, user_id: uuid.UUID) -> list[RefreshSession]:
+        result = await self.db.execute(
+            select(RefreshSession)
+            .where(
+                RefreshSession.user_id == user_id,
+                RefreshSession.expires_at > func.now(),
+                RefreshSession.revoked_at.is_(None),
+            )
+            .order_by(RefreshSession.last_used_at.desc(), RefreshSession.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def purge_expired(self, limit: int) -> int:
+        """Deletes up to ``limit`` expired sessions, revoked or not, and
+        returns how many."""
+        expired = (
+            select(RefreshSession.id)
+            .where(RefreshSession.expires_at < func.now())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(RefreshSession).where(RefreshSession.id.in_(expired)),
+            execution_options={"synchronize_session": False},
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -1,9 +1,23 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Literal
 
-from sqlalchemy import select, and_
+from sqlalchemy import Row, case, func, select, and_, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import User, UserRole, UserStatus
+from src.models import Organization, User, UserRole, UserStatus
+
+
+UserSort = Literal["created_at", "-created_at", "name", "-name"]
+
+USER_SORT_COLUMNS = {"created_at": User.created_at, "name": User.name}
+
+USER_EXPORT_COLUMNS = (User.id, User.email, User.name, User.role, User.status, User.created_at, User.updated_at)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class UserRepository:
@@ -34,10 +48,29 @@ class UserRepository:
     async def get_by_id(self, user_id: uuid.UUID) -> User | None:
         return await self.db.get(User, user_id)
 
+    async def get_with_organization_name(self, user_id: uuid.UUID) -> tuple[User, str] | None:
+        """The user and their organization's name in one joined query."""
+        result = await self.db.execute(
+            select(User, Organization.name)
+            .join(Organization, User.organization_id == Organization.id)
+            .where(User.id == user_id)
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row is not None else None
+
     async def get_by_email(self, email: str) -> User | None:
         result = await self.db.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
+    async def get_organizations_by_emails(self, emails: list[str]) -> dict[str, uuid.UUID]:
+        """Maps each of ``emails`` that already has an account to its organization."""
+        if not emails:
+            return {}
+        result = await self.db.execute(
+            select(User.email, User.organization_id).where(User.email.in_(emails))
+        )
+        return {email: organization_id for email, organization_id in result.all()}
+
     async def get_by_email_and_org(
         self, email: str, organization_id: uuid.UUID
     ) -> User | None:
@@ -54,8 +87,90 @@ class UserRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        organization_id: uuid.UUID,
+        limit: int,
+        sort: UserSort = "created_at",
+        after: tuple[datetime | str, uuid.UUID] | None = None,
+        role: UserRole | None = None,
+        status: UserStatus | None = None,
+        search: str | None = None,
+    ) -> list[User]:
+        """One keyset page ordered by (sort column, id). ``after`` is the sort
+        key of the previous page's last row; the row comparison lets Postgres
+        seek straight to it on the (organization_id, <column>, id) index
+        instead of counting past an OFFSET."""
+        descending = sort.startswith("-")
+        column = USER_SORT_COLUMNS[sort.lstrip("-")]
+        key = tuple_(column, User.id)
+
+        query = select(User).where(User.organization_id == organization_id)
+        if role is not None:
+            query = query.where(User.role == role)
+        if status is not None:
+            query = query.where(User.status == status)
+        if search:
+            pattern = f"%{_escape_like(search)}%"
+            query = query.where(or_(User.name.ilike(pattern), User.email.ilike(pattern)))
+        if after is not None:
+            query = query.where(key < tuple_(*after) if descending else key > tuple_(*after))
+
+        order = (column.desc(), User.id.desc()) if descending else (column, User.id)
+        result = await self.db.execute(query.order_by(*order).limit(limit))
+        return list(result.scalars().all())
+
+    async def search(
+        self,
+        organization_id: uuid.UUID,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        role: UserRole | None = None,
+        status: UserStatus | None = None,
+    ) -> list[User]:
+        """Substring match on name or email, served by the trigram GIN index.
+        Prefix matches rank first, then closer trigram similarity. Pages by
+        ``offset`` because the ranking has no index to seek on; searches are
+        narrow enough that only the first few pages are ever read."""
+        escaped = _escape_like(query)
+        contains = f"%{escaped}%"
+        starts_with = f"{escaped}%"
+        is_prefix = or_(User.name.ilike(starts_with), User.email.ilike(starts_with))
+        similarity = func.greatest(func.word_similarity(query, User.name), func.word_similarity(query, User.email))
+        statement = select(User).where(
+            User.organization_id == organization_id,
+            or_(User.name.ilike(contains), User.email.ilike(contains)),
+        )
+        if role is not None:
+            statement = statement.where(User.role == role)
+        if status is not None:
+            statement = statement.where(User.status == status)
+        result = await self.db.execute(
+            statement.order_by(case((is_prefix, 0), else_=1), similarity.desc(), User.name, User.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def stream_export(
+        self, organization_id: uuid.UUID, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yields the organization's members in batches of plain rows read
+        through a server-side cursor, so memory stays flat however large
+        the organization is."""
+        result = await self.db.stream(
+            select(*USER_EXPORT_COLUMNS)
+            .where(User.organization_id == organization_id)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
+
     async def update_role(self, user: User, role: UserRole) -> User:
         user.role = role
+        user.authz_version += 1
         await self.db.flush()
         return user
 
@@ -1,3 +1,3 @@
-from . import health, auth, users, invitations, organizations
+from . import health, auth, users, invitations, organizations, metrics
 
-__all__ = ["health", "auth", "users", "invitations", "organizations"]
+__all__ = ["health", "auth", "users", "invitations", "organizations", "metrics"]
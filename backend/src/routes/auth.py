@@ -1,24 +1,35 @@
 import json
 import uuid
+from datetime import datetime
 from typing import Annotated
 from urllib.parse import urlencode
 
-import jwt as pyjwt
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, Cookie, status
 from fastapi.responses import RedirectResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.db import get_db
-from src.auth.oauth import build_google_auth_url, exchange_code_for_tokens, get_google_user_info
-from src.auth.jwt import create_access_token, create_refresh_token, verify_refresh_token
-from src.repositories import UserRepository
-from src.services import OrganizationService, UserService, InvitationService
-from src.services.email import get_email_provider
+from src.auth.oauth import build_google_auth_url, exchange_code_for_tokens, get_google_identity
+from src.auth.dependencies import get_current_user
+from src.auth.jwt import create_access_token
+from src.auth.principal_cache import record_authz_version
+from src.models import User
+from src.services import OrganizationService, SessionService, UserService, InvitationService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+class RefreshSessionResponse(BaseModel):
+    id: uuid.UUID
+    created_at: datetime
+    last_used_at: datetime
+    expires_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 @router.get("/google")
 async def google_auth(
     flow: str = Query(..., regex="^(register|login|invite)$"),
@@ -50,7 +61,7 @@ async def google_callback(
     if not google_access_token:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to get access token from Google")
 
-    user_info = await get_google_user_info(google_access_token)
+    user_info = await get_google_identity(tokens)
     email = user_info.get("email")
     name = user_info.get("name", "")
     picture = user_info.get("picture")
@@ -86,8 +97,7 @@ async def google_callback(
         if not invitation_token:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invitation token is required")
 
-        email_provider = get_email_provider(settings.email_provider)
-        invitation_service = InvitationService(db, email_provider)
+        invitation_service = InvitationService(db)
         user = await invitation_service.accept_invitation(
             token=invitation_token, oauth_email=email, oauth_name=name, profile_picture=picture
         )
@@ -95,8 +105,9 @@ async def google_callback(
     else:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid auth flow")
 
-    access_token = create_access_token(user.id, user.organization_id)
-    refresh_token = create_refresh_token(user.id, user.organization_id)
+    access_token = create_access_token(user.id, user.organization_id, user.role, user.authz_version)
+    refresh_token = await SessionService(db).start(user)
+    record_authz_version(user)
 
     redirect_url = f"{settings.frontend_url}/auth/callback?{urlencode({'access_token': access_token})}"
 
@@ -120,29 +131,15 @@ async def refresh_access_token(
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token not found")
 
-    try:
-        payload = verify_refresh_token(refresh_token)
-    except pyjwt.InvalidTokenError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
-
-    user_id = uuid.UUID(payload["sub"])
-    org_id = uuid.UUID(payload["org"])
-
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
-    new_access_token = create_access_token(user.id, user.organization_id)
-    new_refresh_token = create_refresh_token(user.id, user.organization_id)
+    tokens = await SessionService(db).refresh_tokens(refresh_token)
 
     response = Response(
-        content=json.dumps({"access_token": new_access_token}),
+        content=json.dumps({"access_token": tokens.access_token}),
         media_type="application/json",
     )
     response.set_cookie(
         key="refresh_token",
-        value=new_refresh_token,
+        value=tokens.refresh_token,
         httponly=True,
         secure=settings.app_env != "development",
         samesite="lax",
@@ -152,10 +149,41 @@ async def refresh_access_token(
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    refresh_token: Annotated[str | None, Cookie()] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Ends this device's refresh session."""
+    if refresh_token:
+        await SessionService(db).end(refresh_token)
     response = Response(
         content=json.dumps({"message": "Logged out successfully"}),
         media_type="application/json",
     )
     response.delete_cookie(key="refresh_token")
     return response
+
+
+@router.get("/sessions", response_model=list[RefreshSessionResponse])
+async def list_sessions(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """The caller's signed-in devices, most recently refreshed first."""
+    return await SessionService(db).list_active(current_user.id)
+
+
+@router.post("/logout-all")
+async def logout_everywhere(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Revokes every refresh session of the caller. Access tokens already
+    issued stay valid until they expire."""
+    revoked = await SessionService(db).revoke_user_sessions(current_user.id)
+    response = Response(
+        content=json.dumps({"message": "Logged out on all devices", "revoked_sessions": revoked}),
+        media_type="application/json",
+    )
+    response.delete_cookie(key="refresh_token")
+    return response
@@ -1,21 +1,29 @@
+import csv
+import hashlib
+import io
 import uuid
+from collections.abc import Iterable
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, EmailStr, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.db import get_db
-from src.models import User, UserRole, InvitationStatus
+from src.models import User, UserRole, InvitationStatus, hash_invitation_token
 from src.auth.dependencies import require_role
-from src.services import InvitationService
-from src.services.email import get_email_provider
-from src.repositories import InvitationRepository, OrganizationRepository
+from src.services import BulkInvitee, InvitationService
+from src.services.invitation_preview import PREVIEW_CACHE_HITS, PREVIEW_CACHE_MISSES, CachedPreview, preview_cache
+from src.repositories import InvitationRepository
 
 router = APIRouter(prefix="/invitations", tags=["invitations"])
 
+# Starlette renamed HTTP_413_REQUEST_ENTITY_TOO_LARGE to HTTP_413_CONTENT_TOO_LARGE
+# and deprecated the old name; the literal works with every supported release.
+_CONTENT_TOO_LARGE = 413
+
 
 class CreateInvitationRequest(BaseModel):
     email: EmailStr
@@ -29,12 +37,27 @@ class InvitationResponse(BaseModel):
     email: str
     name: str
     role: str
-    token: str
+    # Only returned when the invitation is created; stored hashed afterwards.
+    token: str | None = None
     status: str
 
     model_config = {"from_attributes": True}
 
 
+class BulkInvitationRowResult(BaseModel):
+    row: int
+    email: str
+    status: Literal["created", "error"]
+    invitation: InvitationResponse | None = None
+    error: str | None = None
+
+
+class BulkInvitationResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkInvitationRowResult]
+
+
 class InvitationPreviewResponse(BaseModel):
     """Public preview returned before the invitee starts OAuth.
     Intentionally omits the token and internal IDs."""
@@ -45,39 +68,100 @@ class InvitationPreviewResponse(BaseModel):
     expires_at: datetime
 
 
-@router.get("/preview/{token}", response_model=InvitationPreviewResponse)
+@router.get(
+    "/preview/{token}",
+    response_model=InvitationPreviewResponse,
+    responses={304: {"description": "The preview matching If-None-Match is unchanged"}},
+)
 async def preview_invitation(
     token: str,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Public endpoint — no auth required.
     Lets the frontend show 'You've been invited to join Acme Corp' before
-    the invitee is redirected to Google OAuth."""
-    invitation_repo = InvitationRepository(db)
-    invitation = await invitation_repo.get_by_token(token)
+    the invitee is redirected to Google OAuth.
 
-    if invitation is None or invitation.status != InvitationStatus.PENDING:
+    Answers, including 404/410, are cached briefly in-process and carry
+    Cache-Control so repeated loads and link scanners rarely reach the
+    database; found previews also carry an ETag for cheap revalidation."""
+    token_hash = hash_invitation_token(token)
+    preview = preview_cache.get(token_hash)
+    if preview is None:
+        PREVIEW_CACHE_MISSES.inc()
+        preview = await _load_preview(db, token, token_hash)
+    else:
+        PREVIEW_CACHE_HITS.inc()
+
+    if preview.status_code != status.HTTP_200_OK:
         raise HTTPException(
+            status_code=preview.status_code,
+            detail=preview.detail,
+            headers={"Cache-Control": _cache_control(settings.invitation_preview_negative_ttl_seconds)},
+        )
+
+    max_age = settings.invitation_preview_cache_ttl_seconds
+    if preview.expires_at is not None:
+        max_age = min(max_age, (preview.expires_at - datetime.now(timezone.utc)).total_seconds())
+    headers = {"ETag": preview.etag, "Cache-Control": _cache_control(max_age)}
+    if _etag_matches(request.headers.get("if-none-match"), preview.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(preview.body, media_type="application/json", headers=headers)
+
+
+async def _load_preview(db: AsyncSession, token: str, token_hash: bytes) -> CachedPreview:
+    invitation_repo = InvitationRepository(db)
+    loaded = await invitation_repo.get_with_organization_name(token)
+    if loaded is None:
+        preview = CachedPreview(status_code=status.HTTP_404_NOT_FOUND, detail="Invitation not found or no longer valid")
+        preview_cache.set(token_hash, preview, ttl_seconds=settings.invitation_preview_negative_ttl_seconds)
+        return preview
+
+    invitation, organization_name = loaded
+    if invitation.status != InvitationStatus.PENDING:
+        preview = CachedPreview(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invitation not found or no longer valid",
+            organization_id=invitation.organization_id,
         )
-
-    if invitation.expires_at < datetime.now(timezone.utc):
-        raise HTTPException(
+        ttl = settings.invitation_preview_negative_ttl_seconds
+    elif invitation.expires_at < datetime.now(timezone.utc):
+        preview = CachedPreview(
             status_code=status.HTTP_410_GONE,
             detail="Invitation has expired",
+            organization_id=invitation.organization_id,
         )
+        ttl = settings.invitation_preview_negative_ttl_seconds
+    else:
+        body = InvitationPreviewResponse(
+            invitee_name=invitation.name,
+            invitee_email=invitation.email,
+            organization_name=organization_name,
+            role=invitation.role.value,
+            expires_at=invitation.expires_at,
+        ).model_dump_json().encode()
+        preview = CachedPreview(
+            status_code=status.HTTP_200_OK,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            organization_id=invitation.organization_id,
+            expires_at=invitation.expires_at,
+        )
+        ttl = (invitation.expires_at - datetime.now(timezone.utc)).total_seconds()
 
-    org_repo = OrganizationRepository(db)
-    org = await org_repo.get_by_id(invitation.organization_id)
+    preview_cache.set(token_hash, preview, ttl_seconds=ttl)
+    return preview
 
-    return InvitationPreviewResponse(
-        invitee_name=invitation.name,
-        invitee_email=invitation.email,
-        organization_name=org.name if org else "your organization",
-        role=invitation.role.value,
-        expires_at=invitation.expires_at,
-    )
+
+def _cache_control(max_age: float) -> str:
+    return f"public, max-age={max(int(max_age), 0)}"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 @router.post("", response_model=InvitationResponse, status_code=201)
@@ -86,8 +170,7 @@ async def create_invitation(
     current_user: Annotated[User, Depends(require_role(UserRole.MANAGER))],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    email_provider = get_email_provider(settings.email_provider)
-    invitation_service = InvitationService(db, email_provider)
+    invitation_service = InvitationService(db)
     return await invitation_service.create_invitation(
         organization_id=current_user.organization_id,
         email=body.email,
@@ -97,11 +180,154 @@ async def create_invitation(
     )
 
 
+@router.post("/bulk", response_model=BulkInvitationResponse)
+async def create_invitations_bulk(
+    body: Annotated[list[Any], Body()],
+    current_user: Annotated[User, Depends(require_role(UserRole.MANAGER))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Invites up to `bulk_invitation_max_rows` people in one call. The body
+    is a JSON array of `{email, name, role}` objects. Each row succeeds or
+    fails on its own, including rows that don't validate; see `results` for
+    per-row outcomes."""
+    if len(body) > settings.bulk_invitation_max_rows:
+        _raise_too_many_rows()
+    parsed, invalid = _validate_rows(enumerate(body, start=1))
+    return await _invite_rows(parsed, invalid, current_user, db)
+
+
+@router.post("/bulk/csv", response_model=BulkInvitationResponse)
+async def create_invitations_bulk_csv(
+    request: Request,
+    current_user: Annotated[User, Depends(require_role(UserRole.MANAGER))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Same as `/bulk`, but the body is a `text/csv` document with an
+    `email,name,role` header row. Rows that don't parse are reported in
+    `results` alongside the rest."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.bulk_invitation_max_csv_bytes:
+            raise HTTPException(
+                status_code=_CONTENT_TOO_LARGE,
+                detail=f"CSV body is larger than {settings.bulk_invitation_max_csv_bytes} bytes",
+            )
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV must be UTF-8 encoded") from exc
+
+    try:
+        rows, too_long = _read_csv_rows(text)
+    except csv.Error as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"CSV could not be parsed: {exc}") from exc
+    parsed, invalid = _validate_rows(rows)
+    return await _invite_rows(parsed, invalid + too_long, current_user, db)
+
+
+def _read_csv_rows(
+    text: str,
+) -> tuple[list[tuple[int, dict[str, str]]], list[BulkInvitationRowResult]]:
+    """Numbered rows keyed by lowercased header, plus errors for rows with
+    more fields than the header. Raises csv.Error on malformed input."""
+    reader = csv.DictReader(io.StringIO(text))
+    if reader.fieldnames is None or not {"email", "name", "role"} <= {f.strip().lower() for f in reader.fieldnames}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV must have a header row with email, name and role columns",
+        )
+
+    rows: list[tuple[int, dict[str, str]]] = []
+    too_long: list[BulkInvitationRowResult] = []
+    for row_number, row in enumerate(reader, start=1):
+        if row_number > settings.bulk_invitation_max_rows:
+            _raise_too_many_rows()
+        fields = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k is not None}
+        if None in row:
+            # DictReader collects fields beyond the header under the key None.
+            too_long.append(
+                BulkInvitationRowResult(
+                    row=row_number,
+                    email=fields.get("email", ""),
+                    status="error",
+                    error=f"Row has more fields than the {len(reader.fieldnames)}-column header",
+                )
+            )
+            continue
+        rows.append((row_number, fields))
+    return rows, too_long
+
+
+def _validate_rows(
+    rows: Iterable[tuple[int, Any]],
+) -> tuple[list[tuple[int, CreateInvitationRequest]], list[BulkInvitationRowResult]]:
+    """Splits numbered raw rows into valid requests and per-row errors."""
+    parsed: list[tuple[int, CreateInvitationRequest]] = []
+    invalid: list[BulkInvitationRowResult] = []
+    for row_number, row in rows:
+        try:
+            parsed.append((row_number, CreateInvitationRequest.model_validate(row)))
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            email = row.get("email") if isinstance(row, dict) else None
+            invalid.append(
+                BulkInvitationRowResult(
+                    row=row_number,
+                    email=email if isinstance(email, str) else "",
+                    status="error",
+                    error=f"{location}: {error['msg']}" if location else error["msg"],
+                )
+            )
+    return parsed, invalid
+
+
+def _raise_too_many_rows() -> None:
+    raise HTTPException(
+        status_code=_CONTENT_TOO_LARGE,
+        detail=f"At most {settings.bulk_invitation_max_rows} invitations per request",
+    )
+
+
+async def _invite_rows(
+    rows: list[tuple[int, CreateInvitationRequest]],
+    invalid: list[BulkInvitationRowResult],
+    current_user: User,
+    db: AsyncSession,
+) -> BulkInvitationResponse:
+    invitation_service = InvitationService(db)
+    outcomes = await invitation_service.create_invitations_bulk(
+        organization_id=current_user.organization_id,
+        invitees=[BulkInvitee(email=r.email, name=r.name, role=r.role) for _, r in rows],
+        invited_by=current_user.id,
+    )
+
+    results = list(invalid)
+    for (row_number, _), outcome in zip(rows, outcomes):
+        if outcome.invitation is not None:
+            results.append(
+                BulkInvitationRowResult(
+                    row=row_number,
+                    email=outcome.email,
+                    status="created",
+                    invitation=InvitationResponse.model_validate(outcome.invitation),
+                )
+            )
+        else:
+            results.append(
+                BulkInvitationRowResult(row=row_number, email=outcome.email, status="error", error=outcome.error)
+            )
+    results.sort(key=lambda result: result.row)
+
+    created = sum(1 for result in results if result.status == "created")
+    return BulkInvitationResponse(created=created, failed=len(results) - created, results=results)
+
+
 @router.get("", response_model=list[InvitationResponse])
 async def list_pending_invitations(
     current_user: Annotated[User, Depends(require_role(UserRole.MANAGER))],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    email_provider = get_email_provider(settings.email_provider)
-    invitation_service = InvitationService(db, email_provider)
+    invitation_service = InvitationService(db)
     return await invitation_service.list_pending(current_user.organization_id)
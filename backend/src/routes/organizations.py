@@ -1,14 +1,17 @@
 import uuid
+from collections.abc import AsyncIterator, Callable
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db import get_db
+from src.db import get_db, get_session_factory
 from src.models import User, UserRole
 from src.auth.dependencies import require_role
-from src.services import OrganizationService
+from src.services import ExportService, OrganizationService, SessionService
+from src.services.export_service import EXPORT_MEDIA_TYPES, ExportFormat
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -17,6 +20,55 @@ class DeleteOrganizationRequest(BaseModel):
     confirmation: str
 
 
+class RevokedSessionsResponse(BaseModel):
+    revoked_sessions: int
+
+
+@router.get("/me/export/users")
+async def export_users(
+    current_user: Annotated[User, Depends(require_role(UserRole.ADMIN))],
+    session_factory: Annotated[Callable[[], AsyncSession], Depends(get_session_factory)],
+    format: ExportFormat = "csv",
+):
+    """Streams every member of the organization as CSV or NDJSON."""
+    export_service = ExportService(session_factory)
+    chunks = export_service.export_users(current_user.organization_id, format)
+    return _export_response(chunks, "users", format)
+
+
+@router.get("/me/export/invitations")
+async def export_invitations(
+    current_user: Annotated[User, Depends(require_role(UserRole.ADMIN))],
+    session_factory: Annotated[Callable[[], AsyncSession], Depends(get_session_factory)],
+    format: ExportFormat = "csv",
+):
+    """Streams every invitation of the organization (tokens excluded) as
+    CSV or NDJSON."""
+    export_service = ExportService(session_factory)
+    chunks = export_service.export_invitations(current_user.organization_id, format)
+    return _export_response(chunks, "invitations", format)
+
+
+def _export_response(chunks: AsyncIterator[bytes], name: str, format: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+@router.delete("/me/sessions", response_model=RevokedSessionsResponse)
+async def revoke_organization_sessions(
+    current_user: Annotated[User, Depends(require_role(UserRole.ADMIN))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Revokes every member's refresh sessions, signing them out at their
+    next refresh. Access tokens already issued stay valid until they expire."""
+    session_service = SessionService(db)
+    revoked = await session_service.revoke_organization_sessions(current_user.organization_id)
+    return RevokedSessionsResponse(revoked_sessions=revoked)
+
+
 @router.delete("/me", status_code=204)
 async def delete_my_organization(
     body: DeleteOrganizationRequest,
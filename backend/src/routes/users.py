@@ -2,14 +2,21 @@ import uuid
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db import get_db
-from src.models import User, UserRole
-from src.auth.dependencies import get_current_user, get_org_user, require_role
-from src.services import UserService, OrganizationService
+from src.models import User, UserRole, UserStatus
+from src.auth.dependencies import (
+    UserWithOrganization,
+    get_current_user,
+    get_current_user_with_organization,
+    get_org_user,
+    require_role,
+)
+from src.services import UserService
+from src.repositories.users import UserSort
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -37,22 +44,62 @@ class UpdateRoleRequest(BaseModel):
 
 @router.get("", response_model=list[UserResponse])
 async def list_users(
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: str | None = None,
+    sort: UserSort = "created_at",
+    role: UserRole | None = None,
+    user_status: Annotated[UserStatus | None, Query(alias="status")] = None,
+    q: Annotated[str | None, Query(max_length=255, description="Substring of name or email")] = None,
 ):
+    """One page of the organization's members. When more remain, the
+    `X-Next-Cursor` response header carries the `cursor` for the next page."""
     user_service = UserService(db)
-    return await user_service.list_by_organization(current_user.organization_id)
+    users, next_cursor = await user_service.list_page(
+        current_user.organization_id,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        role=role,
+        user_status=user_status,
+        search=q,
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
+
+@router.get("/search", response_model=list[UserResponse])
+async def search_users(
+    response: Response,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    cursor: str | None = None,
+    role: UserRole | None = None,
+    user_status: Annotated[UserStatus | None, Query(alias="status")] = None,
+):
+    """Typeahead over the organization's members by name or email, best
+    matches first. When more matches remain, the `X-Next-Cursor` response
+    header carries the `cursor` for the next page."""
+    user_service = UserService(db)
+    users, next_cursor = await user_service.search(
+        current_user.organization_id, q, limit, cursor=cursor, role=role, user_status=user_status
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @router.get("/me", response_model=MeResponse)
 async def get_me(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    current: Annotated[UserWithOrganization, Depends(get_current_user_with_organization)],
 ):
-    org_service = OrganizationService(db)
-    org = await org_service.get_by_id(current_user.organization_id)
-    data = MeResponse.model_validate(current_user)
-    data.organization_name = org.name if org else None
+    data = MeResponse.model_validate(current.user)
+    data.organization_name = current.organization_name
     return data
 
 
@@ -64,7 +111,7 @@ async def update_user_role(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     user_service = UserService(db)
-    return await user_service.update_role(target_user.id, body.role, current_user)
+    return await user_service.update_role(target_user, body.role, current_user)
 
 
 @router.delete("/{user_id}", status_code=204)
@@ -74,4 +121,4 @@ async def delete_user(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     user_service = UserService(db)
-    await user_service.delete_user(target_user.id, current_user)
+    await user_service.delete_user(target_user, current_user)
@@ -1,12 +1,18 @@
 from .organization_service import OrganizationService
 from .user_service import UserService
-from .invitation_service import InvitationService
+from .invitation_service import BulkInvitationResult, BulkInvitee, InvitationService
+from .export_service import ExportService
+from .session_service import SessionService
 from .email import EmailProvider, ConsoleEmailProvider, get_email_provider
 
 __all__ = [
     "OrganizationService",
     "UserService",
     "InvitationService",
+    "ExportService",
+    "SessionService",
+    "BulkInvitee",
+    "BulkInvitationResult",
     "EmailProvider",
     "ConsoleEmailProvider",
     "get_email_provider",
@@ -0,0 +1,86 @@
+"""Plumbing shared by the background jobs: the email outbox workers and the
+invitation, refresh session and outbox sweepers.
+
+In the API they run as tasks started from the lifespan and cancelled on
+shutdown; each can also run on its own with ``python -m src.<job>``.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import engine
+
+logger = logging.getLogger(__name__)
+
+_jobs: dict[str, list[asyncio.Task]] = {}
+
+
+async def run_periodically(name: str, iteration: Callable[[], Awaitable[bool]], interval: float) -> None:
+    """Runs ``iteration`` until cancelled, sleeping ``interval`` seconds after
+    each run unless it returns True to say more work is already waiting.
+    Failures are logged and retried on the next tick."""
+    while True:
+        try:
+            busy = await iteration()
+        except Exception:
+            logger.exception("%s failed", name)
+            busy = False
+        if not busy:
+            await asyncio.sleep(interval)
+
+
+async def sweep_in_batches(
+    session_factory: Callable[[], AsyncSession],
+    step: Callable[[AsyncSession], Awaitable[int]],
+    batch_size: int,
+) -> int:
+    """Runs ``step`` in its own short transaction, so a large backlog never
+    holds locks for long, until it handles fewer than ``batch_size`` rows.
+    Returns how many rows were handled in total."""
+    total = 0
+    while True:
+        async with session_factory() as session:
+            handled = await step(session)
+            await session.commit()
+        total += handled
+        if handled < batch_size:
+            return total
+
+
+def start_background_job(name: str, *runners: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """Starts one task per runner under ``name``, unless ``name`` is already
+    running."""
+    if name not in _jobs:
+        _jobs[name] = [asyncio.create_task(runner()) for runner in runners]
+
+
+async def stop_background_jobs() -> None:
+    """Cancels every started job, most recently started first, and waits for
+    each to finish."""
+    while _jobs:
+        _, tasks = _jobs.popitem()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_standalone(name: str, main: Callable[[], Awaitable[None]]) -> None:
+    """Entry point for ``python -m src.<job>``: runs ``main`` until
+    interrupted, then disposes of the engine."""
+
+    async def _main() -> None:
+        try:
+            await main()
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=settings.log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        logger.info("%s stopped", name)
@@ -1,7 +1,9 @@
 from .provider import EmailProvider
+from .smtp import SMTPEmailProvider
 from .console import ConsoleEmailProvider
 from .neo import NeoEmailProvider
 from .gmail import GmailEmailProvider
+from .delivery import close_smtp_executor
 
 
 def get_email_provider(provider_name: str = "console") -> EmailProvider:
@@ -18,4 +20,12 @@ def get_email_provider(provider_name: str = "console") -> EmailProvider:
     return provider_class()
 
 
-__all__ = ["EmailProvider", "ConsoleEmailProvider", "NeoEmailProvider", "GmailEmailProvider", "get_email_provider"]
+__all__ = [
+    "EmailProvider",
+    "ConsoleEmailProvider",
+    "SMTPEmailProvider",
+    "NeoEmailProvider",
+    "GmailEmailProvider",
+    "get_email_provider",
+    "close_smtp_executor",
+]
@@ -0,0 +1,43 @@
+"""Keeps SMTP off the event loop.
+
+smtplib is blocking, so SMTP providers run each send on a small bounded thread
+pool instead of on the event loop.
+"""
+
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from src.config import settings
+from .smtp_pool import close_smtp_pools
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_smtp_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.mail_max_concurrency, thread_name_prefix="smtp")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any) -> T:
+    """Runs a blocking SMTP call on the bounded pool. At most
+    ``mail_max_concurrency`` sends are in flight; the rest queue here
+    without holding up the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_smtp_executor(), functools.partial(fn, *args))
+
+
+async def close_smtp_executor() -> None:
+    """Closes the pooled SMTP sessions and stops the pool. A later send
+    lazily starts a fresh one."""
+    global _executor
+    if _executor is not None:
+        await run_blocking(close_smtp_pools)
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
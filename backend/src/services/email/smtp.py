@@ -0,0 +1,37 @@
+import smtplib
+from abc import abstractmethod
+
+from src.config import settings
+from .delivery import run_blocking
+from .provider import EmailProvider
+from .smtp_pool import SMTPConnectionPool, get_smtp_pool
+from .templates import build_invitation_message
+
+
+class SMTPEmailProvider(EmailProvider):
+    """Base for SMTP-backed providers. Subclasses only know how to open an
+    authenticated session; sends go through a shared connection pool on the
+    SMTP executor."""
+
+    pool_name: str
+
+    async def send_invitation(
+        self,
+        to_email: str,
+        inviter_name: str,
+        organization_name: str,
+        invitation_link: str,
+    ) -> None:
+        msg = build_invitation_message(to_email, inviter_name, organization_name, invitation_link)
+        await run_blocking(self._send, to_email, msg.as_string())
+
+    @property
+    def pool(self) -> SMTPConnectionPool:
+        return get_smtp_pool(self.pool_name, self.connect)
+
+    def _send(self, to_email: str, message: str) -> None:
+        self.pool.send(settings.mail_from, to_email, message)
+
+    @abstractmethod
+    def connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session."""
@@ -0,0 +1,164 @@
+"""Pooled, authenticated SMTP sessions.
+
+Opening a session costs a TCP connect, a TLS handshake and an AUTH exchange;
+sending a message on an open one costs a few round trips. Sessions are kept
+open between sends, evicted once idle for too long, and transparently
+re-opened when the server has dropped them (421, disconnect, timeout).
+
+smtplib is blocking, so pools are used from the SMTP executor threads and
+guard their state with a ``threading.Lock``.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from src.config import settings
+from src.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+SMTP_CONNECTIONS_OPENED = counter(
+    "smtp_connections_opened_total", "Authenticated SMTP sessions opened.", labelnames=("pool",)
+)
+
+SMTPConnect = Callable[[], smtplib.SMTP]
+
+# Errors after which the session is still usable: smtplib has already sent
+# RSET, so the connection can go back to the pool.
+_RECOVERABLE = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code == 421
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return any(code == 421 for code, _ in exc.recipients.values())
+    return False
+
+
+class SMTPConnectionPool:
+    def __init__(
+        self,
+        name: str,
+        connect: SMTPConnect,
+        max_idle: int,
+        idle_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.connect = connect
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._idle: deque[tuple[smtplib.SMTP, float]] = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._opened = SMTP_CONNECTIONS_OPENED.labels(name)
+
+    def send(self, from_addr: str, to_addr: str, message: str) -> None:
+        conn, reused = self._acquire()
+        try:
+            conn.sendmail(from_addr, to_addr, message)
+        except Exception as exc:
+            if not (reused and _connection_lost(exc)):
+                self._finish(conn, exc)
+                raise
+            # The server dropped a pooled session; retry once on a fresh one.
+            logger.info("SMTP pool %s: pooled session lost (%r), reconnecting", self.name, exc)
+            _close_quietly(conn)
+            conn = self._open()
+            try:
+                conn.sendmail(from_addr, to_addr, message)
+            except Exception as retry_exc:
+                self._finish(conn, retry_exc)
+                raise
+        self._release(conn)
+
+    def close(self) -> None:
+        """Closes every idle session. Sessions in use are closed on release."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            _quit_quietly(conn)
+
+    def _acquire(self) -> tuple[smtplib.SMTP, bool]:
+        expired: list[smtplib.SMTP] = []
+        conn = None
+        now = self._clock()
+        with self._lock:
+            # Oldest sessions sit on the left; anything idle too long is evicted.
+            while self._idle and now - self._idle[0][1] > self.idle_timeout:
+                expired.append(self._idle.popleft()[0])
+            if self._idle:
+                conn = self._idle.pop()[0]
+        for stale in expired:
+            _quit_quietly(stale)
+        if conn is not None:
+            return conn, True
+        return self._open(), False
+
+    def _open(self) -> smtplib.SMTP:
+        conn = self.connect()
+        self._opened.inc()
+        return conn
+
+    def _release(self, conn: smtplib.SMTP) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append((conn, self._clock()))
+                return
+        _quit_quietly(conn)
+
+    def _finish(self, conn: smtplib.SMTP, exc: BaseException) -> None:
+        if isinstance(exc, _RECOVERABLE) and not _connection_lost(exc):
+            self._release(conn)
+        else:
+            _close_quietly(conn)
+
+
+def _quit_quietly(conn: smtplib.SMTP) -> None:
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        conn.close()
+
+
+def _close_quietly(conn: smtplib.SMTP) -> None:
+    try:
+        conn.close()
+    except OSError:
+        pass
+
+
+_pools: dict[str, SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(name: str, connect: SMTPConnect) -> SMTPConnectionPool:
+    """Returns the process-wide pool for ``name``, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = SMTPConnectionPool(
+                name,
+                connect,
+                max_idle=settings.mail_max_concurrency,
+                idle_timeout=settings.mail_pool_idle_timeout_seconds,
+            )
+        return pool
+
+
+def close_smtp_pools() -> None:
+    """Closes and forgets every pool; the next send opens a fresh one."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,175 @@
+"""Drains the email outbox.
+
+Services enqueue emails into ``email_outbox`` in the same transaction as the
+change that triggers them; these workers send them afterwards. Delivery is at
+least once: each claimed message is leased, sent outside any transaction, then
+marked sent or rescheduled with exponential backoff. Messages that keep
+failing are dead-lettered with their last error for inspection. Settled
+messages lose their secret payload keys (see SECRET_PAYLOAD_KEYS) and are
+deleted by the sweeper once past the retention.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import async_session_factory
+from src.metrics import counter, gauge, histogram
+from src.models import EmailOutbox
+from src.repositories import EmailOutboxRepository
+from src.services.background import run_periodically, start_background_job, sweep_in_batches
+from src.services.email import EmailProvider, get_email_provider
+
+logger = logging.getLogger(__name__)
+
+INVITATION_EMAIL = "invitation"
+
+OUTBOX_DEPTH = gauge("email_outbox_depth", "Emails waiting in the outbox, including scheduled retries.")
+OUTBOX_PURGED = counter("email_outbox_purged_total", "Sent or dead-lettered outbox messages deleted after retention.")
+OUTBOX_PROCESSED = counter(
+    "email_outbox_processed_total", "Outbox messages processed, by outcome.", labelnames=("kind", "outcome")
+)
+EMAIL_SEND_DURATION = histogram(
+    "email_send_duration_seconds",
+    "Time taken by the email provider to send one message.",
+    labelnames=("kind",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        provider: EmailProvider,
+        session_factory: Callable[[], AsyncSession] = async_session_factory,
+        batch_size: int = settings.email_outbox_batch_size,
+        max_attempts: int = settings.email_outbox_max_attempts,
+        backoff_base: float = settings.email_outbox_backoff_base_seconds,
+        backoff_max: float = settings.email_outbox_backoff_max_seconds,
+        lease_seconds: float = settings.email_outbox_lease_seconds,
+    ) -> None:
+        self.provider = provider
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = timedelta(seconds=lease_seconds)
+        self._senders: dict[str, Callable[..., Awaitable[None]]] = {
+            INVITATION_EMAIL: provider.send_invitation,
+        }
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+
+    async def run_once(self) -> int:
+        """Claims, sends and settles one batch. Returns the batch size."""
+        async with self.session_factory() as session:
+            repo = EmailOutboxRepository(session)
+            batch = await repo.claim_due(self.batch_size, self.lease)
+            OUTBOX_DEPTH.set(await repo.count_pending())
+            await session.commit()
+        if not batch:
+            return 0
+
+        errors = await asyncio.gather(*(self._send(message) for message in batch))
+
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            repo = EmailOutboxRepository(session)
+            await repo.mark_sent([message.id for message, error in zip(batch, errors) if error is None])
+            for message, error in zip(batch, errors):
+                if error is None:
+                    OUTBOX_PROCESSED.labels(message.kind, "sent").inc()
+                elif message.attempts >= self.max_attempts:
+                    logger.error(
+                        "Dead-lettering %s email %s after %d attempts: %s",
+                        message.kind,
+                        message.id,
+                        message.attempts,
+                        error,
+                    )
+                    await repo.mark_failed(message.id, error, retry_at=None)
+                    OUTBOX_PROCESSED.labels(message.kind, "dead").inc()
+                else:
+                    retry_at = now + timedelta(seconds=self.backoff(message.attempts))
+                    await repo.mark_failed(message.id, error, retry_at=retry_at)
+                    OUTBOX_PROCESSED.labels(message.kind, "retry").inc()
+            await session.commit()
+        return len(batch)
+
+    async def _send(self, message: EmailOutbox) -> str | None:
+        sender = self._senders.get(message.kind)
+        if sender is None:
+            return f"Unknown email kind: {message.kind}"
+        started = time.perf_counter()
+        try:
+            await sender(**message.payload)
+        except Exception as exc:  # noqa: BLE001 - any provider error is recorded on the row and retried
+            logger.warning(
+                "Sending %s email %s failed (attempt %d): %r", message.kind, message.id, message.attempts, exc
+            )
+            return repr(exc)
+        finally:
+            EMAIL_SEND_DURATION.labels(message.kind).observe(time.perf_counter() - started)
+        return None
+
+    async def run(self, poll_interval: float = settings.email_outbox_poll_interval_seconds) -> None:
+        """Drains the outbox until cancelled, polling when it runs dry."""
+        await run_periodically("Email outbox worker iteration", self._drain, poll_interval)
+
+    async def _drain(self) -> bool:
+        return await self.run_once() >= self.batch_size
+
+
+class EmailOutboxSweeper:
+    """Deletes sent and dead-lettered messages older than the retention in
+    batches of ``batch_size`` (see sweep_in_batches)."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_factory,
+        batch_size: int = settings.email_outbox_sweep_batch_size,
+        retention_days: int = settings.email_outbox_retention_days,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.retention = timedelta(days=retention_days)
+
+    async def run_once(self) -> int:
+        """Sweeps until no batch is left and returns how many messages were deleted."""
+        cutoff = datetime.now(timezone.utc) - self.retention
+        return await sweep_in_batches(
+            self.session_factory, lambda session: self._purge_batch(session, cutoff), self.batch_size
+        )
+
+    async def _purge_batch(self, session: AsyncSession, cutoff: datetime) -> int:
+        purged = await EmailOutboxRepository(session).purge_settled(cutoff, self.batch_size)
+        OUTBOX_PURGED.inc(purged)
+        return purged
+
+    async def run(self, interval: float = settings.email_outbox_sweep_interval_seconds) -> None:
+        """Sweeps every ``interval`` seconds until cancelled."""
+        await run_periodically("Email outbox sweep", self._sweep, interval)
+
+    async def _sweep(self) -> bool:
+        purged = await self.run_once()
+        if purged:
+            logger.info("Email outbox sweep: %d settled messages deleted", purged)
+        return False
+
+
+def start_outbox_workers(count: int = settings.email_outbox_workers) -> None:
+    """Starts ``count`` in-process outbox workers, plus the sweeper when a
+    retention is set. SKIP LOCKED claims let them run alongside each other
+    and alongside ``python -m src.outbox_worker``. A message interrupted
+    mid-send on shutdown is retried once its lease runs out."""
+    worker = EmailOutboxWorker(get_email_provider(settings.email_provider))
+    start_background_job("email_outbox_workers", *[worker.run] * count)
+    if settings.email_outbox_retention_days > 0 and settings.email_outbox_sweep_interval_seconds > 0:
+        start_background_job("email_outbox_sweeper", EmailOutboxSweeper().run)
@@ -0,0 +1,99 @@
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories import InvitationRepository, UserRepository
+from src.repositories.invitations import INVITATION_EXPORT_COLUMNS
+from src.repositories.users import USER_EXPORT_COLUMNS
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_BATCH_SIZE = 1000
+
+# Spreadsheets evaluate a cell starting with one of these as a formula, so
+# member-supplied names and emails are prefixed with ' to keep them text.
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportService:
+    """Streams an organization's members or invitations as CSV or NDJSON.
+    Each database batch becomes one encoded chunk, so neither the rows nor
+    the output are ever held in full.
+
+    The chunks are produced while the response body is sent, after the
+    request's own session is closed, so each export opens its own session
+    from ``session_factory`` and holds it only while it streams."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    def export_users(self, organization_id: uuid.UUID, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        header = [column.key for column in USER_EXPORT_COLUMNS]
+        return self._export(
+            header, lambda db: UserRepository(db).stream_export(organization_id, EXPORT_BATCH_SIZE), fmt
+        )
+
+    def export_invitations(self, organization_id: uuid.UUID, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        header = [column.key for column in INVITATION_EXPORT_COLUMNS]
+        return self._export(
+            header, lambda db: InvitationRepository(db).stream_export(organization_id, EXPORT_BATCH_SIZE), fmt
+        )
+
+    async def _export(
+        self,
+        header: list[str],
+        stream: Callable[[AsyncSession], AsyncIterator[Sequence[Row]]],
+        fmt: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        async with self.session_factory() as session:
+            async for chunk in _encode(header, stream(session), fmt):
+                yield chunk
+
+
+async def _encode(
+    header: list[str], batches: AsyncIterator[Sequence[Row]], fmt: ExportFormat
+) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        yield _csv_lines([header])
+        async for batch in batches:
+            yield _csv_lines([[_csv_cell(_plain(value)) for value in row] for row in batch])
+    else:
+        async for batch in batches:
+            yield "".join(
+                json.dumps(dict(zip(header, map(_plain, row))), separators=(",", ":")) + "\n" for row in batch
+            ).encode()
+
+
+def _csv_lines(rows: list[list[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(_CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
@@ -0,0 +1,80 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.cache import TTLCache
+from src.config import settings
+from src.metrics import counter
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPreview:
+    """A rendered answer for GET /invitations/preview/{token}: the JSON body
+    and ETag of a found invitation, or the status and detail of a 404/410."""
+
+    status_code: int
+    body: bytes = b""
+    etag: str = ""
+    detail: str = ""
+    organization_id: uuid.UUID | None = None
+    expires_at: datetime | None = None
+
+
+# Keyed by the token's digest, like the invitations table, so raw tokens are
+# never held in memory. Accepting or expiring an invitation drops its entry
+# in this process; other workers serve the old answer for at most the TTL,
+# and a found preview is never cached past the invitation's own expiry.
+preview_cache: TTLCache[bytes, CachedPreview] = TTLCache(
+    max_size=settings.invitation_preview_cache_max_size,
+    ttl_seconds=settings.invitation_preview_cache_ttl_seconds,
+)
+_PREVIEW_CACHE_LOOKUPS = counter(
+    "invitation_preview_cache_lookups_total", "Public invitation previews by cache result.", labelnames=("result",)
+)
+PREVIEW_CACHE_HITS = _PREVIEW_CACHE_LOOKUPS.labels("hit")
+PREVIEW_CACHE_MISSES = _PREVIEW_CACHE_LOOKUPS.labels("miss")
+
+
+def invalidate_invitation_preview(token_hash: bytes) -> None:
+    preview_cache.pop(token_hash)
+
+
+def invalidate_organization_previews(organization_id: uuid.UUID) -> None:
+    preview_cache.discard_where(lambda preview: preview.organization_id == organization_id)
+
+
+def invalidate_invitation_preview_on_commit(db: AsyncSession, token_hash: bytes) -> None:
+    """Drops the preview now and again once ``db`` commits, so a preview
+    request that reads the invitation in between can't cache its old state."""
+    invalidate_invitation_preview(token_hash)
+    db.sync_session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(token_hash)
+
+
+def invalidate_organization_previews_on_commit(db: AsyncSession, organization_id: uuid.UUID) -> None:
+    """Like invalidate_invitation_preview_on_commit, for every invitation of
+    the organization."""
+    invalidate_organization_previews(organization_id)
+    db.sync_session.info.setdefault(_PENDING_ORGANIZATION_INVALIDATIONS, set()).add(organization_id)
+
+
+_PENDING_INVALIDATIONS = "invalidate_invitation_previews"
+_PENDING_ORGANIZATION_INVALIDATIONS = "invalidate_organization_previews"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_previews(session: Session) -> None:
+    for token_hash in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_invitation_preview(token_hash)
+    for organization_id in session.info.pop(_PENDING_ORGANIZATION_INVALIDATIONS, ()):
+        invalidate_organization_previews(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+    session.info.pop(_PENDING_ORGANIZATION_INVALIDATIONS, None)
+
@@ -1,26 +1,54 @@
 import secrets
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.models import Invitation, InvitationStatus, User, UserRole, UserStatus
-from src.repositories import InvitationRepository, OrganizationRepository, UserRepository
-from src.services.email import EmailProvider
+from src.metrics import counter
+from src.models import Invitation, InvitationStatus, Organization, User, UserRole, UserStatus
+from src.repositories import EmailOutboxRepository, InvitationRepository, OrganizationRepository, UserRepository
+from src.services.email_outbox import INVITATION_EMAIL
+from src.services.invitation_preview import invalidate_invitation_preview_on_commit
 
 
 INVITATION_EXPIRY_DAYS = 7
 
+ADMIN_INVITE_FORBIDDEN = "Managers cannot invite users with the Admin role"
+ALREADY_IN_ORGANIZATION = "User with this email already exists in the organization"
+IN_OTHER_ORGANIZATION = "This email address is already associated with another organization. They must be removed from that organization before they can be invited here."
+ALREADY_INVITED = "A pending invitation already exists for this email"
+
+INVITATIONS_CREATED = counter(
+    "invitations_created_total", "Invitations created, by endpoint.", labelnames=("source",)
+)
+_SINGLE_INVITATIONS = INVITATIONS_CREATED.labels("single")
+_BULK_INVITATIONS = INVITATIONS_CREATED.labels("bulk")
+
+
+@dataclass
+class BulkInvitee:
+    email: str
+    name: str
+    role: UserRole
+
+
+@dataclass
+class BulkInvitationResult:
+    email: str
+    invitation: Invitation | None = None
+    error: str | None = None
+
 
 class InvitationService:
-    def __init__(self, db: AsyncSession, email_provider: EmailProvider) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         self.db = db
         self.invitation_repo = InvitationRepository(db)
         self.user_repo = UserRepository(db)
         self.org_repo = OrganizationRepository(db)
-        self.email_provider = email_provider
+        self.outbox_repo = EmailOutboxRepository(db)
 
     async def create_invitation(
         self, organization_id: uuid.UUID, email: str, name: str, role: UserRole, invited_by: uuid.UUID
@@ -29,7 +57,7 @@ class InvitationService:
         if inviter and inviter.role != UserRole.ADMIN and role == UserRole.ADMIN:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Managers cannot invite users with the Admin role",
+                detail=ADMIN_INVITE_FORBIDDEN,
             )
 
         existing_user_globally = await self.user_repo.get_by_email(email)
@@ -37,22 +65,22 @@ class InvitationService:
             if existing_user_globally.organization_id == organization_id:
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
-                    detail="User with this email already exists in the organization",
+                    detail=ALREADY_IN_ORGANIZATION,
                 )
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
-                detail="This email address is already associated with another organization. They must be removed from that organization before they can be invited here.",
+                detail=IN_OTHER_ORGANIZATION,
             )
 
         existing_invitation = await self.invitation_repo.get_pending_by_email_and_org(email, organization_id)
         if existing_invitation:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
-                detail="A pending invitation already exists for this email",
+                detail=ALREADY_INVITED,
             )
 
         token = secrets.token_urlsafe(32)
-        expires_at = datetime.now(timezone.utc) + timedelta(days=INVITATION_EXPIRY_DAYS)
+        expires_at = _expires_at()
 
         invitation = await self.invitation_repo.create(
             organization_id=organization_id,
@@ -65,17 +93,71 @@ class InvitationService:
         )
 
         org = await self.org_repo.get_by_id(organization_id)
-        invitation_link = f"{settings.frontend_url}/invite/accept?token={token}"
 
-        await self.email_provider.send_invitation(
-            to_email=email,
-            inviter_name=inviter.name if inviter else "A team member",
-            organization_name=org.name if org else "your organization",
-            invitation_link=invitation_link,
-        )
+        # Queued in this transaction and sent by the outbox workers, so the
+        # response never waits on SMTP and a failed send can't roll it back.
+        await self.outbox_repo.enqueue(INVITATION_EMAIL, _invitation_email(email, token, inviter, org))
+        _SINGLE_INVITATIONS.inc()
 
         return invitation
 
+    async def create_invitations_bulk(
+        self, organization_id: uuid.UUID, invitees: list[BulkInvitee], invited_by: uuid.UUID
+    ) -> list[BulkInvitationResult]:
+        """Applies the create_invitation checks to a whole batch with a fixed
+        number of queries: one lookup each for the inviter, the organization,
+        existing users and pending invitations, then one multi-row INSERT for
+        the invitations and one for their emails. Rows that fail a check get
+        an error in their result instead of failing the batch."""
+        inviter = await self.user_repo.get_by_id(invited_by)
+        org = await self.org_repo.get_by_id(organization_id)
+        emails = list({invitee.email for invitee in invitees})
+        existing_users = await self.user_repo.get_organizations_by_emails(emails)
+        pending = await self.invitation_repo.get_pending_emails_for_org(emails, organization_id)
+
+        results = [BulkInvitationResult(email=invitee.email) for invitee in invitees]
+        rows: list[dict] = []
+        accepted: list[BulkInvitationResult] = []
+        seen: set[str] = set()
+        expires_at = _expires_at()
+        for invitee, result in zip(invitees, results):
+            if inviter and inviter.role != UserRole.ADMIN and invitee.role == UserRole.ADMIN:
+                result.error = ADMIN_INVITE_FORBIDDEN
+            elif invitee.email in existing_users:
+                if existing_users[invitee.email] == organization_id:
+                    result.error = ALREADY_IN_ORGANIZATION
+                else:
+                    result.error = IN_OTHER_ORGANIZATION
+            elif invitee.email in pending:
+                result.error = ALREADY_INVITED
+            elif invitee.email in seen:
+                result.error = "Duplicate email in this request"
+            else:
+                seen.add(invitee.email)
+                rows.append(
+                    {
+                        "organization_id": organization_id,
+                        "email": invitee.email,
+                        "name": invitee.name,
+                        "role": invitee.role,
+                        "token": secrets.token_urlsafe(32),
+                        "invited_by": invited_by,
+                        "expires_at": expires_at,
+                    }
+                )
+                accepted.append(result)
+
+        invitations = await self.invitation_repo.create_many(rows)
+        for result, invitation in zip(accepted, invitations):
+            result.invitation = invitation
+        await self.outbox_repo.enqueue_many(
+            INVITATION_EMAIL,
+            [_invitation_email(row["email"], row["token"], inviter, org) for row in rows],
+        )
+        _BULK_INVITATIONS.inc(len(invitations))
+
+        return results
+
     async def get_by_token(self, token: str) -> Invitation:
         invitation = await self.invitation_repo.get_by_token(token)
         if invitation is None:
@@ -90,6 +172,7 @@ class InvitationService:
 
         if datetime.now(timezone.utc) > invitation.expires_at:
             await self.invitation_repo.update_status(invitation, InvitationStatus.EXPIRED)
+            invalidate_invitation_preview_on_commit(self.db, invitation.token_hash)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invitation has expired")
 
         if oauth_email.lower() != invitation.email.lower():
@@ -115,8 +198,22 @@ class InvitationService:
         )
 
         await self.invitation_repo.update_status(invitation, InvitationStatus.ACCEPTED)
+        invalidate_invitation_preview_on_commit(self.db, invitation.token_hash)
 
         return user
 
     async def list_pending(self, organization_id: uuid.UUID) -> list[Invitation]:
         return await self.invitation_repo.get_pending_by_org(organization_id)
+
+
+def _expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=INVITATION_EXPIRY_DAYS)
+
+
+def _invitation_email(email: str, token: str, inviter: User | None, org: Organization | None) -> dict[str, str]:
+    return {
+        "to_email": email,
+        "inviter_name": inviter.name if inviter else "A team member",
+        "organization_name": org.name if org else "your organization",
+        "invitation_link": f"{settings.frontend_url}/invite/accept?token={token}",
+    }
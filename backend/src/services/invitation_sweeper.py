@@ -0,0 +1,79 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import async_session_factory
+from src.metrics import counter
+from src.repositories import InvitationRepository
+from src.services.background import run_periodically, start_background_job, sweep_in_batches
+from src.services.invitation_preview import invalidate_invitation_preview_on_commit
+
+logger = logging.getLogger(__name__)
+
+INVITATIONS_EXPIRED = counter("invitations_expired_total", "Pending invitations marked expired by the sweeper.")
+INVITATIONS_PURGED = counter("invitations_purged_total", "Accepted or expired invitations deleted after retention.")
+
+
+@dataclass
+class SweepResult:
+    expired: int = 0
+    purged: int = 0
+
+
+class InvitationSweeper:
+    """Expires pending invitations past ``expires_at`` and, when a retention
+    is set, deletes old accepted/expired ones. Works in batches of
+    ``batch_size``, each in its own short transaction, so a large backlog
+    never holds locks for long. SKIP LOCKED lets several sweepers (one per
+    API process) run side by side."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_factory,
+        batch_size: int = settings.invitation_sweep_batch_size,
+        retention_days: int = settings.invitation_retention_days,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.retention = timedelta(days=retention_days) if retention_days > 0 else None
+
+    async def run_once(self) -> SweepResult:
+        """Sweeps until no batch is left."""
+        result = SweepResult()
+        result.expired = await sweep_in_batches(self.session_factory, self._expire_batch, self.batch_size)
+        if self.retention is not None:
+            cutoff = datetime.now(timezone.utc) - self.retention
+            result.purged = await sweep_in_batches(
+                self.session_factory, lambda session: self._purge_batch(session, cutoff), self.batch_size
+            )
+        return result
+
+    async def _expire_batch(self, session: AsyncSession) -> int:
+        token_hashes = await InvitationRepository(session).expire_due(self.batch_size)
+        for token_hash in token_hashes:
+            invalidate_invitation_preview_on_commit(session, token_hash)
+        INVITATIONS_EXPIRED.inc(len(token_hashes))
+        return len(token_hashes)
+
+    async def _purge_batch(self, session: AsyncSession, cutoff: datetime) -> int:
+        purged = await InvitationRepository(session).purge_finished(cutoff, self.batch_size)
+        INVITATIONS_PURGED.inc(purged)
+        return purged
+
+    async def run(self, interval: float = settings.invitation_sweep_interval_seconds) -> None:
+        """Sweeps every ``interval`` seconds until cancelled."""
+        await run_periodically("Invitation sweep", self._sweep, interval)
+
+    async def _sweep(self) -> bool:
+        result = await self.run_once()
+        if result.expired or result.purged:
+            logger.info("Invitation sweep: %d expired, %d purged", result.expired, result.purged)
+        return False
+
+
+def start_invitation_sweeper(interval: float = settings.invitation_sweep_interval_seconds) -> None:
+    start_background_job("invitation_sweeper", lambda: InvitationSweeper().run(interval))
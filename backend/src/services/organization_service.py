@@ -2,6 +2,8 @@ import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth.principal_cache import invalidate_organization_principals_on_commit
+from src.services.invitation_preview import invalidate_organization_previews_on_commit
 from src.models import Organization, User, UserRole, UserStatus
 from src.repositories import OrganizationRepository, UserRepository
 
@@ -36,5 +38,7 @@ class OrganizationService:
         """Delete an organization and all its data (cascade handled by DB)."""
         org = await self.org_repo.get_by_id(org_id)
         if org:
+            invalidate_organization_principals_on_commit(self.db, org_id)
+            invalidate_organization_previews_on_commit(self.db, org_id)
             await self.db.delete(org)
             await self.db.flush()
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import jwt as pyjwt
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.jwt import create_access_token, create_refresh_token, verify_refresh_token
+from src.auth.principal_cache import record_authz_version
+from src.cache import TTLCache
+from src.config import settings
+from src.metrics import counter
+from src.models import RefreshSession, User
+from src.repositories import RefreshSessionRepository
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TOKEN_REUSE = counter(
+    "refresh_token_reuse_total", "Stale refresh tokens presented for a live session, which revokes it."
+)
+REFRESH_COALESCED = counter(
+    "refresh_requests_coalesced_total", "Refreshes answered with another request's token pair."
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IssuedTokens:
+    access_token: str
+    refresh_token: str
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    organization_id: uuid.UUID
+
+
+# Refreshes are single-flight per refresh token (keyed by its SHA-256): when
+# several tabs refresh at once, the first request rotates the session and the
+# others await its token pair, which is then reused for the coalescing window.
+# Other processes fall back to the database's reuse grace period.
+_refreshes_in_flight: dict[bytes, asyncio.Future[IssuedTokens]] = {}
+recent_refreshes: TTLCache[bytes, IssuedTokens] = TTLCache(
+    max_size=settings.refresh_coalesce_max_size,
+    ttl_seconds=settings.refresh_coalesce_window_seconds,
+)
+
+
+class SessionService:
+    """Server-side refresh sessions. Each sign-in opens a session whose
+    refresh tokens carry its id (``sid``) and a per-rotation ``jti``; see
+    RefreshSession for the rotation and reuse rules."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self.session_repo = RefreshSessionRepository(db)
+
+    async def start(self, user: User) -> str:
+        """Opens a session for a new sign-in and returns its first refresh token."""
+        session = await self.session_repo.create(user.id, user.organization_id, _expires_at())
+        return create_refresh_token(user.id, user.organization_id, session.id, session.current_jti)
+
+    async def refresh(self, refresh_token: str) -> tuple[User, str]:
+        """Rotates the session behind ``refresh_token`` and returns its user
+        and the replacement refresh token."""
+        session_id, jti = _session_claims(refresh_token)
+        return await self._rotate(session_id, jti)
+
+    async def _rotate(self, session_id: uuid.UUID, jti: uuid.UUID) -> tuple[User, str]:
+        rotated = await self.session_repo.rotate(
+            session_id,
+            jti,
+            uuid.uuid4(),
+            _expires_at(),
+            timedelta(seconds=settings.refresh_token_reuse_grace_seconds),
+        )
+        if rotated is None:
+            if await self.session_repo.revoke(session_id):
+                # A live session saw an already-rotated token: either it or
+                # its successor was copied, so neither may be used again.
+                REFRESH_TOKEN_REUSE.inc()
+                logger.warning("Refresh token reuse detected; revoked session %s", session_id)
+                # Committed here because the 401 below rolls the request back.
+                await self.db.commit()
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+
+        user, next_jti = rotated
+        return user, create_refresh_token(user.id, user.organization_id, session_id, next_jti)
+
+    async def refresh_tokens(self, refresh_token: str) -> IssuedTokens:
+        """Refreshes like ``refresh``, coalescing concurrent and just-answered
+        requests for the same token into one rotation. The rotation is
+        committed before its tokens are shared."""
+        session_id, jti = _session_claims(refresh_token)
+        digest = hashlib.sha256(refresh_token.encode()).digest()
+        while True:
+            issued = recent_refreshes.get(digest)
+            if issued is not None:
+                REFRESH_COALESCED.inc()
+                return issued
+            pending = _refreshes_in_flight.get(digest)
+            if pending is None:
+                break
+            try:
+                issued = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leading request was cancelled (client gone): take over.
+                if pending.cancelled():
+                    continue
+                raise
+            REFRESH_COALESCED.inc()
+            return issued
+
+        future: asyncio.Future[IssuedTokens] = asyncio.get_running_loop().create_future()
+        _refreshes_in_flight[digest] = future
+        try:
+            user, new_refresh_token = await self._rotate(session_id, jti)
+            access_token = create_access_token(user.id, user.organization_id, user.role, user.authz_version)
+            record_authz_version(user)
+            await self.db.commit()
+            issued = IssuedTokens(access_token, new_refresh_token, session_id, user.id, user.organization_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Marks the exception retrieved when no request is waiting on it.
+            future.exception()
+            raise
+        finally:
+            del _refreshes_in_flight[digest]
+
+        future.set_result(issued)
+        recent_refreshes.set(digest, issued)
+        return issued
+
+    async def end(self, refresh_token: str) -> None:
+        """Revokes the session behind ``refresh_token``; invalid tokens are ignored."""
+        try:
+            session_id, _ = _session_claims(refresh_token)
+        except HTTPException:
+            return
+        recent_refreshes.discard_where(lambda issued: issued.session_id == session_id)
+        await self.session_repo.revoke(session_id)
+
+    async def list_active(self, user_id: uuid.UUID) -> list[RefreshSession]:
+        return await self.session_repo.get_active_for_user(user_id)
+
+    async def revoke_user_sessions(self, user_id: uuid.UUID) -> int:
+        recent_refreshes.discard_where(lambda issued: issued.user_id == user_id)
+        return await self.session_repo.revoke_for_user(user_id)
+
+    async def revoke_organization_sessions(self, organization_id: uuid.UUID) -> int:
+        recent_refreshes.discard_where(lambda issued: issued.organization_id == organization_id)
+        return await self.session_repo.revoke_for_organization(organization_id)
+
+
+def _session_claims(refresh_token: str) -> tuple[uuid.UUID, uuid.UUID]:
+    try:
+        payload = verify_refresh_token(refresh_token)
+        return uuid.UUID(payload["sid"]), uuid.UUID(payload["jti"])
+    except (pyjwt.InvalidTokenError, KeyError, ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token"
+        ) from exc
+
+
+def _expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days)
@@ -0,0 +1,50 @@
+import logging
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import async_session_factory
+from src.metrics import counter
+from src.repositories import RefreshSessionRepository
+from src.services.background import run_periodically, start_background_job, sweep_in_batches
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SESSIONS_PURGED = counter("refresh_sessions_purged_total", "Expired refresh sessions deleted by the sweeper.")
+
+
+class SessionSweeper:
+    """Deletes expired refresh sessions in batches of ``batch_size`` (see
+    sweep_in_batches)."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_session_factory,
+        batch_size: int = settings.refresh_session_sweep_batch_size,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Sweeps until no batch is left and returns how many sessions were deleted."""
+        return await sweep_in_batches(self.session_factory, self._purge_batch, self.batch_size)
+
+    async def _purge_batch(self, session: AsyncSession) -> int:
+        purged = await RefreshSessionRepository(session).purge_expired(self.batch_size)
+        REFRESH_SESSIONS_PURGED.inc(purged)
+        return purged
+
+    async def run(self, interval: float = settings.refresh_session_sweep_interval_seconds) -> None:
+        """Sweeps every ``interval`` seconds until cancelled."""
+        await run_periodically("Refresh session sweep", self._sweep, interval)
+
+    async def _sweep(self) -> bool:
+        purged = await self.run_once()
+        if purged:
+            logger.info("Refresh session sweep: %d expired sessions deleted", purged)
+        return False
+
+
+def start_session_sweeper(interval: float = settings.refresh_session_sweep_interval_seconds) -> None:
+    start_background_job("session_sweeper", lambda: SessionSweeper().run(interval))
@@ -1,10 +1,14 @@
 import uuid
+from datetime import datetime
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.auth.principal_cache import invalidate_principal_on_commit
 from src.models import User, UserRole, UserStatus
+from src.pagination import decode_cursor, encode_cursor
 from src.repositories import UserRepository
+from src.repositories.users import USER_SORT_COLUMNS, UserSort
 
 
 class UserService:
@@ -24,10 +28,52 @@ class UserService:
     async def list_by_organization(self, organization_id: uuid.UUID) -> list[User]:
         return await self.user_repo.get_by_organization(organization_id)
 
+    async def list_page(
+        self,
+        organization_id: uuid.UUID,
+        limit: int,
+        cursor: str | None = None,
+        sort: UserSort = "created_at",
+        role: UserRole | None = None,
+        user_status: UserStatus | None = None,
+        search: str | None = None,
+    ) -> tuple[list[User], str | None]:
+        """Returns one page of members and the cursor for the next page, or
+        None when this is the last one."""
+        after = _decode_user_cursor(cursor, sort) if cursor else None
+        users = await self.user_repo.get_page(
+            organization_id, limit + 1, sort=sort, after=after, role=role, status=user_status, search=search
+        )
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        last = users[-1]
+        return users, encode_cursor(sort, getattr(last, sort.lstrip("-")), last.id)
+
+    async def search(
+        self,
+        organization_id: uuid.UUID,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        role: UserRole | None = None,
+        user_status: UserStatus | None = None,
+    ) -> tuple[list[User], str | None]:
+        """Returns one page of the best matches and the cursor for the next
+        page, or None when this is the last one."""
+        query = query.strip()
+        offset = _decode_search_cursor(cursor, query) if cursor else 0
+        users = await self.user_repo.search(
+            organization_id, query, limit + 1, offset=offset, role=role, status=user_status
+        )
+        if len(users) <= limit:
+            return users, None
+        return users[:limit], encode_cursor("search", query, offset + limit)
+
     async def update_role(
-        self, user_id: uuid.UUID, new_role: UserRole, current_user: User
+        self, target: User | uuid.UUID, new_role: UserRole, current_user: User
     ) -> User:
-        target = await self.get_by_id(user_id)
+        target = await self._resolve_target(target, current_user)
 
         if target.id == current_user.id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot change your own role")
@@ -44,20 +90,58 @@ class UserService:
                     detail="Managers cannot promote users to Admin",
                 )
 
+        invalidate_principal_on_commit(self.db, target.id)
         return await self.user_repo.update_role(target, new_role)
 
-    async def delete_user(self, user_id: uuid.UUID, current_user: User) -> None:
-        target = await self.get_by_id(user_id)
+    async def delete_user(self, target: User | uuid.UUID, current_user: User) -> None:
+        target = await self._resolve_target(target, current_user)
 
         if target.id == current_user.id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot delete yourself")
 
+        invalidate_principal_on_commit(self.db, target.id)
         await self.user_repo.delete(target)
 
+    async def _resolve_target(self, target: User | uuid.UUID, current_user: User) -> User:
+        """Accepts a user already loaded by the caller (e.g. by get_org_user)
+        so it isn't fetched twice, or an id to load. Either way the target
+        must belong to the caller's organization."""
+        if not isinstance(target, User):
+            target = await self.get_by_id(target)
+        if target.organization_id != current_user.organization_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        return target
+
     async def activate_user(
         self, user: User, name: str | None = None, profile_picture: str | None = None
     ) -> User:
+        invalidate_principal_on_commit(self.db, user.id)
         await self.user_repo.update_status(user, UserStatus.ACTIVE)
         if name or profile_picture:
             await self.user_repo.update_profile(user, name=name, profile_picture=profile_picture)
         return user
+
+
+def _decode_user_cursor(cursor: str, sort: UserSort) -> tuple[datetime | str, uuid.UUID]:
+    try:
+        cursor_sort, value, user_id = decode_cursor(cursor)
+        if cursor_sort != sort or sort.lstrip("-") not in USER_SORT_COLUMNS:
+            raise ValueError("Cursor was issued for a different sort order")
+        if not isinstance(value, str) or not isinstance(user_id, str):
+            raise TypeError("Malformed cursor")
+        key = datetime.fromisoformat(value) if sort.lstrip("-") == "created_at" else value
+        return key, uuid.UUID(user_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _decode_search_cursor(cursor: str, query: str) -> int:
+    try:
+        kind, cursor_query, offset = decode_cursor(cursor)
+        if kind != "search" or cursor_query != query:
+            raise ValueError("Cursor was issued for a different search")
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise ValueError("Malformed cursor")
+        return offset
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
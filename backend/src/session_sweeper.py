@@ -0,0 +1,17 @@
+"""Standalone refresh session sweeper, for running it outside the API process:
+
+    python -m src.session_sweeper
+
+Set REFRESH_SESSION_SWEEP_INTERVAL_SECONDS=0 on the API when the sweeper runs
+here instead; this process falls back to a one-hour interval in that case.
+"""
+
+from src.config import settings
+from src.services.background import run_standalone
+from src.services.session_sweeper import SessionSweeper
+
+if __name__ == "__main__":
+    run_standalone(
+        "Refresh session sweeper",
+        lambda: SessionSweeper().run(settings.refresh_session_sweep_interval_seconds or 3600.0),
+    )
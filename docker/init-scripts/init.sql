@@ -1,21 +1,28 @@
 -- Nexus Database Schema Cleanup
 -- Drop tables in reverse order of dependency to ensure a clean slate
+DROP TABLE IF EXISTS refresh_sessions;
+DROP TABLE IF EXISTS email_outbox;
 DROP TABLE IF EXISTS invitations;
 DROP TABLE IF EXISTS users;
 DROP TABLE IF EXISTS organizations;
 
 -- Drop types if they exist to prevent "already exists" errors
+DROP TYPE IF EXISTS outbox_status;
 DROP TYPE IF EXISTS invitation_status;
 DROP TYPE IF EXISTS user_status;
 DROP TYPE IF EXISTS user_role;
 
 -- Enable pgcrypto for UUID generation
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+-- Trigram member search; btree_gin lets organization_id share the GIN index
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+CREATE EXTENSION IF NOT EXISTS "btree_gin";
 
 -- Enum types
 CREATE TYPE user_role AS ENUM ('admin', 'manager', 'viewer');
 CREATE TYPE user_status AS ENUM ('active', 'pending');
 CREATE TYPE invitation_status AS ENUM ('pending', 'accepted', 'expired');
+CREATE TYPE outbox_status AS ENUM ('pending', 'sent', 'dead');
 
 -- 1. Organizations (Base table)
 CREATE TABLE organizations (
@@ -34,6 +41,7 @@ CREATE TABLE users (
     profile_picture TEXT,
     role user_role NOT NULL DEFAULT 'viewer',
     status user_status NOT NULL DEFAULT 'pending',
+    authz_version INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
     CONSTRAINT uq_user_email UNIQUE (email) -- Removed organization_id from unique to keep it simple for now
@@ -48,15 +56,61 @@ CREATE TABLE invitations (
     email VARCHAR(255) NOT NULL,
     name VARCHAR(255) NOT NULL,
     role user_role NOT NULL,
-    token VARCHAR(255) UNIQUE NOT NULL,
+    -- SHA-256 of the invitation token; the raw token only exists in the email.
+    token_hash BYTEA NOT NULL CONSTRAINT uq_invitations_token_hash UNIQUE
+        CONSTRAINT ck_invitations_token_hash_length CHECK (octet_length(token_hash) = 32),
     invited_by UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     status invitation_status NOT NULL DEFAULT 'pending',
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL
 );
 
+-- 4. Email outbox (written in the same transaction as the change that sends it)
+CREATE TABLE email_outbox (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    kind VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL,
+    status outbox_status NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    sent_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 5. Refresh sessions (one per signed-in device; see src/models/refresh_session.py)
+CREATE TABLE refresh_sessions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    -- Only the refresh token carrying current_jti is valid; previous_jti is
+    -- honoured for a short grace period after rotated_at.
+    current_jti UUID NOT NULL,
+    previous_jti UUID,
+    rotated_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    last_used_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    revoked_at TIMESTAMP WITH TIME ZONE
+);
+
 -- Indexes for performance
 CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_users_organization_id ON users(organization_id);
-CREATE INDEX idx_invitations_token ON invitations(token);
-CREATE INDEX idx_invitations_org_email ON invitations(organization_id, email);
\ No newline at end of file
+-- Keyset pagination of GET /users, one per sort order. Both also serve plain
+-- organization_id lookups, so no separate index is needed for those.
+CREATE INDEX idx_users_org_created_id ON users(organization_id, created_at, id);
+CREATE INDEX idx_users_org_name_id ON users(organization_id, name, id);
+CREATE INDEX idx_users_search_trgm ON users
+    USING gin (organization_id, name gin_trgm_ops, email gin_trgm_ops);
+-- Pending-invitation lookups by organization (alone or with an email); rows
+-- leave the index once accepted or expired.
+CREATE INDEX idx_invitations_pending_org_email ON invitations(organization_id, email)
+    WHERE status = 'pending';
+CREATE INDEX idx_invitations_pending_expires ON invitations(expires_at) WHERE status = 'pending';
+CREATE INDEX idx_invitations_org_created_id ON invitations(organization_id, created_at, id);
+CREATE INDEX idx_email_outbox_due ON email_outbox(next_attempt_at) WHERE status = 'pending';
+CREATE INDEX idx_email_outbox_settled ON email_outbox(created_at) WHERE status <> 'pending';
+-- Refresh sessions: per-user listing/revocation, per-org revocation, expiry cleanup.
+CREATE INDEX idx_refresh_sessions_user_expires ON refresh_sessions(user_id, expires_at);
+CREATE INDEX idx_refresh_sessions_org ON refresh_sessions(organization_id);
+CREATE INDEX idx_refresh_sessions_expires ON refresh_sessions(expires_at);
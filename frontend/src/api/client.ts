@@ -110,7 +110,11 @@ export const authApi = {
 // --- Users API ---
 export const usersApi = {
   getMe: () => apiClient.get<import("../types").User>("/users/me"),
-  list: () => apiClient.get<import("../types").User[]>("/users"),
+  list: (params?: { limit?: number; cursor?: string; sort?: string; role?: string; status?: string; q?: string }) =>
+    apiClient.get<import("../types").User[]>("/users", { params }),
+  // Both endpoints return one page; X-Next-Cursor carries the cursor for the next.
+  search: (params: { q: string; limit?: number; cursor?: string; role?: string; status?: string }) =>
+    apiClient.get<import("../types").User[]>("/users/search", { params }),
   updateRole: (userId: string, role: import("../types").UserRole) =>
     apiClient.patch<import("../types").User>(`/users/${userId}/role`, { role }),
   deleteUser: (userId: string) => apiClient.delete(`/users/${userId}`),
@@ -37,7 +37,7 @@ export default function InviteUserModal({
   const [emailTouched, setEmailTouched] = useState(false);
   const [createdInvitation, setCreatedInvitation] = useState<Invitation | null>(null);
 
-  const inviteLink = createdInvitation
+  const inviteLink = createdInvitation?.token
     ? `${window.location.origin}/invite/accept?token=${createdInvitation.token}`
     : null;
 
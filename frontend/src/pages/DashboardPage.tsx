@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { usersApi, invitationsApi } from "../api/client";
 import { useAuth } from "../context/AuthContext";
 import type { Invitation, User, UserRole, UserStatus } from "../types";
@@ -8,6 +8,7 @@ import EditRoleModal from "../components/EditRoleModal";
 import DeleteUserDialog from "../components/DeleteUserDialog";
 import { ToastContainer } from "../components/Toast";
 import { useToast } from "../hooks/useToast";
+import { useDebouncedValue } from "../hooks/useDebouncedValue";
 
 const ROLE_FILTERS: { value: UserRole | "all"; label: string }[] = [
   { value: "all", label: "All roles" },
@@ -22,18 +23,28 @@ const STATUS_FILTERS: { value: UserStatus | "all"; label: string }[] = [
   { value: "pending", label: "Pending" },
 ];
 
+const SEARCH_DEBOUNCE_MS = 300;
+const PAGE_SIZE = 50;
+
 export default function DashboardPage() {
   const { user: currentUser } = useAuth();
   const { toasts, addToast, dismissToast } = useToast();
 
+  // The members loaded so far for the current search and filters, and the
+  // cursor for the next page (null once the last page is in).
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [invitations, setInvitations] = useState<Invitation[]>([]);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState("");
 
   const [search, setSearch] = useState("");
+  const debouncedSearch = useDebouncedValue(search.trim(), SEARCH_DEBOUNCE_MS);
   const [roleFilter, setRoleFilter] = useState<UserRole | "all">("all");
   const [statusFilter, setStatusFilter] = useState<UserStatus | "all">("all");
+  // Bumped whenever the query changes so responses for an older one are dropped.
+  const queryVersion = useRef(0);
 
   const [showInviteModal, setShowInviteModal] = useState(false);
   const [editRoleTarget, setEditRoleTarget] = useState<User | null>(null);
@@ -42,39 +53,63 @@ export default function DashboardPage() {
   const canManage =
     currentUser?.role === "admin" || currentUser?.role === "manager";
 
-  const fetchData = async () => {
+  // Searches go to the ranked /users/search; otherwise members are listed in
+  // join order. Both take the same filters and page with X-Next-Cursor.
+  const fetchPage = (cursor?: string) => {
+    const params = {
+      limit: PAGE_SIZE,
+      cursor,
+      role: roleFilter === "all" ? undefined : roleFilter,
+      status: statusFilter === "all" ? undefined : statusFilter,
+    };
+    return debouncedSearch
+      ? usersApi.search({ q: debouncedSearch, ...params })
+      : usersApi.list(params);
+  };
+
+  useEffect(() => {
+    if (!canManage) return;
+    invitationsApi
+      .list()
+      .then((res) => setInvitations(res.data))
+      .catch(() => setError("Failed to load team data. Please refresh."));
+  }, [canManage]);
+
+  useEffect(() => {
+    const version = ++queryVersion.current;
     setIsLoading(true);
     setError("");
+    fetchPage()
+      .then((res) => {
+        if (version !== queryVersion.current) return;
+        setUsers(res.data);
+        setNextCursor(res.headers["x-next-cursor"] ?? null);
+      })
+      .catch(() => {
+        if (version === queryVersion.current) setError("Failed to load team data. Please refresh.");
+      })
+      .finally(() => {
+        if (version === queryVersion.current) setIsLoading(false);
+      });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [debouncedSearch, roleFilter, statusFilter]);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    const version = queryVersion.current;
+    setIsLoadingMore(true);
     try {
-      const [usersRes, invitesRes] = await Promise.all([
-        usersApi.list(),
-        canManage ? invitationsApi.list() : Promise.resolve({ data: [] }),
-      ]);
-      setUsers(usersRes.data);
-      setInvitations(invitesRes.data);
+      const res = await fetchPage(nextCursor);
+      if (version !== queryVersion.current) return;
+      setUsers((prev) => [...prev, ...res.data]);
+      setNextCursor(res.headers["x-next-cursor"] ?? null);
     } catch {
-      setError("Failed to load team data. Please refresh.");
+      if (version === queryVersion.current) addToast("Failed to load more members", "error");
     } finally {
-      setIsLoading(false);
+      setIsLoadingMore(false);
     }
   };
 
-  useEffect(() => {
-    fetchData();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
-
-  const filteredUsers = useMemo(() => {
-    const q = search.toLowerCase().trim();
-    return users.filter((u) => {
-      const matchesSearch =
-        !q || u.name.toLowerCase().includes(q) || u.email.toLowerCase().includes(q);
-      const matchesRole = roleFilter === "all" || u.role === roleFilter;
-      const matchesStatus = statusFilter === "all" || u.status === statusFilter;
-      return matchesSearch && matchesRole && matchesStatus;
-    });
-  }, [users, search, roleFilter, statusFilter]);
-
   const hasActiveFilters =
     search !== "" || roleFilter !== "all" || statusFilter !== "all";
 
@@ -108,60 +143,58 @@ export default function DashboardPage() {
       )}
 
       {/* Search + filters */}
-      {!isLoading && (
-        <div className="flex flex-wrap items-center gap-3">
-          <div className="relative flex-1 min-w-[200px]">
-            <svg
-              className="absolute left-3 top-1/2 h-4 w-4 -translate-y-1/2 text-gray-400"
-              fill="none"
-              viewBox="0 0 24 24"
-              stroke="currentColor"
-            >
-              <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M21 21l-4.35-4.35M17 11A6 6 0 1 1 5 11a6 6 0 0 1 12 0z" />
-            </svg>
-            <input
-              type="text"
-              value={search}
-              onChange={(e) => setSearch(e.target.value)}
-              placeholder="Search by name or email…"
-              className="w-full rounded-lg border border-gray-300 py-2 pl-9 pr-3 text-sm shadow-sm placeholder-gray-400 focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
-            />
-          </div>
-
-          <select
-            value={roleFilter}
-            onChange={(e) => setRoleFilter(e.target.value as UserRole | "all")}
-            className="rounded-lg border border-gray-300 px-3 py-2 text-sm shadow-sm focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
+      <div className="flex flex-wrap items-center gap-3">
+        <div className="relative flex-1 min-w-[200px]">
+          <svg
+            className="absolute left-3 top-1/2 h-4 w-4 -translate-y-1/2 text-gray-400"
+            fill="none"
+            viewBox="0 0 24 24"
+            stroke="currentColor"
           >
-            {ROLE_FILTERS.map((f) => (
-              <option key={f.value} value={f.value}>
-                {f.label}
-              </option>
-            ))}
-          </select>
+            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M21 21l-4.35-4.35M17 11A6 6 0 1 1 5 11a6 6 0 0 1 12 0z" />
+          </svg>
+          <input
+            type="text"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+            placeholder="Search by name or email…"
+            className="w-full rounded-lg border border-gray-300 py-2 pl-9 pr-3 text-sm shadow-sm placeholder-gray-400 focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
+          />
+        </div>
 
-          <select
-            value={statusFilter}
-            onChange={(e) => setStatusFilter(e.target.value as UserStatus | "all")}
-            className="rounded-lg border border-gray-300 px-3 py-2 text-sm shadow-sm focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
-          >
-            {STATUS_FILTERS.map((f) => (
-              <option key={f.value} value={f.value}>
-                {f.label}
-              </option>
-            ))}
-          </select>
+        <select
+          value={roleFilter}
+          onChange={(e) => setRoleFilter(e.target.value as UserRole | "all")}
+          className="rounded-lg border border-gray-300 px-3 py-2 text-sm shadow-sm focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
+        >
+          {ROLE_FILTERS.map((f) => (
+            <option key={f.value} value={f.value}>
+              {f.label}
+            </option>
+          ))}
+        </select>
 
-          {hasActiveFilters && (
-            <button
-              onClick={() => { setSearch(""); setRoleFilter("all"); setStatusFilter("all"); }}
-              className="text-sm text-indigo-600 hover:underline"
-            >
-              Clear filters
-            </button>
-          )}
-        </div>
-      )}
+        <select
+          value={statusFilter}
+          onChange={(e) => setStatusFilter(e.target.value as UserStatus | "all")}
+          className="rounded-lg border border-gray-300 px-3 py-2 text-sm shadow-sm focus:border-indigo-500 focus:outline-none focus:ring-1 focus:ring-indigo-500"
+        >
+          {STATUS_FILTERS.map((f) => (
+            <option key={f.value} value={f.value}>
+              {f.label}
+            </option>
+          ))}
+        </select>
+
+        {hasActiveFilters && (
+          <button
+            onClick={() => { setSearch(""); setRoleFilter("all"); setStatusFilter("all"); }}
+            className="text-sm text-indigo-600 hover:underline"
+          >
+            Clear filters
+          </button>
+        )}
+      </div>
 
       {/* Loading skeleton */}
       {isLoading ? (
@@ -175,12 +208,10 @@ export default function DashboardPage() {
           {/* Members list */}
           <section>
             <h2 className="mb-3 text-sm font-semibold uppercase tracking-wide text-gray-400">
-              Members ({filteredUsers.length}
-              {hasActiveFilters && users.length !== filteredUsers.length
-                ? ` of ${users.length}`
-                : ""})
+              Members ({users.length}
+              {nextCursor ? "+" : ""})
             </h2>
-            {filteredUsers.length === 0 ? (
+            {users.length === 0 ? (
               <div className="rounded-xl border border-dashed border-gray-300 py-10 text-center">
                 <p className="text-sm text-gray-500">
                   {hasActiveFilters ? "No members match your filters." : "No members yet."}
@@ -188,7 +219,7 @@ export default function DashboardPage() {
               </div>
             ) : (
               <div className="space-y-3">
-                {filteredUsers.map((u) => (
+                {users.map((u) => (
                   <UserCard
                     key={u.id}
                     user={u}
@@ -199,6 +230,17 @@ export default function DashboardPage() {
                 ))}
               </div>
             )}
+            {nextCursor && (
+              <div className="mt-4 text-center">
+                <button
+                  onClick={loadMore}
+                  disabled={isLoadingMore}
+                  className="rounded-lg border border-gray-300 px-4 py-2 text-sm font-medium text-gray-700 shadow-sm hover:bg-gray-50 disabled:opacity-50 transition"
+                >
+                  {isLoadingMore ? "Loading…" : "Load more"}
+                </button>
+              </div>
+            )}
           </section>
 
           {/* Pending invitations */}
@@ -28,7 +28,8 @@ export interface Invitation {
   email: string;
   name: string;
   role: UserRole;
-  token: string;
+  // Only present in the response that created the invitation.
+  token: string | null;
   status: InvitationStatus;
   created_at?: string;
   expires_at?: string;
@@ -1,15 +1,17 @@
 import uuid
 from datetime import datetime, timedelta, timezone
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable, Iterator
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
 from src.config import settings
 from src.models import Base, Organization, User, UserRole, UserStatus, Invitation, InvitationStatus
 from src.auth.jwt import create_access_token
+from src.services.invitation_preview import preview_cache
 
 TEST_DATABASE_URL = settings.database_url
 
@@ -27,6 +29,14 @@ async def setup_database():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def clear_invitation_previews() -> Iterator[None]:
+    # Fixture tokens repeat across tests while the rows behind them do not.
+    preview_cache.clear()
+    yield
+    preview_cache.clear()
+
+
 @pytest_asyncio.fixture
 async def db() -> AsyncGenerator[AsyncSession, None]:
     """Provide a session bound to a savepoint so fixtures and API handlers
@@ -41,6 +51,14 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
         await transaction.rollback()
 
 
+@pytest.fixture
+def session_factory(db: AsyncSession) -> Callable[[], AsyncSession]:
+    """Sessions for background jobs and streamed responses. They share the
+    test connection so they see uncommitted rows; their commits only release
+    a savepoint of the outer test transaction."""
+    return lambda: AsyncSession(bind=db.bind, expire_on_commit=False)
+
+
 @pytest_asyncio.fixture
 async def sample_org(db: AsyncSession) -> Organization:
     org = Organization(name="Acme Corp")
@@ -148,3 +166,28 @@ async def expired_invitation(db: AsyncSession, sample_org: Organization, sample_
 def make_auth_header(user: User) -> dict[str, str]:
     token = create_access_token(user.id, user.organization_id)
     return {"Authorization": f"Bearer {token}"}
+
+
+class QueryCounter:
+    """Records every SQL statement sent through the test engine."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def query_counter() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
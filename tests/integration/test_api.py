@@ -1,28 +1,42 @@
+import asyncio
+import csv
+import io
+import json
 import uuid
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.main import app
+from src.main import app, lifespan
 from src.models import User, UserRole, Organization, Invitation
 from src.auth.jwt import create_access_token, create_refresh_token
-from src.db import get_db
+from src.auth.principal_cache import cache_principal, invalidate_principal, principal_cache, record_authz_version
+from src.config import settings
+from src.pagination import encode_cursor
+from src.services import ExportService, InvitationService, SessionService, UserService
+from src.services import export_service
+from src.db.instrumentation import start_request_stats
+from src.db import async_session_factory, engine as app_engine, get_db, get_session_factory, warm_pool
 
 
 @pytest_asyncio.fixture
-async def client(db: AsyncSession) -> AsyncClient:
+async def client(db: AsyncSession, session_factory) -> AsyncClient:
     async def override_get_db():
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_session_factory, None)
 
 
 def auth_header(user: User) -> dict[str, str]:
@@ -41,6 +55,91 @@ class TestHealthRoutes:
         assert response.status_code == 200
         assert response.json()["database"] == "connected"
 
+    async def test_metrics_exposes_pool_wait(self, client: AsyncClient):
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+
+    async def test_metrics_label_requests_by_route_template(
+        self, client: AsyncClient, sample_admin: User, sample_viewer: User
+    ):
+        response = await client.delete(f"/users/{sample_viewer.id}", headers=auth_header(sample_admin))
+        assert response.status_code == 204
+        await client.get("/no-such-route")
+
+        text = (await client.get("/metrics")).text
+        assert 'http_requests_total{method="DELETE",route="/users/{user_id}",status="204"}' in text
+        assert 'http_request_duration_seconds_count{method="DELETE",route="/users/{user_id}"}' in text
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in text
+        assert str(sample_viewer.id) not in text
+
+
+class TestStartup:
+    async def test_warm_pool_opens_distinct_connections(self):
+        try:
+            warmed = await warm_pool(2)
+            assert warmed == 2
+            assert app_engine.pool.checkedin() >= 2
+        finally:
+            await app_engine.dispose()
+
+    async def test_lifespan_warms_and_disposes(self, monkeypatch):
+        monkeypatch.setattr(settings, "db_pool_warm_connections", 1)
+        async with lifespan(app):
+            assert app_engine.pool.checkedin() >= 1
+        assert app_engine.pool.checkedin() == 0
+
+
+class TestQueryStats:
+    async def test_failed_statement_does_not_leak_its_start_time(self, db: AsyncSession):
+        async def run_request():
+            stats = start_request_stats()
+            connection = await db.connection()
+            with pytest.raises(DBAPIError):
+                async with connection.begin_nested():
+                    await connection.execute(text("SELECT 1 / 0"))
+            await connection.execute(text("SELECT 1"))
+            return stats, connection.sync_connection.info.get("query_started")
+
+        # In its own task so the request stats don't outlive the test.
+        stats, started = await asyncio.create_task(run_request())
+        assert started == []
+        assert "SELECT 1 / 0" in stats.statement_counts
+        assert stats.statement_counts["SELECT 1"] == 1
+
+    async def test_server_timing_header_in_development(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "app_env", "development")
+        response = await client.get("/health/db")
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+    async def test_structured_log_outside_development(self, client: AsyncClient, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "app_env", "production")
+        with caplog.at_level("INFO", logger="src.main"):
+            response = await client.get("/health/db")
+        assert "server-timing" not in response.headers
+
+        records = [json.loads(r.getMessage()) for r in caplog.records if "request_db_stats" in r.getMessage()]
+        assert len(records) == 1
+        assert records[0]["path"] == "/health/db"
+        assert records[0]["status"] == 200
+        assert records[0]["queries"] == 1
+        assert "SELECT 1" in records[0]["slowest_statement"]
+
+    async def test_warns_on_repeated_statement(self, client: AsyncClient, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "db_n_plus_one_threshold", 1)
+        with caplog.at_level("WARNING", logger="src.main"):
+            await client.get("/health/db")
+        assert any("Possible N+1: GET /health/db" in r.getMessage() for r in caplog.records)
+
+        caplog.clear()
+        monkeypatch.setattr(settings, "db_n_plus_one_threshold", 2)
+        with caplog.at_level("WARNING", logger="src.main"):
+            await client.get("/health/db")
+        assert not any("Possible N+1" in r.getMessage() for r in caplog.records)
+
 
 class TestAuthRoutes:
     async def test_google_auth_url_register(self, client: AsyncClient):
@@ -71,12 +170,61 @@ class TestAuthRoutes:
         assert response.status_code == 200
         assert response.json()["message"] == "Logged out successfully"
 
-    async def test_refresh_with_valid_cookie(self, client: AsyncClient, sample_admin: User):
-        refresh = create_refresh_token(sample_admin.id, sample_admin.organization_id)
+    async def test_refresh_with_valid_cookie(self, client: AsyncClient, db: AsyncSession, sample_admin: User):
+        refresh = await SessionService(db).start(sample_admin)
         client.cookies.set("refresh_token", refresh)
         response = await client.post("/auth/refresh")
         assert response.status_code == 200
         assert "access_token" in response.json()
+        assert response.cookies["refresh_token"] != refresh
+
+    async def test_refresh_rejects_token_without_session(self, client: AsyncClient, sample_admin: User):
+        refresh = create_refresh_token(sample_admin.id, sample_admin.organization_id, uuid.uuid4(), uuid.uuid4())
+        client.cookies.set("refresh_token", refresh)
+        response = await client.post("/auth/refresh")
+        assert response.status_code == 401
+
+    async def test_refresh_is_a_single_query(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, query_counter
+    ):
+        client.cookies.set("refresh_token", await SessionService(db).start(sample_admin))
+        query_counter.reset()
+        response = await client.post("/auth/refresh")
+        assert response.status_code == 200
+        assert query_counter.count == 1
+
+    async def test_logout_revokes_the_session(self, client: AsyncClient, db: AsyncSession, sample_admin: User):
+        refresh = await SessionService(db).start(sample_admin)
+        client.cookies.set("refresh_token", refresh)
+        assert (await client.post("/auth/logout")).status_code == 200
+        client.cookies.set("refresh_token", refresh)
+        assert (await client.post("/auth/refresh")).status_code == 401
+
+    async def test_list_and_revoke_own_sessions(self, client: AsyncClient, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        refresh = await service.start(sample_admin)
+        await service.start(sample_admin)
+
+        listed = await client.get("/auth/sessions", headers=auth_header(sample_admin))
+        assert len(listed.json()) == 2
+
+        response = await client.post("/auth/logout-all", headers=auth_header(sample_admin))
+        assert response.json()["revoked_sessions"] == 2
+        client.cookies.set("refresh_token", refresh)
+        assert (await client.post("/auth/refresh")).status_code == 401
+
+    async def test_admin_revokes_organization_sessions(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, sample_viewer: User, other_org_admin: User
+    ):
+        service = SessionService(db)
+        for user in (sample_admin, sample_viewer, other_org_admin):
+            await service.start(user)
+
+        forbidden = await client.delete("/organizations/me/sessions", headers=auth_header(sample_viewer))
+        assert forbidden.status_code == 403
+        response = await client.delete("/organizations/me/sessions", headers=auth_header(sample_admin))
+        assert response.json() == {"revoked_sessions": 2}
+        assert len(await service.list_active(other_org_admin.id)) == 1
 
 
 class TestUserRoutes:
@@ -89,11 +237,161 @@ class TestUserRoutes:
         response = await client.get("/users")
         assert response.status_code in (401, 403)
 
+    async def test_list_users_pages_with_cursor(self, client: AsyncClient, db: AsyncSession, sample_admin: User):
+        # All rows share created_at (same transaction), so paging relies on the id tiebreak.
+        for i in range(6):
+            db.add(User(organization_id=sample_admin.organization_id, email=f"member{i}@acme.com", name=f"Member {i}"))
+        await db.flush()
+
+        seen: list[str] = []
+        cursor = None
+        for _ in range(4):
+            params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+            response = await client.get("/users", params=params, headers=auth_header(sample_admin))
+            assert response.status_code == 200
+            seen.extend(u["id"] for u in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    async def test_list_users_sorts_and_filters(
+        self, client: AsyncClient, sample_admin: User, sample_manager: User, sample_viewer: User
+    ):
+        headers = auth_header(sample_admin)
+        response = await client.get("/users", params={"sort": "-name"}, headers=headers)
+        names = [u["name"] for u in response.json()]
+        assert names == sorted(names, reverse=True)
+
+        response = await client.get("/users", params={"role": "manager"}, headers=headers)
+        assert [u["email"] for u in response.json()] == [sample_manager.email]
+
+        response = await client.get("/users", params={"q": "VIEW"}, headers=headers)
+        assert [u["email"] for u in response.json()] == [sample_viewer.email]
+
+        response = await client.get("/users", params={"q": "%"}, headers=headers)
+        assert response.json() == []
+
+    async def test_list_users_sort_by_name_pages(self, client: AsyncClient, sample_admin: User, sample_manager: User, sample_viewer: User):
+        headers = auth_header(sample_admin)
+        first = await client.get("/users", params={"sort": "name", "limit": 2}, headers=headers)
+        cursor = first.headers["X-Next-Cursor"]
+        second = await client.get("/users", params={"sort": "name", "limit": 2, "cursor": cursor}, headers=headers)
+
+        names = [u["name"] for u in first.json() + second.json()]
+        assert names == ["Admin User", "Manager User", "Viewer User"]
+        assert "X-Next-Cursor" not in second.headers
+
+    async def test_search_users_ranks_prefix_matches_first(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, other_org_admin: User
+    ):
+        for email, name in [("jordan@acme.com", "Jordan Lee"), ("alex@acme.com", "Alex Jordanov"), ("sam@acme.com", "Sam")]:
+            db.add(User(organization_id=sample_admin.organization_id, email=email, name=name))
+        await db.flush()
+
+        response = await client.get("/users/search", params={"q": "jordan"}, headers=auth_header(sample_admin))
+        assert response.status_code == 200
+        assert [u["email"] for u in response.json()] == ["jordan@acme.com", "alex@acme.com"]
+
+        response = await client.get("/users/search", params={"q": "admin"}, headers=auth_header(sample_admin))
+        assert [u["email"] for u in response.json()] == [sample_admin.email]
+
+    async def test_search_users_pages_with_cursor(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User
+    ):
+        for i in range(3):
+            db.add(User(organization_id=sample_admin.organization_id, email=f"kim{i}@acme.com", name=f"Kim {i}"))
+        db.add(
+            User(
+                organization_id=sample_admin.organization_id,
+                email="kim.manager@acme.com",
+                name="Kim Manager",
+                role=UserRole.MANAGER,
+            )
+        )
+        await db.flush()
+        headers = auth_header(sample_admin)
+
+        params = {"q": "kim", "limit": 2, "role": "viewer"}
+        first = await client.get("/users/search", params=params, headers=headers)
+        cursor = first.headers["X-Next-Cursor"]
+        second = await client.get("/users/search", params={**params, "cursor": cursor}, headers=headers)
+        assert "X-Next-Cursor" not in second.headers
+        emails = [u["email"] for u in first.json() + second.json()]
+        assert sorted(emails) == ["kim0@acme.com", "kim1@acme.com", "kim2@acme.com"]
+
+        response = await client.get("/users/search", params={"q": "other", "cursor": cursor}, headers=headers)
+        assert response.status_code == 400
+
+    async def test_search_users_requires_query(self, client: AsyncClient, sample_admin: User):
+        response = await client.get("/users/search", headers=auth_header(sample_admin))
+        assert response.status_code == 422
+
+    async def test_search_has_trigram_index(self, db: AsyncSession):
+        indexdef = await db.scalar(
+            text("SELECT indexdef FROM pg_indexes WHERE indexname = 'idx_users_search_trgm'")
+        )
+        assert "USING gin (organization_id, name gin_trgm_ops, email gin_trgm_ops)" in indexdef
+
+    async def test_list_users_rejects_bad_cursor(self, client: AsyncClient, sample_admin: User, sample_viewer: User):
+        headers = auth_header(sample_admin)
+        response = await client.get("/users", params={"cursor": "garbage"}, headers=headers)
+        assert response.status_code == 400
+
+        first = await client.get("/users", params={"limit": 1}, headers=headers)
+        response = await client.get(
+            "/users", params={"cursor": first.headers["X-Next-Cursor"], "sort": "name"}, headers=headers
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            ["created_at", "2024-01-01T00:00:00", 5],
+            ["created_at", 5, "00000000-0000-0000-0000-000000000000"],
+            ["created_at", None, None],
+            ["created_at", "2024-01-01T00:00:00"],
+            ["name", ["Ann"], "00000000-0000-0000-0000-000000000000"],
+        ],
+    )
+    async def test_list_users_rejects_mistyped_cursor(self, client: AsyncClient, sample_admin: User, values: list):
+        params = {"cursor": encode_cursor(*values), "sort": values[0]}
+        response = await client.get("/users", params=params, headers=auth_header(sample_admin))
+        assert response.status_code == 400
+
     async def test_get_me(self, client: AsyncClient, sample_admin: User):
         response = await client.get("/users/me", headers=auth_header(sample_admin))
         assert response.status_code == 200
         assert response.json()["email"] == "admin@acme.com"
 
+    async def test_get_me_served_from_principal_cache(self, client: AsyncClient, db: AsyncSession, sample_admin: User):
+        await db.refresh(sample_admin)
+        headers = auth_header(sample_admin)
+        await client.get("/users/me", headers=headers)
+        hits = principal_cache.hits
+
+        response = await client.get("/users/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["email"] == "admin@acme.com"
+        assert principal_cache.hits == hits + 1
+
+    async def test_get_me_is_a_single_query(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, query_counter
+    ):
+        await db.refresh(sample_admin)
+        headers = auth_header(sample_admin)
+        query_counter.reset()
+        response = await client.get("/users/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["organization_name"] == "Acme Corp"
+        assert query_counter.count == 1
+
+        query_counter.reset()
+        response = await client.get("/users/me", headers=headers)
+        assert response.json()["organization_name"] == "Acme Corp"
+        assert query_counter.count == 0
     async def test_update_role_as_manager(self, client: AsyncClient, sample_manager: User, sample_viewer: User):
         response = await client.patch(
             f"/users/{sample_viewer.id}/role",
@@ -124,6 +422,68 @@ class TestUserRoutes:
         assert response.status_code == 403
 
 
+    async def test_update_role_resolves_each_user_once(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, sample_viewer: User, query_counter
+    ):
+        invalidate_principal(sample_admin.id)
+        db.expunge_all()
+        query_counter.reset()
+
+        response = await client.patch(
+            f"/users/{sample_viewer.id}/role", json={"role": "manager"}, headers=auth_header(sample_admin)
+        )
+        assert response.status_code == 200
+
+        selects = [q for q in query_counter.statements if q.lstrip().startswith("SELECT")]
+        assert len(selects) == 2  # caller, then target
+        assert query_counter.count == 3  # plus the UPDATE
+
+    async def test_delete_with_cached_caller_loads_only_target(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, sample_viewer: User, query_counter
+    ):
+        await db.refresh(sample_admin)
+        cache_principal(sample_admin)
+        db.expunge_all()
+        query_counter.reset()
+
+        response = await client.delete(f"/users/{sample_viewer.id}", headers=auth_header(sample_admin))
+        assert response.status_code == 204
+        assert query_counter.count == 2  # target SELECT + DELETE
+
+
+class TestClaimsOnlyAuthorization:
+    @pytest.fixture(autouse=True)
+    def enable_claims(self, monkeypatch):
+        monkeypatch.setattr(settings, "jwt_embed_authz_claims", True)
+
+    def claims_header(self, user: User) -> dict[str, str]:
+        token = create_access_token(user.id, user.organization_id, user.role, user.authz_version)
+        record_authz_version(user)
+        return {"Authorization": f"Bearer {token}"}
+
+    async def test_authorizes_from_claims(self, client: AsyncClient, sample_manager: User, sample_viewer: User):
+        response = await client.patch(
+            f"/users/{sample_viewer.id}/role",
+            json={"role": "manager"},
+            headers=self.claims_header(sample_manager),
+        )
+        assert response.status_code == 200
+
+    async def test_stale_claims_fall_back_to_database(
+        self, client: AsyncClient, db: AsyncSession, sample_admin: User, sample_manager: User
+    ):
+        headers = self.claims_header(sample_manager)
+        await UserService(db).update_role(sample_manager.id, UserRole.VIEWER, sample_admin)
+
+        response = await client.get("/invitations", headers=headers)
+        assert response.status_code == 403
+
+    async def test_role_change_bumps_authz_version(self, db: AsyncSession, sample_admin: User, sample_viewer: User):
+        version = sample_viewer.authz_version
+        await UserService(db).update_role(sample_viewer.id, UserRole.MANAGER, sample_admin)
+        assert sample_viewer.authz_version == version + 1
+
+
 class TestInvitationRoutes:
     async def test_create_invitation_as_manager(self, client: AsyncClient, sample_manager: User):
         response = await client.post(
@@ -156,6 +516,16 @@ class TestInvitationRoutes:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    async def test_invitation_token_has_one_index_and_pending_lookups_a_partial_one(self, db: AsyncSession):
+        rows = (
+            await db.execute(text("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'invitations'"))
+        ).all()
+        indexes = dict(rows)
+        assert [name for name, definition in rows if "token" in definition] == ["uq_invitations_token_hash"]
+        assert indexes["idx_invitations_pending_org_email"].endswith(
+            "(organization_id, email) WHERE (status = 'pending'::invitation_status)"
+        )
+
     async def test_list_pending_as_viewer_forbidden(self, client: AsyncClient, sample_viewer: User):
         response = await client.get("/invitations", headers=auth_header(sample_viewer))
         assert response.status_code == 403
@@ -176,6 +546,270 @@ class TestInvitationRoutes:
         )
         assert response.status_code == 422
 
+    async def test_preview_invitation_is_a_single_query(
+        self, client: AsyncClient, sample_invitation: Invitation, query_counter
+    ):
+        query_counter.reset()
+        response = await client.get(f"/invitations/preview/{sample_invitation.token}")
+        assert response.status_code == 200
+        assert response.json()["organization_name"] == "Acme Corp"
+        assert query_counter.count == 1
+
+    async def test_preview_unknown_invitation(self, client: AsyncClient):
+        response = await client.get("/invitations/preview/no-such-token")
+        assert response.status_code == 404
+
+    async def test_preview_is_cached_and_revalidated_with_etag(
+        self, client: AsyncClient, sample_invitation: Invitation, query_counter
+    ):
+        first = await client.get(f"/invitations/preview/{sample_invitation.token}")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"].startswith("public, max-age=")
+
+        query_counter.reset()
+        second = await client.get(f"/invitations/preview/{sample_invitation.token}")
+        assert second.json() == first.json()
+        assert second.headers["etag"] == etag
+        not_modified = await client.get(
+            f"/invitations/preview/{sample_invitation.token}", headers={"If-None-Match": f'W/{etag}'}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert query_counter.count == 0
+
+    async def test_preview_caches_misses_briefly(self, client: AsyncClient, query_counter):
+        await client.get("/invitations/preview/no-such-token")
+        query_counter.reset()
+        response = await client.get("/invitations/preview/no-such-token")
+        assert response.status_code == 404
+        assert response.headers["cache-control"] == "public, max-age=10"
+        assert "etag" not in response.headers
+        assert query_counter.count == 0
+
+    async def test_preview_of_expired_invitation_is_gone(self, client: AsyncClient, expired_invitation: Invitation):
+        response = await client.get(f"/invitations/preview/{expired_invitation.token}")
+        assert response.status_code == 410
+
+    async def test_accepting_drops_cached_preview(self, client: AsyncClient, db: AsyncSession, sample_invitation: Invitation):
+        assert (await client.get(f"/invitations/preview/{sample_invitation.token}")).status_code == 200
+        await InvitationService(db).accept_invitation(
+            token=sample_invitation.token, oauth_email=sample_invitation.email, oauth_name="Invitee"
+        )
+        response = await client.get(f"/invitations/preview/{sample_invitation.token}")
+        assert response.status_code == 404
+
+    async def test_bulk_invite_reports_per_row_results(
+        self, client: AsyncClient, sample_manager: User, sample_viewer: User, sample_invitation: Invitation
+    ):
+        response = await client.post(
+            "/invitations/bulk",
+            json=[
+                {"email": "one@acme.com", "name": "One", "role": "viewer"},
+                {"email": sample_viewer.email, "name": "Existing", "role": "viewer"},
+                {"email": sample_invitation.email, "name": "Invited", "role": "viewer"},
+                {"email": "boss@acme.com", "name": "Boss", "role": "admin"},
+                {"email": "one@acme.com", "name": "One Again", "role": "viewer"},
+                {"email": "two@acme.com", "name": "Two", "role": "manager"},
+            ],
+            headers=auth_header(sample_manager),
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["created"], body["failed"]) == (2, 4)
+        statuses = [(r["row"], r["status"]) for r in body["results"]]
+        assert statuses == [
+            (1, "created"), (2, "error"), (3, "error"), (4, "error"), (5, "error"), (6, "created"),
+        ]
+        assert body["results"][0]["invitation"]["email"] == "one@acme.com"
+        assert "already exists" in body["results"][1]["error"]
+
+        listed = await client.get("/invitations", headers=auth_header(sample_manager))
+        assert {"one@acme.com", "two@acme.com"} <= {i["email"] for i in listed.json()}
+
+    async def test_bulk_invite_reports_invalid_rows_without_failing_the_batch(
+        self, client: AsyncClient, sample_admin: User
+    ):
+        response = await client.post(
+            "/invitations/bulk",
+            json=[
+                {"email": "one@acme.com", "name": "One", "role": "viewer"},
+                {"email": "not-an-email", "name": "Bad", "role": "viewer"},
+                {"email": "two@acme.com", "name": "Two", "role": "owner"},
+                "three@acme.com",
+            ],
+            headers=auth_header(sample_admin),
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["created"], body["failed"]) == (1, 3)
+        assert [(r["row"], r["status"], r["email"]) for r in body["results"]] == [
+            (1, "created", "one@acme.com"),
+            (2, "error", "not-an-email"),
+            (3, "error", "two@acme.com"),
+            (4, "error", ""),
+        ]
+        assert body["results"][1]["error"].startswith("email:")
+        assert body["results"][2]["error"].startswith("role:")
+
+    async def test_bulk_invite_csv(self, client: AsyncClient, sample_admin: User):
+        csv_body = "Email,Name,Role\none@acme.com,One,viewer\nnot-an-email,Bad,viewer\ntwo@acme.com,Two,owner\n"
+        response = await client.post(
+            "/invitations/bulk/csv",
+            content=csv_body.encode(),
+            headers={**auth_header(sample_admin), "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["created"], body["failed"]) == (1, 2)
+        assert [r["status"] for r in body["results"]] == ["created", "error", "error"]
+        assert body["results"][1]["error"].startswith("email:")
+        assert body["results"][2]["error"].startswith("role:")
+
+    async def test_bulk_invite_csv_requires_header(self, client: AsyncClient, sample_admin: User):
+        response = await client.post(
+            "/invitations/bulk/csv",
+            content=b"one@acme.com,One,viewer\n",
+            headers={**auth_header(sample_admin), "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 400
+
+    async def test_bulk_invite_csv_reports_rows_with_extra_fields(self, client: AsyncClient, sample_admin: User):
+        csv_body = "email,name,role\none@acme.com,One,viewer,extra\ntwo@acme.com,Two,viewer\n"
+        response = await client.post(
+            "/invitations/bulk/csv",
+            content=csv_body.encode(),
+            headers={**auth_header(sample_admin), "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert [(r["row"], r["status"], r["email"]) for r in body["results"]] == [
+            (1, "error", "one@acme.com"),
+            (2, "created", "two@acme.com"),
+        ]
+        assert "more fields" in body["results"][0]["error"]
+
+    @pytest.mark.parametrize(
+        "csv_body",
+        [
+            "email,name,role\none@acme.com," + "x" * (csv.field_size_limit() + 1) + ",viewer\n",
+            "email,name,role," + "x" * (csv.field_size_limit() + 1) + "\none@acme.com,One,viewer\n",
+        ],
+        ids=["row", "header"],
+    )
+    async def test_bulk_invite_csv_rejects_unparseable_field(
+        self, client: AsyncClient, sample_admin: User, csv_body: str
+    ):
+        response = await client.post(
+            "/invitations/bulk/csv",
+            content=csv_body.encode(),
+            headers={**auth_header(sample_admin), "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("CSV could not be parsed")
+
+    async def test_bulk_invite_rejects_oversized_batch(self, client: AsyncClient, sample_admin: User, monkeypatch):
+        monkeypatch.setattr(settings, "bulk_invitation_max_rows", 2)
+        response = await client.post(
+            "/invitations/bulk",
+            json=[{"email": f"u{i}@acme.com", "name": "U", "role": "viewer"} for i in range(3)],
+            headers=auth_header(sample_admin),
+        )
+        assert response.status_code == 413
+
+    async def test_bulk_invite_csv_rejects_oversized_upload(
+        self, client: AsyncClient, sample_admin: User, monkeypatch
+    ):
+        headers = {**auth_header(sample_admin), "Content-Type": "text/csv"}
+        csv_body = "email,name,role\n" + "".join(f"u{i}@acme.com,U,viewer\n" for i in range(3))
+        monkeypatch.setattr(settings, "bulk_invitation_max_rows", 2)
+        response = await client.post("/invitations/bulk/csv", content=csv_body.encode(), headers=headers)
+        assert response.status_code == 413
+
+        monkeypatch.setattr(settings, "bulk_invitation_max_rows", 10)
+        monkeypatch.setattr(settings, "bulk_invitation_max_csv_bytes", 32)
+        response = await client.post("/invitations/bulk/csv", content=csv_body.encode(), headers=headers)
+        assert response.status_code == 413
+
+    async def test_bulk_invite_as_viewer_forbidden(self, client: AsyncClient, sample_viewer: User):
+        response = await client.post("/invitations/bulk", json=[], headers=auth_header(sample_viewer))
+        assert response.status_code == 403
+
+
+class TestExportRoutes:
+    async def test_export_users_csv(
+        self, client: AsyncClient, sample_admin: User, sample_viewer: User, other_org_admin: User
+    ):
+        response = await client.get("/organizations/me/export/users", headers=auth_header(sample_admin))
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="users.csv"' in response.headers["content-disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert {r["email"] for r in rows} == {sample_admin.email, sample_viewer.email}
+        assert {r["role"] for r in rows} == {"admin", "viewer"}
+
+    async def test_export_csv_neutralizes_formulas(self, db: AsyncSession, session_factory, sample_admin: User):
+        db.add(User(organization_id=sample_admin.organization_id, email="f@acme.com", name='=HYPERLINK("x")'))
+        await db.flush()
+
+        export = ExportService(session_factory)
+        body = b"".join([chunk async for chunk in export.export_users(sample_admin.organization_id, "csv")])
+        names = {row["name"] for row in csv.DictReader(io.StringIO(body.decode()))}
+        assert names == {sample_admin.name, '\'=HYPERLINK("x")'}
+
+        ndjson = b"".join([chunk async for chunk in export.export_users(sample_admin.organization_id, "ndjson")])
+        assert {json.loads(line)["name"] for line in ndjson.splitlines()} == {sample_admin.name, '=HYPERLINK("x")'}
+
+    async def test_export_invitations_ndjson(self, client: AsyncClient, sample_admin: User, sample_invitation: Invitation):
+        response = await client.get(
+            "/organizations/me/export/invitations", params={"format": "ndjson"}, headers=auth_header(sample_admin)
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        [record] = [json.loads(line) for line in response.text.splitlines()]
+        assert record["email"] == sample_invitation.email
+        assert record["status"] == "pending"
+        assert "token" not in record
+
+    async def test_export_streams_in_batches(self, db: AsyncSession, session_factory, sample_admin: User, monkeypatch):
+        for i in range(5):
+            db.add(User(organization_id=sample_admin.organization_id, email=f"m{i}@acme.com", name=f"M{i}"))
+        await db.flush()
+        monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+
+        export = ExportService(session_factory)
+        chunks = [chunk async for chunk in export.export_users(sample_admin.organization_id, "ndjson")]
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 2]
+
+    async def test_export_streams_after_request_session_closes(self):
+        # No overrides: the request's get_db session is torn down before the
+        # body is sent, so the export must not depend on it.
+        async with async_session_factory() as session:
+            org = Organization(name="Streaming Co")
+            session.add(org)
+            await session.flush()
+            admin = User(organization_id=org.id, email="owner@streaming.co", name="Owner", role=UserRole.ADMIN)
+            session.add(admin)
+            await session.commit()
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/organizations/me/export/users", headers=auth_header(admin))
+
+        assert response.status_code == 200
+        assert [row["email"] for row in csv.DictReader(io.StringIO(response.text))] == ["owner@streaming.co"]
+
+    async def test_export_requires_admin(self, client: AsyncClient, sample_manager: User):
+        response = await client.get("/organizations/me/export/users", headers=auth_header(sample_manager))
+        assert response.status_code == 403
+
+    async def test_export_rejects_unknown_format(self, client: AsyncClient, sample_admin: User):
+        response = await client.get(
+            "/organizations/me/export/users", params={"format": "xml"}, headers=auth_header(sample_admin)
+        )
+        assert response.status_code == 422
+
 
 class TestMultiTenancyIsolation:
     async def test_users_only_see_own_org(self, client: AsyncClient, sample_admin: User, other_org_admin: User):
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.services import background
+from src.services.background import run_periodically, start_background_job, stop_background_jobs
+
+
+class TestRunPeriodically:
+    async def test_keeps_running_after_a_failed_iteration(self, caplog):
+        outcomes: list[bool | Exception] = [True, ValueError("boom"), False]
+        calls = 0
+
+        async def iteration() -> bool:
+            nonlocal calls
+            calls += 1
+            if not outcomes:
+                await asyncio.Event().wait()
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        task = asyncio.create_task(run_periodically("Test job", iteration, interval=0.01))
+        while calls < 4:
+            await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert "Test job failed" in caplog.text
+
+
+class TestBackgroundJobs:
+    async def test_start_is_idempotent_and_stop_cancels_everything(self):
+        started = 0
+
+        async def job() -> None:
+            nonlocal started
+            started += 1
+            await asyncio.Event().wait()
+
+        start_background_job("a", job, job)
+        start_background_job("a", job)
+        start_background_job("b", job)
+        await asyncio.sleep(0)
+        assert started == 3
+
+        await stop_background_jobs()
+        assert background._jobs == {}
@@ -0,0 +1,44 @@
+from benchmarks.stats import compare, compare_micro, percentile, summarize
+
+
+def _result(p95_ms: float, rps: float, scenario: str = "users_me") -> dict:
+    return {"scenario": scenario, "org_size": 1000, "concurrency": 16, "p95_ms": p95_ms, "throughput_rps": rps}
+
+
+class TestBenchmarkStats:
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_summarize_reports_milliseconds_and_throughput(self):
+        result = summarize("users_me", 10, 4, [0.002, 0.001, 0.003, 0.004], errors=1, duration=0.5)
+        assert result.requests == 4
+        assert result.errors == 1
+        assert result.throughput_rps == 8.0
+        assert result.p50_ms == 2.0
+        assert result.max_ms == 4.0
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = {"results": [_result(10.0, 500.0), _result(10.0, 500.0, "users_list")]}
+        current = {"results": [_result(10.5, 490.0), _result(12.0, 500.0, "users_list"), _result(1.0, 1.0, "new")]}
+
+        comparisons = {c.scenario: c for c in compare(baseline, current, threshold=0.1)}
+        assert set(comparisons) == {"users_me", "users_list"}
+        assert not comparisons["users_me"].regressed
+        assert comparisons["users_list"].regressed
+
+    def test_compare_flags_throughput_drop(self):
+        comparisons = compare({"results": [_result(10.0, 500.0)]}, {"results": [_result(10.0, 400.0)]}, 0.1)
+        assert comparisons[0].regressed
+        assert round(comparisons[0].throughput_change, 2) == -0.2
+
+    def test_compare_micro_flags_slowdown(self):
+        baseline = {"micro": [{"name": "decode_token", "ops_per_sec": 1e5}, {"name": "has_permission", "ops_per_sec": 1e6}]}
+        current = {"micro": [{"name": "decode_token", "ops_per_sec": 8e4}, {"name": "has_permission", "ops_per_sec": 1.2e6}]}
+
+        comparisons = {c.name: c for c in compare_micro(baseline, current, threshold=0.1)}
+        assert comparisons["decode_token"].regressed
+        assert not comparisons["has_permission"].regressed
@@ -0,0 +1,152 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import TTLCache
+from src.models import Organization, User, UserRole
+from src.auth.principal_cache import authz_versions, cache_principal, get_cached_principal, principal_cache
+from src.services import OrganizationService, UserService
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_get_counts_hits_and_misses(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.set("a", 1)
+        clock.now = 61
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_cannot_exceed_default(self):
+        clock = FakeClock()
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.set("short", 1, ttl_seconds=5)
+        cache.set("long", 2, ttl_seconds=600)
+        clock.now = 30
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        clock.now = 61
+        assert cache.get("long") is None
+
+    def test_evicts_least_recently_used(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+    def test_discard_where(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.discard_where(lambda value: value == 1) == 1
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+class TestPrincipalCache:
+    async def test_cached_principal_is_detached_copy(self, db: AsyncSession, sample_admin: User):
+        await db.refresh(sample_admin)
+        cache_principal(sample_admin)
+        cached = get_cached_principal(sample_admin.id)
+
+        assert cached is not None
+        assert cached is not sample_admin
+        assert cached.email == sample_admin.email
+        assert cached.role == UserRole.ADMIN
+
+    async def test_update_role_invalidates(self, db: AsyncSession, sample_admin: User, sample_viewer: User):
+        await db.refresh(sample_viewer)
+        cache_principal(sample_viewer)
+        await UserService(db).update_role(sample_viewer.id, UserRole.MANAGER, sample_admin)
+
+        assert get_cached_principal(sample_viewer.id) is None
+
+    async def test_principal_loaded_before_role_change_commits_is_dropped(
+        self, db: AsyncSession, sample_admin: User, sample_viewer: User
+    ):
+        await db.refresh(sample_viewer)
+        cache_principal(sample_viewer)
+        stale = get_cached_principal(sample_viewer.id)
+        assert stale is not None
+
+        await UserService(db).update_role(sample_viewer.id, UserRole.MANAGER, sample_admin)
+        # A concurrent request read the row before the change committed and
+        # caches it once its load finishes.
+        cache_principal(stale)
+        assert authz_versions.get(sample_viewer.id) == (sample_viewer.organization_id, stale.authz_version)
+
+        await db.commit()
+
+        assert get_cached_principal(sample_viewer.id) is None
+        assert authz_versions.get(sample_viewer.id) is None
+
+    async def test_delete_user_invalidates(self, db: AsyncSession, sample_admin: User, sample_viewer: User):
+        await db.refresh(sample_viewer)
+        cache_principal(sample_viewer)
+        await UserService(db).delete_user(sample_viewer.id, sample_admin)
+
+        assert get_cached_principal(sample_viewer.id) is None
+
+    async def test_activate_user_invalidates(self, db: AsyncSession, sample_viewer: User):
+        await db.refresh(sample_viewer)
+        cache_principal(sample_viewer)
+        await UserService(db).activate_user(sample_viewer, name="Renamed")
+
+        assert get_cached_principal(sample_viewer.id) is None
+
+    async def test_delete_organization_invalidates_members(
+        self, db: AsyncSession, sample_org: Organization, sample_admin: User, other_org_admin: User
+    ):
+        for user in (sample_admin, other_org_admin):
+            await db.refresh(user)
+            cache_principal(user)
+        await OrganizationService(db).delete(sample_org.id)
+
+        assert get_cached_principal(sample_admin.id) is None
+        assert get_cached_principal(other_org_admin.id) is not None
+
+    async def test_member_loaded_before_organization_deletion_commits_is_dropped(
+        self, db: AsyncSession, sample_org: Organization, sample_admin: User
+    ):
+        await db.refresh(sample_admin)
+        cache_principal(sample_admin)
+        stale = get_cached_principal(sample_admin.id)
+        assert stale is not None
+
+        await OrganizationService(db).delete(sample_org.id)
+        cache_principal(stale)
+
+        await db.commit()
+
+        assert get_cached_principal(sample_admin.id) is None
+        assert authz_versions.get(sample_admin.id) is None
+
+    async def test_unknown_user_is_a_miss(self):
+        misses = principal_cache.misses
+        assert get_cached_principal(uuid.uuid4()) is None
+        assert principal_cache.misses == misses + 1
@@ -0,0 +1,238 @@
+import asyncio
+import base64
+import smtplib
+import socketserver
+import threading
+import time
+
+import pytest
+
+from src.services.email import GmailEmailProvider
+from src.services.email.neo import auth_login
+from src.services.email.smtp_pool import SMTPConnectionPool
+from src.services.email.templates import build_invitation_message
+
+
+class SlowSmtpGmailProvider(GmailEmailProvider):
+    """Gmail provider whose SMTP session just sleeps, like a slow handshake."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.sent_from_threads: list[str] = []
+
+    def _send(self, to_email: str, message: str) -> None:
+        time.sleep(self.delay)
+        self.sent_from_threads.append(threading.current_thread().name)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestNonBlockingDelivery:
+    async def test_smtp_runs_off_the_event_loop(self):
+        provider = SlowSmtpGmailProvider(delay=0.3)
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await provider.send_invitation("new@acme.com", "Admin", "Acme", "http://link")
+        ticking.cancel()
+
+        # A blocking send would have starved the ticker for the whole 0.3s.
+        assert ticks >= 10
+        assert provider.sent_from_threads[0].startswith("smtp")
+
+    async def test_sends_run_concurrently_on_the_pool(self):
+        provider = SlowSmtpGmailProvider(delay=0.2)
+        started = time.perf_counter()
+        await asyncio.gather(*(provider.send_invitation(f"u{i}@acme.com", "A", "Acme", "l") for i in range(4)))
+
+        assert time.perf_counter() - started < 0.6
+
+
+class TestInvitationMessage:
+    def test_shared_template_for_smtp_providers(self):
+        msg = build_invitation_message("new@acme.com", "Admin User", "Acme Corp", "http://app/invite/accept?token=t")
+
+        assert msg["To"] == "new@acme.com"
+        assert msg["Subject"] == "You've been invited to join Acme Corp on Nexus"
+        plain, html = msg.get_payload()
+        assert "http://app/invite/accept?token=t" in plain.get_payload(decode=True).decode()
+        assert "Acme Corp" in html.get_payload(decode=True).decode()
+
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP for smtplib: EHLO, AUTH LOGIN, MAIL/RCPT/DATA."""
+
+    def handle(self) -> None:
+        server: LocalSMTPServer = self.server  # type: ignore[assignment]
+        server.register(self.connection)
+        self.reply("220 local ESMTP")
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-local", "250 AUTH LOGIN")
+            elif verb == "AUTH":
+                self.reply("334 VXNlcm5hbWU6")
+                username = base64.b64decode(self.rfile.readline().strip()).decode()
+                self.reply("334 UGFzc3dvcmQ6")
+                password = base64.b64decode(self.rfile.readline().strip()).decode()
+                server.logins.append((username, password))
+                self.reply("235 Authentication succeeded")
+            elif verb == "MAIL":
+                if server.reply_421_once:
+                    server.reply_421_once = False
+                    self.reply("421 Idle timeout, closing connection")
+                    return
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                body = []
+                while (data := self.rfile.readline()) not in (b".\r\n", b""):
+                    body.append(data)
+                server.messages.append(b"".join(body).decode())
+                self.reply("250 Queued")
+            elif verb == "QUIT":
+                server.quits += 1
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+    def reply(self, *lines: str) -> None:
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.sockets: list = []
+        self.logins: list[tuple[str, str]] = []
+        self.messages: list[str] = []
+        self.quits = 0
+        self.reply_421_once = False
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def register(self, sock) -> None:
+        self.sockets.append(sock)
+
+    def drop_connections(self) -> None:
+        """Closes every client session, like a server-side idle timeout."""
+        for sock in self.sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+
+@pytest.fixture
+def smtp_server():
+    server = LocalSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(server: LocalSMTPServer, **kwargs) -> SMTPConnectionPool:
+    def connect() -> smtplib.SMTP:
+        conn = smtplib.SMTP("127.0.0.1", server.port, timeout=5)
+        conn.ehlo()
+        auth_login(conn, "nexus@acme.com", "secret")
+        return conn
+
+    return SMTPConnectionPool("test", connect, max_idle=kwargs.pop("max_idle", 2), idle_timeout=60, **kwargs)
+
+
+class TestSMTPConnectionPool:
+    def test_reuses_authenticated_session(self, smtp_server):
+        pool = make_pool(smtp_server)
+        for i in range(3):
+            pool.send("nexus@acme.com", f"user{i}@acme.com", "Subject: hi\r\n\r\nhello")
+        pool.close()
+
+        assert len(smtp_server.messages) == 3
+        assert len(smtp_server.logins) == 1
+        assert len(smtp_server.sockets) == 1
+
+    def test_reconnects_after_421(self, smtp_server):
+        pool = make_pool(smtp_server)
+        pool.send("nexus@acme.com", "a@acme.com", "first")
+        smtp_server.reply_421_once = True
+        pool.send("nexus@acme.com", "b@acme.com", "second")
+
+        assert len(smtp_server.messages) == 2
+        assert len(smtp_server.logins) == 2
+
+    def test_reconnects_after_server_drops_session(self, smtp_server):
+        pool = make_pool(smtp_server)
+        pool.send("nexus@acme.com", "a@acme.com", "first")
+        smtp_server.drop_connections()
+        pool.send("nexus@acme.com", "b@acme.com", "second")
+
+        assert len(smtp_server.messages) == 2
+        assert len(smtp_server.logins) == 2
+
+    def test_evicts_idle_sessions(self, smtp_server):
+        clock = FakeClock()
+        pool = make_pool(smtp_server, clock=clock)
+        pool.send("nexus@acme.com", "a@acme.com", "first")
+        clock.now = 61
+        pool.send("nexus@acme.com", "b@acme.com", "second")
+
+        assert len(smtp_server.logins) == 2
+        for _ in range(50):
+            if smtp_server.quits:
+                break
+            time.sleep(0.01)
+        assert smtp_server.quits == 1
+
+    def test_fresh_session_failure_is_raised(self, smtp_server):
+        pool = make_pool(smtp_server)
+        smtp_server.reply_421_once = True
+
+        with pytest.raises(smtplib.SMTPSenderRefused):
+            pool.send("nexus@acme.com", "a@acme.com", "first")
+
+    def test_keeps_at_most_max_idle_sessions(self, smtp_server):
+        pool = make_pool(smtp_server, max_idle=1)
+        first, _ = pool._acquire()
+        second, _ = pool._acquire()
+        pool._release(first)
+        pool._release(second)
+
+        assert len(pool._idle) == 1
+
+    def test_session_released_after_close_is_quit(self, smtp_server):
+        pool = make_pool(smtp_server)
+        conn, _ = pool._acquire()
+        pool.close()
+        pool._release(conn)
+
+        assert not pool._idle
+        for _ in range(50):
+            if smtp_server.quits:
+                break
+            time.sleep(0.01)
+        assert smtp_server.quits == 1
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import EmailOutbox, Organization, OutboxStatus, User, UserRole
+from src.repositories import EmailOutboxRepository
+from src.services import InvitationService
+from src.services.email import EmailProvider
+from src.services.email_outbox import INVITATION_EMAIL, OUTBOX_DEPTH, EmailOutboxSweeper, EmailOutboxWorker
+
+
+class RecordingEmailProvider(EmailProvider):
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.sent: list[str] = []
+
+    async def send_invitation(self, to_email, inviter_name, organization_name, invitation_link) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("SMTP unavailable")
+        self.sent.append(to_email)
+
+
+def payload(to_email: str) -> dict:
+    return {
+        "to_email": to_email,
+        "inviter_name": "Admin User",
+        "organization_name": "Acme Corp",
+        "invitation_link": "http://localhost:5173/invite/accept?token=t",
+    }
+
+
+async def make_due(db: AsyncSession) -> None:
+    await db.execute(
+        update(EmailOutbox).values(next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+
+
+async def outbox(db: AsyncSession) -> list[EmailOutbox]:
+    result = await db.execute(select(EmailOutbox).execution_options(populate_existing=True))
+    return list(result.scalars().all())
+
+
+class TestInvitationOutbox:
+    async def test_create_invitation_enqueues_email(
+        self, db: AsyncSession, sample_org: Organization, sample_admin: User
+    ):
+        invitation = await InvitationService(db).create_invitation(
+            sample_org.id, "new@acme.com", "New", UserRole.VIEWER, sample_admin.id
+        )
+
+        [message] = await outbox(db)
+        assert message.kind == INVITATION_EMAIL
+        assert message.status == OutboxStatus.PENDING
+        assert message.payload["to_email"] == "new@acme.com"
+        assert message.payload["organization_name"] == "Acme Corp"
+        assert invitation.token in message.payload["invitation_link"]
+
+
+class TestEmailOutboxWorker:
+    async def test_sends_due_messages_in_one_batch(self, db: AsyncSession, session_factory):
+        repo = EmailOutboxRepository(db)
+        for i in range(3):
+            await repo.enqueue(INVITATION_EMAIL, payload(f"user{i}@acme.com"))
+        await make_due(db)
+        provider = RecordingEmailProvider()
+
+        assert await EmailOutboxWorker(provider, session_factory=session_factory).run_once() == 3
+        assert sorted(provider.sent) == ["user0@acme.com", "user1@acme.com", "user2@acme.com"]
+        assert {m.status for m in await outbox(db)} == {OutboxStatus.SENT}
+        assert await EmailOutboxWorker(provider, session_factory=session_factory).run_once() == 0
+
+    async def test_settled_messages_drop_the_invitation_link(self, db: AsyncSession, session_factory):
+        repo = EmailOutboxRepository(db)
+        await repo.enqueue(INVITATION_EMAIL, payload("sent@acme.com"))
+        await make_due(db)
+        await EmailOutboxWorker(RecordingEmailProvider(), session_factory=session_factory).run_once()
+        await repo.enqueue(INVITATION_EMAIL, payload("dead@acme.com"))
+        await make_due(db)
+        await EmailOutboxWorker(RecordingEmailProvider(failures=1), session_factory=session_factory, max_attempts=1).run_once()
+
+        messages = {m.payload["to_email"]: m for m in await outbox(db)}
+        assert messages["sent@acme.com"].status == OutboxStatus.SENT
+        assert messages["dead@acme.com"].status == OutboxStatus.DEAD
+        for message in messages.values():
+            assert "invitation_link" not in message.payload
+            assert message.payload["organization_name"] == "Acme Corp"
+
+    async def test_failed_send_is_retried_with_backoff(self, db: AsyncSession, session_factory):
+        await EmailOutboxRepository(db).enqueue(INVITATION_EMAIL, payload("new@acme.com"))
+        await make_due(db)
+        worker = EmailOutboxWorker(RecordingEmailProvider(failures=1), session_factory=session_factory, backoff_base=60)
+
+        before = datetime.now(timezone.utc)
+        await worker.run_once()
+
+        [message] = await outbox(db)
+        assert message.status == OutboxStatus.PENDING
+        assert message.attempts == 1
+        assert "SMTP unavailable" in message.last_error
+        assert message.next_attempt_at >= before + timedelta(seconds=59)
+        # Not due yet, so nothing is claimed.
+        assert await worker.run_once() == 0
+
+        await make_due(db)
+        await worker.run_once()
+        [message] = await outbox(db)
+        assert message.status == OutboxStatus.SENT
+        assert message.attempts == 2
+
+    async def test_dead_letters_after_max_attempts(self, db: AsyncSession, session_factory):
+        await EmailOutboxRepository(db).enqueue(INVITATION_EMAIL, payload("new@acme.com"))
+        worker = EmailOutboxWorker(RecordingEmailProvider(failures=10), session_factory=session_factory, max_attempts=2)
+
+        for _ in range(2):
+            await make_due(db)
+            await worker.run_once()
+
+        [message] = await outbox(db)
+        assert message.status == OutboxStatus.DEAD
+        assert message.attempts == 2
+        await make_due(db)
+        assert await worker.run_once() == 0
+
+    async def test_claimed_messages_are_leased(self, db: AsyncSession):
+        repo = EmailOutboxRepository(db)
+        await repo.enqueue(INVITATION_EMAIL, payload("new@acme.com"))
+        await make_due(db)
+
+        assert len(await repo.claim_due(10, timedelta(minutes=5))) == 1
+        assert await repo.claim_due(10, timedelta(minutes=5)) == []
+
+    async def test_reports_queue_depth(self, db: AsyncSession, session_factory):
+        repo = EmailOutboxRepository(db)
+        await repo.enqueue(INVITATION_EMAIL, payload("a@acme.com"))
+        await repo.enqueue(INVITATION_EMAIL, payload("b@acme.com"))
+
+        await EmailOutboxWorker(RecordingEmailProvider(), session_factory=session_factory).run_once()
+        assert OUTBOX_DEPTH.get() == 2
+
+    @pytest.mark.parametrize("attempts,expected", [(1, 30), (2, 60), (3, 120), (20, 3600)])
+    def test_backoff_is_exponential_and_capped(self, attempts, expected):
+        worker = EmailOutboxWorker(RecordingEmailProvider(), backoff_base=30, backoff_max=3600)
+        assert worker.backoff(attempts) == expected
+
+
+class TestEmailOutboxSweeper:
+    async def test_purges_settled_messages_past_retention_in_batches(self, db: AsyncSession, session_factory):
+        repo = EmailOutboxRepository(db)
+        for i in range(5):
+            await repo.enqueue(INVITATION_EMAIL, payload(f"old{i}@acme.com"))
+        await repo.enqueue(INVITATION_EMAIL, payload("pending@acme.com"))
+        await repo.enqueue(INVITATION_EMAIL, payload("recent@acme.com"))
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.payload["to_email"].astext.startswith("old"))
+            .values(status=OutboxStatus.SENT, created_at=datetime.now(timezone.utc) - timedelta(days=8))
+        )
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.payload["to_email"].astext == "pending@acme.com")
+            .values(created_at=datetime.now(timezone.utc) - timedelta(days=8))
+        )
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.payload["to_email"].astext == "recent@acme.com")
+            .values(status=OutboxStatus.DEAD)
+        )
+
+        sweeper = EmailOutboxSweeper(
+            session_factory=session_factory,
+            batch_size=2,
+            retention_days=7,
+        )
+        assert await sweeper.run_once() == 5
+        assert sorted(m.payload["to_email"] for m in await outbox(db)) == ["pending@acme.com", "recent@acme.com"]
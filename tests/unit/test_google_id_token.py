@@ -0,0 +1,152 @@
+import time
+
+import jwt as pyjwt
+import pytest
+from fastapi import HTTPException
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.config import settings
+from src.auth import oauth
+from src.auth.google_id_token import GoogleIdTokenVerifier, parse_max_age
+
+
+class LocalKeySet:
+    """Offline stand-in for Google's JWKS endpoint."""
+
+    def __init__(self) -> None:
+        self.private_keys: dict[str, rsa.RSAPrivateKey] = {}
+        self.max_age = 3600.0
+        self.fetches = 0
+        self.add_key("key-1")
+
+    def add_key(self, kid: str) -> None:
+        self.private_keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    async def __call__(self):
+        self.fetches += 1
+        keys = []
+        for kid, private_key in self.private_keys.items():
+            jwk = pyjwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+            keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+        return {"keys": keys}, self.max_age
+
+    def sign(self, kid: str = "key-1", **overrides) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": settings.google_client_id,
+            "sub": "1234567890",
+            "email": "user@acme.com",
+            "email_verified": True,
+            "name": "Acme User",
+            "picture": "https://pic.url",
+            "iat": now,
+            "exp": now + 3600,
+        }
+        claims.update(overrides)
+        return pyjwt.encode(claims, self.private_keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def key_set() -> LocalKeySet:
+    return LocalKeySet()
+
+
+@pytest.fixture
+def verifier(key_set: LocalKeySet, monkeypatch) -> GoogleIdTokenVerifier:
+    monkeypatch.setattr(settings, "google_client_id", "nexus-test-client")
+    return GoogleIdTokenVerifier(key_set)
+
+
+class TestGoogleIdTokenVerifier:
+    async def test_verifies_and_returns_profile(self, verifier, key_set):
+        claims = await verifier.verify(key_set.sign())
+        assert claims["email"] == "user@acme.com"
+        assert claims["name"] == "Acme User"
+        assert claims["picture"] == "https://pic.url"
+
+    async def test_key_set_is_cached(self, verifier, key_set):
+        await verifier.verify(key_set.sign())
+        await verifier.verify(key_set.sign())
+        assert key_set.fetches == 1
+
+    async def test_expired_key_set_is_refetched(self, verifier, key_set):
+        key_set.max_age = 0
+        await verifier.verify(key_set.sign())
+        await verifier.verify(key_set.sign())
+        assert key_set.fetches == 2
+
+    async def test_unknown_kid_refetches_for_rotation(self, verifier, key_set):
+        await verifier.verify(key_set.sign())
+        key_set.add_key("key-2")
+        verifier.jwks.min_refresh_interval = 0
+
+        claims = await verifier.verify(key_set.sign(kid="key-2"))
+        assert claims["email"] == "user@acme.com"
+        assert key_set.fetches == 2
+
+    async def test_unknown_kid_refetch_is_rate_limited(self, verifier, key_set):
+        await verifier.verify(key_set.sign())
+        key_set.add_key("key-2")
+
+        with pytest.raises(pyjwt.InvalidTokenError):
+            await verifier.verify(key_set.sign(kid="key-2"))
+        assert key_set.fetches == 1
+
+    async def test_rejects_wrong_audience(self, verifier, key_set):
+        with pytest.raises(pyjwt.InvalidAudienceError):
+            await verifier.verify(key_set.sign(aud="someone-else"))
+
+    async def test_rejects_wrong_issuer(self, verifier, key_set):
+        with pytest.raises(pyjwt.InvalidIssuerError):
+            await verifier.verify(key_set.sign(iss="https://evil.example"))
+
+    async def test_rejects_expired_token(self, verifier, key_set):
+        with pytest.raises(pyjwt.ExpiredSignatureError):
+            await verifier.verify(key_set.sign(exp=int(time.time()) - 3600))
+
+
+class TestGoogleIdentity:
+    async def test_uses_id_token_without_userinfo_call(self, verifier, key_set, monkeypatch):
+        async def fail_userinfo(access_token: str) -> dict:
+            raise AssertionError("userinfo should not be called")
+
+        monkeypatch.setattr(oauth, "google_id_token_verifier", verifier)
+        monkeypatch.setattr(oauth, "get_google_user_info", fail_userinfo)
+
+        identity = await oauth.get_google_identity({"access_token": "at", "id_token": key_set.sign()})
+        assert identity["email"] == "user@acme.com"
+
+    @pytest.mark.parametrize("email_verified", [False, "true", None])
+    async def test_rejects_unverified_email_without_fallback(self, verifier, key_set, monkeypatch, email_verified):
+        async def fail_userinfo(access_token: str) -> dict:
+            raise AssertionError("userinfo should not be called")
+
+        monkeypatch.setattr(oauth, "google_id_token_verifier", verifier)
+        monkeypatch.setattr(oauth, "get_google_user_info", fail_userinfo)
+
+        id_token = key_set.sign(email_verified=email_verified)
+        with pytest.raises(HTTPException) as exc:
+            await oauth.get_google_identity({"access_token": "at", "id_token": id_token})
+        assert exc.value.status_code == 403
+
+    async def test_falls_back_to_userinfo_on_invalid_id_token(self, verifier, key_set, monkeypatch):
+        async def userinfo(access_token: str) -> dict:
+            return {"email": "fallback@acme.com"}
+
+        monkeypatch.setattr(oauth, "google_id_token_verifier", verifier)
+        monkeypatch.setattr(oauth, "get_google_user_info", userinfo)
+
+        identity = await oauth.get_google_identity({"access_token": "at", "id_token": key_set.sign(aud="other")})
+        assert identity["email"] == "fallback@acme.com"
+
+
+class TestParseMaxAge:
+    def test_reads_max_age(self):
+        assert parse_max_age("public, max-age=19845, must-revalidate, no-transform") == 19845
+
+    def test_no_store_disables_caching(self):
+        assert parse_max_age("no-store", default=300) == 0
+
+    def test_missing_header_uses_default(self):
+        assert parse_max_age(None, default=300) == 300
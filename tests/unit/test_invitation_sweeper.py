@@ -0,0 +1,108 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Invitation, InvitationStatus, Organization, User, UserRole
+from src.services.invitation_preview import CachedPreview, preview_cache
+from src.services.invitation_sweeper import INVITATIONS_EXPIRED, InvitationSweeper
+
+
+async def add_invitation(
+    db: AsyncSession,
+    org: Organization,
+    inviter: User,
+    email: str,
+    status: InvitationStatus = InvitationStatus.PENDING,
+    expires_in: timedelta = timedelta(days=7),
+    age: timedelta = timedelta(0),
+) -> Invitation:
+    now = datetime.now(timezone.utc)
+    invitation = Invitation(
+        organization_id=org.id,
+        email=email,
+        name=email.split("@")[0],
+        role=UserRole.VIEWER,
+        token=secrets.token_urlsafe(32),
+        invited_by=inviter.id,
+        status=status,
+        created_at=now - age,
+        expires_at=now + expires_in,
+    )
+    db.add(invitation)
+    await db.flush()
+    return invitation
+
+
+async def statuses(db: AsyncSession) -> dict[str, InvitationStatus]:
+    rows = (await db.execute(select(Invitation.email, Invitation.status).execution_options(populate_existing=True))).all()
+    return dict(rows)
+
+
+class TestInvitationSweeper:
+    async def test_expires_overdue_pending_invitations_in_batches(
+        self, db: AsyncSession, session_factory, sample_org: Organization, sample_admin: User
+    ):
+        for i in range(5):
+            await add_invitation(db, sample_org, sample_admin, f"late{i}@acme.com", expires_in=timedelta(hours=-1))
+        await add_invitation(db, sample_org, sample_admin, "fresh@acme.com")
+        await add_invitation(
+            db, sample_org, sample_admin, "done@acme.com", InvitationStatus.ACCEPTED, expires_in=timedelta(hours=-1)
+        )
+        before = INVITATIONS_EXPIRED.value
+
+        result = await InvitationSweeper(session_factory=session_factory, batch_size=2).run_once()
+
+        assert (result.expired, result.purged) == (5, 0)
+        assert INVITATIONS_EXPIRED.value == before + 5
+        current = await statuses(db)
+        assert all(current[f"late{i}@acme.com"] == InvitationStatus.EXPIRED for i in range(5))
+        assert current["fresh@acme.com"] == InvitationStatus.PENDING
+        assert current["done@acme.com"] == InvitationStatus.ACCEPTED
+
+        assert (await InvitationSweeper(session_factory=session_factory, batch_size=2).run_once()).expired == 0
+
+    async def test_purges_finished_invitations_past_retention(
+        self, db: AsyncSession, session_factory, sample_org: Organization, sample_admin: User
+    ):
+        old = timedelta(days=60)
+        await add_invitation(db, sample_org, sample_admin, "old-accepted@acme.com", InvitationStatus.ACCEPTED, age=old)
+        await add_invitation(
+            db, sample_org, sample_admin, "old-pending@acme.com", expires_in=timedelta(days=-53), age=old
+        )
+        await add_invitation(db, sample_org, sample_admin, "recent@acme.com", InvitationStatus.ACCEPTED)
+        await add_invitation(db, sample_org, sample_admin, "old-valid@acme.com", expires_in=timedelta(days=1), age=old)
+
+        result = await InvitationSweeper(session_factory=session_factory, batch_size=10, retention_days=30).run_once()
+
+        # The old pending row is expired first, then purged in the same sweep.
+        assert (result.expired, result.purged) == (1, 2)
+        assert set(await statuses(db)) == {"recent@acme.com", "old-valid@acme.com"}
+
+    async def test_retention_disabled_keeps_rows(
+        self, db: AsyncSession, session_factory, sample_org: Organization, sample_admin: User
+    ):
+        await add_invitation(
+            db, sample_org, sample_admin, "ancient@acme.com", InvitationStatus.ACCEPTED, age=timedelta(days=900)
+        )
+        result = await InvitationSweeper(session_factory=session_factory, retention_days=0).run_once()
+        assert result.purged == 0
+        assert "ancient@acme.com" in await statuses(db)
+
+    async def test_preview_cached_before_the_batch_commits_is_dropped(
+        self, db: AsyncSession, session_factory, sample_org: Organization, sample_admin: User
+    ):
+        invitation = await add_invitation(db, sample_org, sample_admin, "late@acme.com", expires_in=timedelta(hours=-1))
+        stale = CachedPreview(status_code=200, body=b"{}", etag='"stale"', organization_id=sample_org.id)
+
+        class RacingSweeper(InvitationSweeper):
+            async def _expire_batch(self, session: AsyncSession) -> int:
+                expired = await super()._expire_batch(session)
+                # A preview request read the row before the batch committed.
+                preview_cache.set(invitation.token_hash, stale)
+                return expired
+
+        await RacingSweeper(session_factory=session_factory, batch_size=10).run_once()
+
+        assert preview_cache.get(invitation.token_hash) is None
@@ -5,8 +5,11 @@ import jwt as pyjwt
 import pytest
 
 from src.config import settings
+from src.models import UserRole
+from src.auth import jwt as jwt_module
 from src.auth.jwt import (
     ALGORITHM,
+    JWT_VERIFY_FAILURES,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -34,7 +37,7 @@ class TestTokenCreation:
         assert payload["type"] == "access"
 
     def test_create_refresh_token(self, user_id, org_id):
-        token = create_refresh_token(user_id, org_id)
+        token = create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4())
         payload = decode_token(token)
         assert payload["sub"] == str(user_id)
         assert payload["org"] == str(org_id)
@@ -46,10 +49,23 @@ class TestTokenCreation:
         assert "exp" in payload
 
     def test_refresh_token_has_expiry(self, user_id, org_id):
-        token = create_refresh_token(user_id, org_id)
+        token = create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4())
         payload = decode_token(token)
         assert "exp" in payload
 
+    def test_authz_claims_omitted_by_default(self, user_id, org_id):
+        token = create_access_token(user_id, org_id, UserRole.ADMIN, 3)
+        payload = decode_token(token)
+        assert "role" not in payload
+        assert "ver" not in payload
+
+    def test_authz_claims_embedded_when_enabled(self, user_id, org_id, monkeypatch):
+        monkeypatch.setattr(settings, "jwt_embed_authz_claims", True)
+        token = create_access_token(user_id, org_id, UserRole.MANAGER, 3)
+        payload = decode_token(token)
+        assert payload["role"] == "manager"
+        assert payload["ver"] == 3
+
 
 class TestTokenVerification:
     def test_verify_valid_access_token(self, user_id, org_id):
@@ -58,14 +74,14 @@ class TestTokenVerification:
         assert payload["sub"] == str(user_id)
 
     def test_verify_valid_refresh_token(self, user_id, org_id):
-        token = create_refresh_token(user_id, org_id)
+        token = create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4())
         payload = verify_refresh_token(token)
         assert payload["sub"] == str(user_id)
 
 
 class TestTokenRejection:
     def test_reject_refresh_as_access(self, user_id, org_id):
-        token = create_refresh_token(user_id, org_id)
+        token = create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4())
         with pytest.raises(pyjwt.InvalidTokenError, match="Not an access token"):
             verify_access_token(token)
 
@@ -102,3 +118,101 @@ class TestTokenRejection:
         tampered = token[:-5] + "XXXXX"
         with pytest.raises(pyjwt.InvalidTokenError):
             decode_token(tampered)
+
+    def test_rejections_are_counted_by_reason(self, user_id, org_id):
+        payload = {
+            "sub": str(user_id),
+            "org": str(org_id),
+            "type": "access",
+            "exp": datetime.now(timezone.utc) - timedelta(minutes=1),
+        }
+        expired = pyjwt.encode(payload, settings.jwt_secret_key, algorithm=ALGORITHM)
+        cases = [
+            (expired, "expired"),
+            (create_access_token(user_id, org_id)[:-5] + "XXXXX", "invalid"),
+            (create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4()), "wrong_type"),
+        ]
+        for token, reason in cases:
+            before = JWT_VERIFY_FAILURES.labels("access", reason).value
+            with pytest.raises(pyjwt.InvalidTokenError):
+                verify_access_token(token)
+            assert JWT_VERIFY_FAILURES.labels("access", reason).value == before + 1
+
+
+class TestTokenCodec:
+    def test_tokens_interoperate_with_pyjwt(self, user_id, org_id):
+        token = create_access_token(user_id, org_id)
+        assert pyjwt.decode(token, settings.jwt_secret_key, algorithms=[ALGORITHM])["sub"] == str(user_id)
+        assert pyjwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+        foreign = pyjwt.encode(
+            {"sub": str(user_id), "type": "access"}, settings.jwt_secret_key, algorithm=ALGORITHM, headers={"kid": "k1"}
+        )
+        assert verify_access_token(foreign)["sub"] == str(user_id)
+
+    def test_reject_other_algorithms(self, user_id):
+        unsigned = pyjwt.encode({"sub": str(user_id), "type": "access"}, None, algorithm="none")
+        with pytest.raises(pyjwt.InvalidAlgorithmError):
+            decode_token(unsigned)
+        secret = settings.jwt_secret_key + "-long-enough-for-hs512" * 3
+        hs512 = pyjwt.encode({"sub": str(user_id)}, secret, algorithm="HS512")
+        with pytest.raises(pyjwt.InvalidTokenError):
+            decode_token(hs512)
+
+    @pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c.d", "!!.@@.##"])
+    def test_reject_malformed(self, token):
+        with pytest.raises(pyjwt.DecodeError):
+            decode_token(token)
+
+    def test_reject_future_iat(self, user_id):
+        future = datetime.now(timezone.utc) + timedelta(minutes=5)
+        token = pyjwt.encode({"sub": str(user_id), "iat": future}, settings.jwt_secret_key, algorithm=ALGORITHM)
+        with pytest.raises(pyjwt.ImmatureSignatureError):
+            decode_token(token)
+
+    def test_secret_rotation_takes_effect(self, user_id, org_id, monkeypatch):
+        token = create_access_token(user_id, org_id)
+        monkeypatch.setattr(settings, "jwt_secret_key", "rotated-secret-of-sufficient-length!")
+        with pytest.raises(pyjwt.InvalidSignatureError):
+            decode_token(token)
+        assert decode_token(create_access_token(user_id, org_id))["sub"] == str(user_id)
+
+
+class TestVerifyCache:
+    def test_repeat_verification_served_from_cache(self, user_id, org_id, monkeypatch):
+        token = create_access_token(user_id, org_id)
+        payload = verify_access_token(token)
+        hits = jwt_module.verified_tokens.hits
+
+        def fail(token):
+            raise AssertionError("token decoded again")
+
+        monkeypatch.setattr(jwt_module, "decode_token", fail)
+        assert verify_access_token(token) is payload
+        assert jwt_module.verified_tokens.hits == hits + 1
+
+    def test_entry_expires_with_token(self, user_id, monkeypatch):
+        clock = [1000.0]
+        cache = jwt_module.TTLCache(max_size=10, ttl_seconds=900, clock=lambda: clock[0])
+        monkeypatch.setattr(jwt_module, "verified_tokens", cache)
+        exp = datetime.now(timezone.utc) + timedelta(seconds=60)
+        token = pyjwt.encode({"sub": str(user_id), "type": "access", "exp": exp}, settings.jwt_secret_key, algorithm=ALGORITHM)
+        digest = jwt_module.hashlib.sha256(token.encode()).digest()
+
+        verify_access_token(token)
+        assert cache.get(digest) is not None
+        clock[0] += 61
+        assert cache.get(digest) is None
+
+    def test_failures_are_not_cached(self, user_id, org_id):
+        token = create_refresh_token(user_id, org_id, uuid.uuid4(), uuid.uuid4())
+        for _ in range(2):
+            with pytest.raises(pyjwt.InvalidTokenError):
+                verify_access_token(token)
+        assert jwt_module.hashlib.sha256(token.encode()).digest() not in jwt_module.verified_tokens._entries
+
+    def test_disabled_cache_always_verifies(self, user_id, org_id, monkeypatch):
+        monkeypatch.setattr(jwt_module, "verified_tokens", jwt_module.TTLCache(max_size=0, ttl_seconds=900))
+        token = create_access_token(user_id, org_id)
+        assert verify_access_token(token) == verify_access_token(token)
+        assert len(jwt_module.verified_tokens) == 0
@@ -0,0 +1,53 @@
+import pytest
+
+from src.metrics import Counter, Gauge, Histogram, Registry
+
+
+class TestMetrics:
+    def test_counter_renders_labelled_children(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests.", ["status"]))
+        requests.labels("200").inc()
+        requests.labels("200").inc()
+        requests.labels("500").inc()
+
+        text = registry.render()
+        assert 'requests_total{status="200"} 2' in text
+        assert 'requests_total{status="500"} 1' in text
+
+    def test_labelled_child_is_reused(self):
+        requests = Counter("requests_total", "Requests.", ["status"])
+        assert requests.labels("200") is requests.labels("200")
+
+    def test_wrong_label_count_rejected(self):
+        requests = Counter("requests_total", "Requests.", ["status"])
+        with pytest.raises(ValueError):
+            requests.labels("200", "GET")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+        latency.observe(0.05)
+        latency.observe(0.1)
+        latency.observe(0.5)
+        latency.observe(3)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+
+    def test_gauge_function_evaluated_at_render(self):
+        registry = Registry()
+        value = [1]
+        registry.register(Gauge("pool_checked_out", "Checked out.", function=lambda: value[0]))
+        value[0] = 7
+
+        assert "pool_checked_out 7" in registry.render()
+
+    def test_register_returns_existing_metric(self):
+        registry = Registry()
+        first = registry.register(Counter("requests_total", "Requests."))
+        second = registry.register(Counter("requests_total", "Requests."))
+        assert first is second
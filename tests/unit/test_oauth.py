@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from src.auth import oauth
+from src.auth.oauth import (
+    GOOGLE_TOKEN_URL,
+    GOOGLE_USERINFO_URL,
+    OAUTH_UPSTREAM_DURATION,
+    close_http_client,
+    exchange_code_for_tokens,
+    get_google_user_info,
+    get_http_client,
+)
+
+
+@pytest.fixture
+def google_stub(monkeypatch):
+    """Routes the shared client to an in-process Google stand-in and records
+    which client instance served each call."""
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        if str(request.url) == GOOGLE_TOKEN_URL:
+            return httpx.Response(200, json={"access_token": "google-access"})
+        if str(request.url) == GOOGLE_USERINFO_URL:
+            assert request.headers["Authorization"] == "Bearer google-access"
+            return httpx.Response(200, json={"email": "user@acme.com"})
+        return httpx.Response(404)
+
+    monkeypatch.setattr(oauth, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return calls
+
+
+class TestSharedHttpClient:
+    async def test_login_calls_share_one_client(self, google_stub):
+        client = get_http_client()
+        tokens = await exchange_code_for_tokens("code")
+        user_info = await get_google_user_info(tokens["access_token"])
+
+        assert user_info["email"] == "user@acme.com"
+        assert google_stub == [GOOGLE_TOKEN_URL, GOOGLE_USERINFO_URL]
+        assert get_http_client() is client
+
+    async def test_upstream_latency_recorded_per_call(self, google_stub):
+        token_exchange = OAUTH_UPSTREAM_DURATION.labels("token_exchange")
+        userinfo = OAUTH_UPSTREAM_DURATION.labels("userinfo")
+        before = (token_exchange.count, userinfo.count)
+
+        tokens = await exchange_code_for_tokens("code")
+        assert (token_exchange.count, userinfo.count) == (before[0] + 1, before[1])
+        await get_google_user_info(tokens["access_token"])
+        assert (token_exchange.count, userinfo.count) == (before[0] + 1, before[1] + 1)
+
+    async def test_close_then_recreate(self):
+        client = get_http_client()
+        await close_http_client()
+        assert client.is_closed
+        assert get_http_client() is not client
+        await close_http_client()
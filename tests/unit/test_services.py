@@ -1,13 +1,16 @@
+import hashlib
 import uuid
 from datetime import datetime, timedelta, timezone
 
 import pytest
 import pytest_asyncio
 from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Organization, User, UserRole, UserStatus, Invitation, InvitationStatus
-from src.services import OrganizationService, UserService, InvitationService
+from src.models import EmailOutbox, Organization, User, UserRole, UserStatus, Invitation, InvitationStatus
+from src.services import BulkInvitee, OrganizationService, UserService, InvitationService
+from src.services.invitation_service import INVITATIONS_CREATED
 
 
 class TestOrganizationService:
@@ -154,6 +157,25 @@ class TestInvitationService:
         assert invitation.token is not None
         assert len(invitation.token) > 0
 
+    async def test_invitation_token_stored_only_as_digest(
+        self, db: AsyncSession, sample_org: Organization, sample_admin: User
+    ):
+        service = InvitationService(db)
+        invitation = await service.create_invitation(
+            organization_id=sample_org.id,
+            email="hashed@acme.com",
+            name="Hashed",
+            role=UserRole.VIEWER,
+            invited_by=sample_admin.id,
+        )
+
+        stored = await db.scalar(select(Invitation.token_hash).where(Invitation.id == invitation.id))
+        assert stored == hashlib.sha256(invitation.token.encode()).digest()
+        db.expunge(invitation)
+        loaded = await service.get_by_token(invitation.token)
+        assert loaded.id == invitation.id
+        assert loaded.token is None
+
     async def test_reject_duplicate_user(self, db: AsyncSession, sample_org: Organization, sample_admin: User):
         service = InvitationService(db)
 
@@ -297,3 +319,29 @@ class TestInvitationService:
         pending = await service.list_pending(sample_org.id)
         tokens = [inv.token for inv in pending]
         assert "test-token-12345" not in tokens
+
+    async def test_bulk_create_invitations(
+        self, db: AsyncSession, sample_org: Organization, sample_admin: User, other_org_admin: User
+    ):
+        service = InvitationService(db)
+        created_before = INVITATIONS_CREATED.labels("bulk").value
+        results = await service.create_invitations_bulk(
+            organization_id=sample_org.id,
+            invitees=[
+                BulkInvitee(email="a@acme.com", name="A", role=UserRole.VIEWER),
+                BulkInvitee(email=other_org_admin.email, name="Other", role=UserRole.VIEWER),
+                BulkInvitee(email="b@acme.com", name="B", role=UserRole.ADMIN),
+            ],
+            invited_by=sample_admin.id,
+        )
+
+        assert [r.error is None for r in results] == [True, False, True]
+        assert "another organization" in results[1].error
+        assert results[2].invitation.role == UserRole.ADMIN
+        assert results[0].invitation.token != results[2].invitation.token
+        assert INVITATIONS_CREATED.labels("bulk").value == created_before + 2
+
+        pending = await service.list_pending(sample_org.id)
+        assert {inv.email for inv in pending} == {"a@acme.com", "b@acme.com"}
+        queued = (await db.execute(select(EmailOutbox.payload))).scalars().all()
+        assert sorted(p["to_email"] for p in queued) == ["a@acme.com", "b@acme.com"]
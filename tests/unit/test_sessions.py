@@ -0,0 +1,193 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.jwt import create_refresh_token, decode_token
+from src.models import RefreshSession, User
+from src.services import SessionService
+from src.services import session_service
+from src.services.session_service import REFRESH_COALESCED, REFRESH_TOKEN_REUSE
+from src.services.session_sweeper import SessionSweeper
+
+
+async def session_row(db: AsyncSession, token: str) -> RefreshSession:
+    session_id = uuid.UUID(decode_token(token)["sid"])
+    return await db.scalar(
+        select(RefreshSession).where(RefreshSession.id == session_id).execution_options(populate_existing=True)
+    )
+
+
+async def age_rotation(db: AsyncSession, token: str, seconds: float) -> None:
+    session = await session_row(db, token)
+    await db.execute(
+        update(RefreshSession)
+        .where(RefreshSession.id == session.id)
+        .values(rotated_at=RefreshSession.rotated_at - timedelta(seconds=seconds))
+    )
+
+
+class TestSessionService:
+    async def test_refresh_rotates_the_token(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        first = await service.start(sample_admin)
+
+        user, second = await service.refresh(first)
+
+        assert user.id == sample_admin.id
+        assert decode_token(second)["sid"] == decode_token(first)["sid"]
+        assert decode_token(second)["jti"] != decode_token(first)["jti"]
+        _, third = await service.refresh(second)
+        assert decode_token(third)["jti"] != decode_token(second)["jti"]
+
+    async def test_rotated_out_token_within_grace_joins_the_current_one(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        first = await service.start(sample_admin)
+        _, second = await service.refresh(first)
+
+        _, again = await service.refresh(first)
+
+        assert decode_token(again)["jti"] == decode_token(second)["jti"]
+        assert (await session_row(db, first)).revoked_at is None
+
+    async def test_reuse_after_grace_revokes_the_session(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        first = await service.start(sample_admin)
+        _, second = await service.refresh(first)
+        await age_rotation(db, first, 60)
+        reuse_before = REFRESH_TOKEN_REUSE.value
+
+        with pytest.raises(HTTPException) as exc:
+            await service.refresh(first)
+        assert exc.value.status_code == 401
+        assert REFRESH_TOKEN_REUSE.value == reuse_before + 1
+        assert (await session_row(db, first)).revoked_at is not None
+        with pytest.raises(HTTPException):
+            await service.refresh(second)
+
+    async def test_rejects_tokens_without_a_session(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        for token in (
+            create_refresh_token(sample_admin.id, sample_admin.organization_id, uuid.uuid4(), uuid.uuid4()),
+            "not-a-jwt",
+        ):
+            with pytest.raises(HTTPException) as exc:
+                await service.refresh(token)
+            assert exc.value.status_code == 401
+
+    async def test_end_revokes_only_that_session(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        laptop = await service.start(sample_admin)
+        phone = await service.start(sample_admin)
+
+        await service.end(laptop)
+
+        with pytest.raises(HTTPException):
+            await service.refresh(laptop)
+        await service.refresh(phone)
+        assert [s.id for s in await service.list_active(sample_admin.id)] == [(await session_row(db, phone)).id]
+
+    async def test_lists_most_recently_refreshed_first(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        laptop = await service.start(sample_admin)
+        phone = await service.start(sample_admin)
+        now = datetime.now(timezone.utc)
+        for token, last_used_at in ((laptop, now), (phone, now - timedelta(hours=1))):
+            await db.execute(
+                update(RefreshSession)
+                .where(RefreshSession.id == (await session_row(db, token)).id)
+                .values(last_used_at=last_used_at)
+            )
+
+        listed = [s.id for s in await service.list_active(sample_admin.id)]
+
+        assert listed == [(await session_row(db, laptop)).id, (await session_row(db, phone)).id]
+
+    async def test_bulk_revocation_by_user_and_organization(
+        self, db: AsyncSession, sample_admin: User, sample_viewer: User, other_org_admin: User
+    ):
+        service = SessionService(db)
+        for user in (sample_admin, sample_admin, sample_viewer, other_org_admin):
+            await service.start(user)
+
+        assert await service.revoke_user_sessions(sample_admin.id) == 2
+        assert await service.revoke_organization_sessions(sample_admin.organization_id) == 1
+        assert await service.list_active(sample_viewer.id) == []
+        assert len(await service.list_active(other_org_admin.id)) == 1
+
+
+class TestRefreshCoalescing:
+    async def test_concurrent_refreshes_share_one_rotation(self, db: AsyncSession, sample_admin: User, query_counter):
+        token = await SessionService(db).start(sample_admin)
+        coalesced_before = REFRESH_COALESCED.value
+        query_counter.reset()
+
+        results = await asyncio.gather(*(SessionService(db).refresh_tokens(token) for _ in range(5)))
+
+        assert len(set(results)) == 1
+        assert query_counter.count == 1
+        assert REFRESH_COALESCED.value == coalesced_before + 4
+        assert decode_token(results[0].refresh_token)["jti"] != decode_token(token)["jti"]
+
+    async def test_result_is_reused_only_within_the_window(
+        self, db: AsyncSession, sample_admin: User, monkeypatch, query_counter
+    ):
+        clock = [1000.0]
+        monkeypatch.setattr(
+            session_service, "recent_refreshes", session_service.TTLCache(max_size=10, ttl_seconds=2, clock=lambda: clock[0])
+        )
+        service = SessionService(db)
+        token = await service.start(sample_admin)
+        first = await service.refresh_tokens(token)
+
+        query_counter.reset()
+        assert await service.refresh_tokens(token) == first
+        assert query_counter.count == 0
+
+        clock[0] += 3
+        later = await service.refresh_tokens(token)
+        assert query_counter.count == 1
+        # Past the window the old token is checked again and, inside the reuse
+        # grace period, joins the current rotation instead of rotating again.
+        assert decode_token(later.refresh_token)["jti"] == decode_token(first.refresh_token)["jti"]
+
+    async def test_failures_reach_every_waiting_request(self, db: AsyncSession, sample_admin: User):
+        token = create_refresh_token(sample_admin.id, sample_admin.organization_id, uuid.uuid4(), uuid.uuid4())
+
+        results = await asyncio.gather(
+            *(SessionService(db).refresh_tokens(token) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, HTTPException) and r.status_code == 401 for r in results)
+        assert session_service.hashlib.sha256(token.encode()).digest() not in session_service.recent_refreshes._entries
+
+    async def test_logout_drops_the_shared_result(self, db: AsyncSession, sample_admin: User):
+        service = SessionService(db)
+        token = await service.start(sample_admin)
+        issued = await service.refresh_tokens(token)
+
+        await service.end(issued.refresh_token)
+
+        with pytest.raises(HTTPException):
+            await service.refresh_tokens(token)
+
+
+class TestSessionSweeper:
+    async def test_deletes_expired_sessions_in_batches(self, db: AsyncSession, session_factory, sample_admin: User):
+        service = SessionService(db)
+        tokens = [await service.start(sample_admin) for _ in range(5)]
+        await db.execute(
+            update(RefreshSession)
+            .where(RefreshSession.id != (await session_row(db, tokens[0])).id)
+            .values(expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+        )
+
+        sweeper = SessionSweeper(session_factory=session_factory, batch_size=2)
+
+        assert await sweeper.run_once() == 4
+        remaining = (await db.execute(select(RefreshSession.id))).scalars().all()
+        assert remaining == [(await session_row(db, tokens[0])).id]